@@ -60,7 +60,9 @@ CREATE TABLE IF NOT EXISTS tipo_donantes (
 CREATE TABLE IF NOT EXISTS ingresos (
   id INT PRIMARY KEY AUTO_INCREMENT,
   importe DECIMAL(10, 2) NOT NULL,
-  fecha DATE NOT NULL
+  fecha DATE NOT NULL,
+  hash CHAR(64) NOT NULL,  -- SHA-256 de (numero, nro_cuenta, fecha, importe, ocurrencia) para la carga incremental
+  UNIQUE KEY uq_ingresos_hash (hash)
 );
 
 CREATE TABLE IF NOT EXISTS frecuencias (
@@ -71,7 +73,9 @@ CREATE TABLE IF NOT EXISTS frecuencias (
 CREATE TABLE IF NOT EXISTS gastos (
   id INT PRIMARY KEY AUTO_INCREMENT,
   importe DECIMAL(10, 2) NOT NULL,
-  fecha DATE NOT NULL
+  fecha DATE NOT NULL,
+  hash CHAR(64) NOT NULL,  -- SHA-256 de (numero, nro_cuenta, fecha, importe, ocurrencia) para la carga incremental
+  UNIQUE KEY uq_gastos_hash (hash)
 );
 
 CREATE TABLE IF NOT EXISTS cuentas (
@@ -132,3 +136,11 @@ ALTER TABLE ingresos
 ALTER TABLE ingresos
  	ADD CONSTRAINT fk_ingresos_donante FOREIGN KEY (id_donante) REFERENCES donantes(id),
  	ADD CONSTRAINT fk_ingresos_cuenta FOREIGN KEY (id_cuenta) REFERENCES cuentas(id_cuenta);
+
+-- archivos de origen ya cargados (db-ingestion.py --incremental)
+CREATE TABLE IF NOT EXISTS cargas_incrementales (
+  archivo VARCHAR(255) PRIMARY KEY,
+  hash_archivo CHAR(64) NOT NULL,
+  filas INT NOT NULL,
+  cargado DATETIME NOT NULL
+);
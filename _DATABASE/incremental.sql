@@ -0,0 +1,38 @@
+-- Migracion de una base ya cargada al modo incremental (db-ingestion.py --incremental)
+-- Agrega el hash de contenido a gastos e ingresos sin recrear la base con ddl.sql
+USE db_fundacion_final;
+
+ALTER TABLE gastos ADD COLUMN hash CHAR(64) NULL;
+ALTER TABLE ingresos ADD COLUMN hash CHAR(64) NULL;
+
+-- mismo texto que transaction_hashes() en src/incremental.py:
+-- numero|nro_cuenta|fecha|importe|ocurrencia (ocurrencia empieza en 0, en orden de carga)
+UPDATE gastos g
+JOIN (
+  SELECT g.id, SHA2(CONCAT_WS('|', p.numero, c.nro_cuenta, DATE_FORMAT(g.fecha, '%Y-%m-%d'), g.importe,
+    ROW_NUMBER() OVER (PARTITION BY p.numero, c.nro_cuenta, g.fecha, g.importe ORDER BY g.id) - 1), 256) AS hash
+  FROM gastos g
+  JOIN proveedores p ON p.id = g.id_proveedor
+  JOIN cuentas c ON c.id_cuenta = g.id_cuenta
+) h ON h.id = g.id
+SET g.hash = h.hash;
+
+UPDATE ingresos i
+JOIN (
+  SELECT i.id, SHA2(CONCAT_WS('|', d.numero, c.nro_cuenta, DATE_FORMAT(i.fecha, '%Y-%m-%d'), i.importe,
+    ROW_NUMBER() OVER (PARTITION BY d.numero, c.nro_cuenta, i.fecha, i.importe ORDER BY i.id) - 1), 256) AS hash
+  FROM ingresos i
+  JOIN donantes d ON d.id = i.id_donante
+  JOIN cuentas c ON c.id_cuenta = i.id_cuenta
+) h ON h.id = i.id
+SET i.hash = h.hash;
+
+ALTER TABLE gastos MODIFY hash CHAR(64) NOT NULL, ADD UNIQUE KEY uq_gastos_hash (hash);
+ALTER TABLE ingresos MODIFY hash CHAR(64) NOT NULL, ADD UNIQUE KEY uq_ingresos_hash (hash);
+
+CREATE TABLE IF NOT EXISTS cargas_incrementales (
+  archivo VARCHAR(255) PRIMARY KEY,
+  hash_archivo CHAR(64) NOT NULL,
+  filas INT NOT NULL,
+  cargado DATETIME NOT NULL
+);
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Benchmark del motor asincronico (aiomysql) contra el motor sincronico de
+db-ingestion.py sobre un dataset sintetico.
+
+Requiere el contenedor MySQL local levantado con `docker compose up -d` y aiomysql
+instalado. Recrea el schema con _DATABASE/ddl.sql antes de cada corrida y sirve
+tambien como prueba de paridad del motor async contra el sincronico: compara las
+filas y las claves (numero de las entidades, hash de las transacciones) que carga
+cada motor, y que una segunda corrida async sobre la base cargada no agregue filas.
+Termina con error si alguna comparacion falla.
+
+Usage:
+  python benchmarks/bench_async.py [--filas 200000] [--batch-size 1000] [--pool-size 4]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import time
+from contextlib import redirect_stdout
+import numpy as np
+from bench_bulk_load import load_ingestion_module, reset_schema, synthetic_donantes, synthetic_proveedores
+
+# Clave natural de cada tabla para comparar el contenido que carga cada motor
+KEYS = {"proveedores": "numero", "donantes": "numero", "gastos": "hash", "ingresos": "hash"}
+TABLES = list(KEYS)
+
+
+def count_rows(admin) -> dict:
+    """Cuenta las filas de las tablas de entidades y de hechos"""
+    counts = {}
+    with admin.connection() as (_, cursor):
+        for table in TABLES:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            counts[table] = cursor.fetchone()[0]
+    return counts
+
+
+def load_keys(admin) -> dict:
+    """Claves cargadas en cada tabla"""
+    keys = {}
+    with admin.connection() as (_, cursor):
+        for table, col in KEYS.items():
+            cursor.execute(f"SELECT {col} FROM {table}")
+            keys[table] = {row[0] for row in cursor.fetchall()}
+    return keys
+
+
+def compare(nombre: str, esperado: tuple, obtenido: tuple) -> list:
+    """Tablas en las que obtenido (filas, claves) difiere de esperado"""
+    diferencias = []
+    for table in TABLES:
+        if esperado[0][table] != obtenido[0][table] or esperado[1][table] != obtenido[1][table]:
+            faltan = len(esperado[1][table] - obtenido[1][table])
+            sobran = len(obtenido[1][table] - esperado[1][table])
+            diferencias.append(f"{nombre} {table}: {obtenido[0][table]} filas contra {esperado[0][table]} "
+                               f"({faltan} claves faltantes, {sobran} de mas)")
+    return diferencias
+
+
+def prepare_schema(admin) -> None:
+    """Recrea el schema vacio"""
+    with admin.connection() as (conn, cursor):
+        reset_schema(cursor)
+        conn.commit()
+
+
+def run_sync(ingestion, admin, df_proveedores, df_donantes, args) -> float:
+    """Corre el motor sincronico con el pool y las ramas en paralelo"""
+    prepare_schema(admin)
+    log = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(log):
+        pool = ingestion.setup_connection_pool(pool_size=args.pool_size)
+        policy = ingestion.CommitPolicy("lote", args.batch_size)
+        cache = ingestion.DimensionCache()
+        with pool.connection() as (conn, cursor):
+            cache.preload(cursor)
+            table_to_col = ingestion.handle_proveedor_dimension_tables(conn, cursor, df_proveedores, policy, cache)
+            ingestion.handle_donante_dimension_tables(conn, cursor, df_donantes, policy, cache)
+            policy.end_run(conn)
+        ingestion.load_branches_parallel(pool, df_proveedores, df_donantes, table_to_col, policy, cache=cache)
+    return time.perf_counter() - start
+
+
+def run_async(ingestion, admin, df_proveedores, df_donantes, args, reset: bool = True) -> float:
+    """Corre el motor asincronico (sin reset, sobre la base ya cargada)"""
+    from async_ingestion import run_async as run_async_engine
+
+    if reset:
+        prepare_schema(admin)
+    log = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(log):
+        asyncio.run(run_async_engine(ingestion.load_db_config(), df_proveedores, df_donantes, [],
+                                     args.batch_size, args.pool_size))
+    return time.perf_counter() - start
+
+
+def main(args) -> None:
+    os.environ.setdefault("USE_ENV_EXAMPLE", "1")
+    ingestion = load_ingestion_module()
+    rng = np.random.default_rng(args.semilla)
+
+    print(f"Generando {args.filas:,} transacciones sinteticas por entidad...")
+    df_proveedores = synthetic_proveedores(args.filas, rng)
+    df_donantes = synthetic_donantes(args.filas, rng)
+
+    # Conexion aparte para recrear el schema y contar filas
+    admin = ingestion.setup_connection_pool(pool_size=1)
+    t_sync = run_sync(ingestion, admin, df_proveedores, df_donantes, args)
+    sync = count_rows(admin), load_keys(admin)
+    t_async = run_async(ingestion, admin, df_proveedores, df_donantes, args)
+    carga_async = count_rows(admin), load_keys(admin)
+    # Repetir la carga: las transacciones ya cargadas se omiten y las entidades se actualizan
+    t_repetida = run_async(ingestion, admin, df_proveedores, df_donantes, args, reset=False)
+    repetida = count_rows(admin), load_keys(admin)
+
+    filas = 2 * args.filas
+    print(f"\n{'motor':<18}{'segundos':>12}{'filas/s':>12}")
+    print(f"{'sync':<18}{t_sync:>12.2f}{filas / t_sync:>12,.0f}")
+    print(f"{'async':<18}{t_async:>12.2f}{filas / t_async:>12,.0f}")
+    print(f"{'async (repetida)':<18}{t_repetida:>12.2f}{filas / t_repetida:>12,.0f}")
+    print(f"\nFilas por tabla (sync):  {sync[0]}")
+    print(f"Filas por tabla (async): {carga_async[0]}")
+
+    diferencias = compare("async", sync, carga_async) + compare("async repetida", sync, repetida)
+    if diferencias:
+        raise SystemExit("Los motores no cargaron la misma base:\n  " + "\n  ".join(diferencias))
+    print("Ambos motores cargaron las mismas filas y claves; la segunda corrida async no agrego filas")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del motor async vs el motor sincronico")
+    parser.add_argument("--filas", type=int, default=200_000, help="Transacciones sinteticas por entidad")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filas por lote")
+    parser.add_argument("--pool-size", type=int, default=4, help="Conexiones del pool de cada motor")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del dataset sintetico")
+    main(parser.parse_args())
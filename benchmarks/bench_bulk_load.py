@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Benchmark de la carga masiva (LOAD DATA LOCAL INFILE) contra la carga por filas
+de db-ingestion.py sobre un dataset sintetico.
+
+Requiere el contenedor MySQL local levantado con `docker compose up -d`
+(usa las credenciales de src/.env.example) y recrea el schema con _DATABASE/ddl.sql
+antes de cada corrida.
+
+Usage:
+  python benchmarks/bench_bulk_load.py [--filas 1000000] [--filas-actual 50000]
+                                       [--commit fila] [--batch-size 1000]
+"""
+
+import argparse
+import importlib.util
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = REPO_ROOT / "src"
+DDL = REPO_ROOT / "_DATABASE" / "ddl.sql"
+
+
+def load_ingestion_module():
+    """Importa src/db-ingestion.py (el nombre con guion no se puede importar directo)"""
+    sys.path.insert(0, str(SRC_DIR))
+    spec = importlib.util.spec_from_file_location("db_ingestion", SRC_DIR / "db-ingestion.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_proveedores(n_filas: int, rng: np.random.Generator, n_entidades: int = 5000) -> pd.DataFrame:
+    """Genera transacciones de proveedores con el formato de data/cleaned/proveedores-clean.csv"""
+    ids = rng.integers(1, n_entidades + 1, n_filas)
+    numero = pd.Series(ids).map("P{:06d}".format)
+    return pd.DataFrame({
+        "numero": numero,
+        "nombre": "Proveedor " + numero,
+        "cuit": pd.Series(ids).map("30-{:08d}-1".format),
+        "categoria": rng.choice(["Servicios", "Materiales", "Agroindustria", "Tecnologia"], n_filas),
+        "contribuyente": rng.choice(["Responsable inscripto", "Monotributista", "Exento"], n_filas),
+        "contacto": "Contacto " + numero,
+        "mail": numero.str.lower() + "@empresa.com",
+        "telefono": pd.Series(ids % 10000).map("{:04d}-5678".format),
+        "razon": rng.choice(["S.A", "S.R.L", "S.A.S", "Cooperativa"], n_filas),
+        "importe": rng.integers(1000, 500000, n_filas).astype(float),
+        "fecha": pd.Timestamp("2018-01-01") + pd.to_timedelta(rng.integers(0, 2500, n_filas), unit="D"),
+        "nro_cuenta": rng.choice([501400, 503100, 507100, 509100, 514100, 516000], n_filas),
+        "ciudad": rng.choice(["Buenos Aires", "Cordoba", "Rosario", "Mendoza", "Resistencia"], n_filas),
+    }).assign(fecha=lambda df: df["fecha"].dt.strftime("%Y-%m-%d"))
+
+
+def synthetic_donantes(n_filas: int, rng: np.random.Generator, n_entidades: int = 5000) -> pd.DataFrame:
+    """Genera transacciones de donantes con el formato de data/cleaned/donantes-clean.csv"""
+    ids = rng.integers(1, n_entidades + 1, n_filas)
+    numero = pd.Series(ids).map("D{:06d}".format)
+    return pd.DataFrame({
+        "numero": numero,
+        "nombre": "Donante " + numero,
+        "tipo": rng.choice(["Empresa", "Estado", "Particular"], n_filas),
+        "contacto": "Contacto " + numero,
+        "mail": numero.str.lower() + "@example.com",
+        "telefono": pd.Series(ids % 10000).map("(011) 5000-{:04d}".format),
+        "razon": rng.choice(["S.A", "S.R.L", "GOB", "Particular"], n_filas),
+        "contribuyente": rng.choice(["Responsable Inscripto", "Monotributista", "Exento"], n_filas),
+        "cuit": pd.Series(ids).map("20-{:08d}-9".format),
+        "fecha": pd.Timestamp("2018-01-01") + pd.to_timedelta(rng.integers(0, 2500, n_filas), unit="D"),
+        "activo": rng.random(n_filas) < 0.5,
+        "frecuencia": rng.choice(["Mensual", "Bimestral", "Semestral", "Anual"], n_filas),
+        "importe": rng.integers(1000, 500000, n_filas).astype(float),
+        "nro_cuenta": rng.choice([402101, 403101, 403103, 404100], n_filas),
+        "pais": rng.choice(["Argentina", "Chile", "Bolivia", "Colombia"], n_filas),
+    }).assign(fecha=lambda df: df["fecha"].dt.strftime("%Y-%m-%d"))
+
+
+def reset_schema(cursor) -> None:
+    """Recrea la base de datos ejecutando _DATABASE/ddl.sql sentencia por sentencia"""
+    lines = [line for line in DDL.read_text(encoding="utf-8").splitlines()
+             if not line.strip().startswith("--")]
+    for statement in "\n".join(lines).split(";"):
+        if statement.strip():
+            cursor.execute(statement)
+
+
+def run_engine(ingestion, df_proveedores: pd.DataFrame, df_donantes: pd.DataFrame, bulk: bool, policy) -> float:
+    """Corre la ingestion completa sobre un schema vacio y devuelve los segundos que tardo"""
+    pool = ingestion.setup_connection_pool(allow_local_infile=bulk, pool_size=1)
+    with pool.connection() as (conn, cursor):
+        reset_schema(cursor)
+        conn.commit()
+
+        log = io.StringIO()
+        start = time.perf_counter()
+        with redirect_stdout(log):
+            cache = ingestion.DimensionCache()
+            table_to_col = ingestion.handle_proveedor_dimension_tables(conn, cursor, df_proveedores, policy, cache)
+            ingestion.process_proveedor_data(conn, cursor, df_proveedores, table_to_col, policy, bulk, cache)
+            ingestion.handle_donante_dimension_tables(conn, cursor, df_donantes, policy, cache)
+            ingestion.process_donante_data(conn, cursor, df_donantes, policy, bulk, cache)
+            policy.end_run(conn)
+        return time.perf_counter() - start
+
+
+def main(args) -> None:
+    os.environ.setdefault("USE_ENV_EXAMPLE", "1")
+    ingestion = load_ingestion_module()
+    rng = np.random.default_rng(args.semilla)
+
+    print(f"Generando {args.filas:,} transacciones sinteticas por entidad...")
+    df_proveedores = synthetic_proveedores(args.filas, rng)
+    df_donantes = synthetic_donantes(args.filas, rng)
+
+    # La carga por filas se mide sobre un subconjunto y se extrapola por filas/s
+    n_actual = min(args.filas, args.filas_actual)
+    policy = ingestion.CommitPolicy(args.commit, args.batch_size)
+    t_actual = run_engine(ingestion, df_proveedores.head(n_actual), df_donantes.head(n_actual), False, policy)
+    t_bulk = run_engine(ingestion, df_proveedores, df_donantes, True, ingestion.CommitPolicy("tabla", args.batch_size))
+
+    filas_actual = 2 * n_actual
+    filas_bulk = 2 * args.filas
+    tasa_actual = filas_actual / t_actual
+    tasa_bulk = filas_bulk / t_bulk
+    print(f"\n{'motor':<28}{'filas':>12}{'segundos':>12}{'filas/s':>12}")
+    print(f"{f'filas (commit={args.commit})':<28}{filas_actual:>12,}{t_actual:>12.2f}{tasa_actual:>12,.0f}")
+    print(f"{'bulk (LOAD DATA)':<28}{filas_bulk:>12,}{t_bulk:>12.2f}{tasa_bulk:>12,.0f}")
+    print(f"\nTiempo estimado por filas para {filas_bulk:,} filas: {filas_bulk / tasa_actual:.0f} s")
+    print(f"Speedup: {tasa_bulk / tasa_actual:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de carga masiva vs carga por filas")
+    parser.add_argument("--filas", type=int, default=1_000_000, help="Transacciones sinteticas por entidad")
+    parser.add_argument("--filas-actual", type=int, default=50_000,
+                        help="Transacciones para medir la carga por filas (se extrapola al total)")
+    parser.add_argument("--commit", default="fila", help="Politica de commit de la carga por filas")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filas por lote de la carga por filas")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del dataset sintetico")
+    main(parser.parse_args())
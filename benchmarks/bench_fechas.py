@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Benchmark del parseo de fechas: parse_fechas (src/pipeline/fechas.py) contra
+pd.to_datetime(format='mixed', dayfirst=True) sobre fechas sinteticas con los
+formatos de los CSV crudos ("18/03/2024", "1/1/2018", "2/6/24/").
+
+Usage:
+  python benchmarks/bench_fechas.py [--filas 1000000] [--filas-mixed 100000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "pipeline"))
+from fechas import parse_fechas
+
+
+def synthetic_fechas(n_filas: int, rng: np.random.Generator) -> pd.Series:
+    """Fechas entre 2018 y 2024 repartidas en los tres formatos de los datos crudos"""
+    fechas = pd.Series(pd.Timestamp("2018-01-01") + pd.to_timedelta(rng.integers(0, 2555, n_filas), unit="D"))
+    dia, mes, anio = fechas.dt.day.astype(str), fechas.dt.month.astype(str), fechas.dt.year.astype(str)
+    formato = rng.integers(0, 3, n_filas)
+    texto = dia.str.zfill(2) + "/" + mes.str.zfill(2) + "/" + anio
+    texto = texto.where(formato != 1, dia + "/" + mes + "/" + anio)
+    return texto.where(formato != 2, dia + "/" + mes + "/" + anio.str[2:] + "/")
+
+
+def medir(func, serie: pd.Series) -> tuple:
+    """Devuelve (resultado, segundos)"""
+    start = time.perf_counter()
+    resultado = func(serie)
+    return resultado, time.perf_counter() - start
+
+
+def parse_mixed(serie: pd.Series) -> pd.Series:
+    """Camino anterior (la barra final de las fechas viejas se saca antes, si no format='mixed' falla)"""
+    return pd.to_datetime(serie.str.rstrip("/"), format="mixed", dayfirst=True)
+
+
+def main(args) -> None:
+    rng = np.random.default_rng(args.semilla)
+    print(f"Generando {args.filas:,} fechas sinteticas...")
+    serie = synthetic_fechas(args.filas, rng)
+
+    n_mixed = min(args.filas, args.filas_mixed)
+    esperado, t_mixed = medir(parse_mixed, serie.head(n_mixed))
+    resultado, t_nuevo = medir(parse_fechas, serie)
+
+    if not resultado.head(n_mixed).equals(esperado):
+        raise SystemExit("parse_fechas no coincide con format='mixed'")
+
+    tasa_mixed = n_mixed / t_mixed
+    tasa_nuevo = args.filas / t_nuevo
+    print(f"\n{'parser':<24}{'filas':>12}{'segundos':>12}{'filas/s':>14}")
+    print(f"{'format=mixed':<24}{n_mixed:>12,}{t_mixed:>12.2f}{tasa_mixed:>14,.0f}")
+    print(f"{'parse_fechas':<24}{args.filas:>12,}{t_nuevo:>12.2f}{tasa_nuevo:>14,.0f}")
+    print(f"\nSpeedup: {tasa_nuevo / tasa_mixed:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del parseo de fechas por formato")
+    parser.add_argument("--filas", type=int, default=1_000_000, help="Fechas sinteticas")
+    parser.add_argument("--filas-mixed", type=int, default=100_000,
+                        help="Fechas para medir format='mixed' (se compara por filas/s)")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla de las fechas sinteticas")
+    main(parser.parse_args())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Benchmark del parseo de extractos mensuales con el registro de fuentes
+(src/pipeline/fuentes.py): en serie contra el pool de procesos.
+
+Genera --meses extractos de proveedores con el formato de proveedores-new.csv
+(la mitad con las variantes de columnas "Categoria Proveedor" / "Numero Proveedor")
+en un directorio temporal y mide load_entity con 1 y con --workers procesos.
+
+Usage:
+  python benchmarks/bench_fuentes.py [--meses 24] [--filas 200000] [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parent.parent
+os.environ["PIPELINE_RAW_CACHE"] = ""
+sys.path.insert(0, str(RAIZ / "src" / "pipeline"))
+from fuentes import load_entity
+
+
+def write_extracts(directorio: Path, meses: int, filas: int) -> None:
+    """Extractos mensuales con las filas de proveedores-new.csv repetidas, mas el extracto viejo"""
+    nuevo = pd.read_csv(RAIZ / "data" / "raw" / "proveedores-new.csv")
+    nuevo = pd.concat([nuevo] * (filas // len(nuevo) + 1), ignore_index=True).iloc[:filas]
+    variante = {"Categor/a Proveedor": "Categoria Proveedor", "Número Proveedor": "Numero Proveedor"}
+    for mes in range(meses):
+        df = nuevo.rename(columns=variante) if mes % 2 else nuevo
+        df.to_csv(directorio / f"proveedores-{2020 + mes // 12}-{mes % 12 + 1:02d}.csv", index=False)
+    pd.read_csv(RAIZ / "data" / "raw" / "proveedores-old.csv").to_csv(directorio / "proveedores-old.csv", index=False)
+
+
+def measure(directorio: Path, workers: int) -> tuple:
+    start = time.perf_counter()
+    extractos = load_entity("proveedores", directorio, workers)
+    return time.perf_counter() - start, extractos
+
+
+def main(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directorio = Path(tmp)
+        write_extracts(directorio, args.meses, args.filas)
+        mb = sum(path.stat().st_size for path in directorio.iterdir()) / 1e6
+        print(f"{args.meses} extractos, {mb:.0f} MB")
+
+        serie, esperado = measure(directorio, 1)
+        print(f"1 proceso:  {serie:.2f}s")
+        paralelo, extractos = measure(directorio, args.workers)
+        print(f"{args.workers} procesos: {paralelo:.2f}s ({serie / paralelo:.1f}x)")
+        assert all(extractos[v].equals(esperado[v]) for v in esperado), "El resultado en paralelo difiere"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del parseo de extractos en serie y en paralelo")
+    parser.add_argument("--meses", type=int, default=24, help="Extractos mensuales a generar")
+    parser.add_argument("--filas", type=int, default=200_000, help="Filas de cada extracto")
+    parser.add_argument("--workers", type=int, default=4, help="Procesos del pool")
+    main(parser.parse_args())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Benchmark del tiempo de importacion de cada punto de entrada del pipeline.
+
+Cada modulo se importa en un interprete nuevo con `python -X importtime`
+(sin ejecutar su main) y se suman los tiempos acumulados de los imports de
+primer nivel. Informa la mediana de varias corridas y los paquetes que mas
+pesan, para ver por ejemplo que ingestion_lite.py no carga pandas.
+
+Usage:
+  python benchmarks/bench_import.py [--repeticiones 5] [--top 5]
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# modulo: directorio donde esta (los modulos se importan entre si por nombre)
+MODULOS = {
+    "merge_data": SRC / "pipeline",
+    "clean_donantes": SRC / "pipeline",
+    "clean_proveedores": SRC / "pipeline",
+    "db-ingestion": SRC,
+    "ingestion_lite": SRC,
+    "main": SRC,
+}
+
+# import time: self [us] | cumulative | imported package
+LINEA = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(modulo: str, directorio: Path) -> tuple:
+    """
+    Importa un modulo en un interprete nuevo con -X importtime
+
+    params
+    ------
+      * modulo: str
+        - nombre del modulo (db-ingestion se importa con __import__ por el guion)
+      * directorio: Path
+        - directorio que se agrega a sys.path
+
+    returns:
+        - tupla con (segundos totales, {paquete importado por el modulo: segundos}, importa pandas)
+    """
+    codigo = f"import sys; sys.path.insert(0, {str(directorio)!r}); __import__({modulo!r})"
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                             capture_output=True, text=True, cwd=directorio)
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr.strip().splitlines()[-1])
+
+    # importtime lista cada import despues de los suyos: los imports directos del
+    # modulo (sangria 3) son los que aparecen justo antes de su linea (sangria 1)
+    total = 0.0
+    paquetes = {}
+    hijos = {}
+    usa_pandas = False
+    for match in LINEA.finditer(proceso.stderr):
+        _, acumulado, sangria, nombre = match.groups()
+        usa_pandas |= nombre.split(".")[0] == "pandas"
+        if len(sangria) == 1:
+            if nombre == modulo:
+                total, paquetes = int(acumulado) / 1e6, hijos
+            hijos = {}
+        elif len(sangria) == 3:
+            raiz = nombre.split(".")[0]
+            hijos[raiz] = hijos.get(raiz, 0) + int(acumulado) / 1e6
+    return total, paquetes, usa_pandas
+
+
+def main(args) -> None:
+    print(f"{'modulo':<20}{'segundos':>10}{'pandas':>8}   paquetes mas pesados")
+    for nombre, directorio in MODULOS.items():
+        corridas = [import_times(nombre, directorio) for _ in range(args.repeticiones)]
+        total = statistics.median(t for t, _, _ in corridas)
+        _, paquetes, usa_pandas = corridas[-1]
+        top = sorted(paquetes.items(), key=lambda p: p[1], reverse=True)[:args.top]
+        detalle = ", ".join(f"{p} {s:.2f}s" for p, s in top)
+        print(f"{nombre:<20}{total:>10.2f}{'si' if usa_pandas else 'no':>8}   {detalle}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del tiempo de importacion de las etapas")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Corridas por modulo (se informa la mediana)")
+    parser.add_argument("--top", type=int, default=5, help="Paquetes mas pesados a mostrar")
+    main(parser.parse_args())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Benchmark del parseo de importes: parse_importe (src/pipeline/importe.py) contra
+el camino anterior de merge_data.py (float -> texto con formato argentino -> float
+con `.apply` por elemento) sobre importes sinteticos.
+
+El camino anterior se mide sobre un subconjunto y se extrapola por filas/s.
+
+Usage:
+  python benchmarks/bench_importe.py [--filas 10000000] [--filas-actual 1000000]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "pipeline"))
+from importe import parse_importe
+
+
+def synthetic_importes(n_filas: int, rng: np.random.Generator) -> pd.Series:
+    """Importes entre 1.000,00 y 999.999,99 con el formato de los CSV crudos (la mitad con $)"""
+    centavos = rng.integers(100_000, 100_000_000, n_filas)
+    pesos = pd.Series(centavos // 100)
+    miles = (pesos // 1000).astype(str)
+    resto = (pesos % 1000).astype(str).str.zfill(3)
+    decimales = pd.Series(centavos % 100).astype(str).str.zfill(2)
+    texto = miles + "." + resto + "," + decimales
+    con_signo = pd.Series(rng.random(n_filas) < 0.5)
+    return texto.where(~con_signo, "$" + texto)
+
+
+def parse_actual(serie: pd.Series) -> pd.Series:
+    """Camino anterior: clean_importe + formato con lambda + to_numeric_importe"""
+    def clean_importe(importe):
+        importe_cleaned = re.sub(r'[^\d,]', '', importe)
+        importe_cleaned = importe_cleaned.replace('.', '')
+        importe_cleaned = importe_cleaned.replace(',', '.')
+        return float(importe_cleaned)
+
+    def to_numeric_importe(importe):
+        importe_cleaned = importe.replace('.', '')
+        importe_cleaned = importe_cleaned.replace(',', '.')
+        return importe_cleaned
+
+    valores = serie.apply(clean_importe)
+    valores = valores.apply(lambda x: f"{x:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+    return pd.to_numeric(valores.apply(to_numeric_importe), errors='coerce')
+
+
+def medir(func, serie: pd.Series) -> tuple:
+    """Devuelve (resultado, segundos)"""
+    start = time.perf_counter()
+    resultado = func(serie)
+    return resultado, time.perf_counter() - start
+
+
+def main(args) -> None:
+    rng = np.random.default_rng(args.semilla)
+    print(f"Generando {args.filas:,} importes sinteticos...")
+    serie = synthetic_importes(args.filas, rng)
+
+    n_actual = min(args.filas, args.filas_actual)
+    esperado, t_actual = medir(parse_actual, serie.head(n_actual))
+    resultado, t_nuevo = medir(parse_importe, serie)
+
+    if not np.allclose(resultado.head(n_actual).to_numpy(), esperado.to_numpy()):
+        raise SystemExit("parse_importe no coincide con el camino anterior")
+
+    tasa_actual = n_actual / t_actual
+    tasa_nuevo = args.filas / t_nuevo
+    print(f"\n{'parser':<24}{'filas':>12}{'segundos':>12}{'filas/s':>14}")
+    print(f"{'apply (anterior)':<24}{n_actual:>12,}{t_actual:>12.2f}{tasa_actual:>14,.0f}")
+    print(f"{'parse_importe':<24}{args.filas:>12,}{t_nuevo:>12.2f}{tasa_nuevo:>14,.0f}")
+    print(f"\nTiempo estimado del camino anterior para {args.filas:,} filas: {args.filas / tasa_actual:.1f} s")
+    print(f"Speedup: {tasa_nuevo / tasa_actual:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del parseo vectorizado de importes")
+    parser.add_argument("--filas", type=int, default=10_000_000, help="Importes sinteticos")
+    parser.add_argument("--filas-actual", type=int, default=1_000_000,
+                        help="Importes para medir el camino anterior (se extrapola al total)")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla de los importes sinteticos")
+    main(parser.parse_args())
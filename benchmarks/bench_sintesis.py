@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Benchmark de la sintesis de merge_data (src/pipeline/sintesis.py) contra la
+implementacion anterior: `random_fecha` (random.randint + pd.to_timedelta por
+fecha) y `sample_dist` (value_counts en cada llamada con np.random global).
+
+La version anterior se mide sobre menos filas y se extrapola linealmente.
+
+Usage:
+  python benchmarks/bench_sintesis.py [--filas 10000000] [--filas-anterior 100000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "pipeline"))
+from sintesis import Synthesizer
+
+INICIO = pd.Timestamp("2021-01-01")
+FIN = pd.Timestamp("2024-12-31")
+
+
+def synthetic_paises(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Columna de origen para el muestreo ponderado, como País en donantes-new.csv"""
+    paises = np.array(["Argentina", "Brasil", "Uruguay", "Chile", "Paraguay", "Bolivia", "Peru", "Mexico"])
+    return pd.DataFrame({"País": rng.choice(paises, size=n, p=[.3, .2, .15, .1, .1, .05, .05, .05])})
+
+
+def anterior(origen: pd.DataFrame, filas: int) -> float:
+    """Sintesis anterior: una fecha por llamada y value_counts en cada muestreo"""
+    start = time.perf_counter()
+    intervalo = (FIN - INICIO).days
+    [INICIO + pd.to_timedelta(random.randint(0, intervalo), unit="d") for _ in range(filas)]
+    for _ in range(2):
+        dist = origen["País"].value_counts().reset_index()
+        dist["Probabilidad"] = dist["count"] / dist["count"].sum()
+        np.random.choice(dist["País"], size=filas, p=dist["Probabilidad"])
+    return time.perf_counter() - start
+
+
+def actual(origen: pd.DataFrame, filas: int, semilla: int) -> float:
+    """Sintesis actual: un sorteo vectorizado de fechas y distribucion cacheada"""
+    start = time.perf_counter()
+    synth = Synthesizer(semilla)
+    synth.dates(INICIO, FIN, filas)
+    for _ in range(2):
+        synth.sample(origen, "País", filas)
+    return time.perf_counter() - start
+
+
+def main(args) -> None:
+    origen = synthetic_paises(500, np.random.default_rng(args.semilla))
+
+    segundos_anterior = anterior(origen, args.filas_anterior)
+    extrapolado = segundos_anterior * args.filas / args.filas_anterior
+    print(f"Anterior: {args.filas_anterior:,} filas en {segundos_anterior:.2f}s "
+          f"(~{extrapolado:.1f}s para {args.filas:,})")
+
+    segundos_actual = actual(origen, args.filas, args.semilla)
+    print(f"Actual:   {args.filas:,} filas en {segundos_actual:.2f}s")
+    print(f"Speedup: {extrapolado / segundos_actual:.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la sintesis de fechas y muestreo ponderado")
+    parser.add_argument("--filas", type=int, default=10_000_000, help="Filas sinteticas de la version actual")
+    parser.add_argument("--filas-anterior", type=int, default=100_000, help="Filas de la version anterior (se extrapola)")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla de los datos")
+    main(parser.parse_args())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Benchmark del almacenamiento intermedio entre etapas (src/pipeline/storage.py):
+parquet, feather y csv sobre un dataset sintetico de donantes.
+
+Simula el recorrido de los datos por el pipeline: merge_data escribe la tabla,
+la etapa de limpieza la lee y la reescribe, y db-ingestion la vuelve a leer.
+Informa el tiempo total, el tamaño en disco y si los dtypes sobreviven al viaje.
+
+Usage:
+  python benchmarks/bench_storage.py [--filas 1000000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from bench_bulk_load import synthetic_donantes
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "pipeline"))
+from storage import FORMATOS, read_table, table_path, write_table
+
+
+def run_stages(df: pd.DataFrame, directorio: Path, formato: str) -> tuple:
+    """Escribe, lee, reescribe y lee la tabla. Devuelve (segundos, bytes en disco, tabla final)"""
+    start = time.perf_counter()
+    merged = write_table(df, table_path(directorio / "merged", "donantes", formato))
+    limpio = write_table(read_table(merged), table_path(directorio / "cleaned", "donantes", formato))
+    final = read_table(limpio)
+    segundos = time.perf_counter() - start
+    return segundos, merged.stat().st_size + limpio.stat().st_size, final
+
+
+def main(args) -> None:
+    rng = np.random.default_rng(args.semilla)
+    print(f"Generando {args.filas:,} donantes sinteticos...")
+    df = synthetic_donantes(args.filas, rng).assign(fecha=lambda d: pd.to_datetime(d["fecha"]))
+
+    print(f"\n{'formato':<10}{'segundos':>10}{'MB':>10}{'dtypes':>10}")
+    resultados = {}
+    for formato in FORMATOS:
+        with tempfile.TemporaryDirectory() as tmp:
+            segundos, size, final = run_stages(df, Path(tmp), formato)
+        resultados[formato] = segundos
+        dtypes = "ok" if final.dtypes.equals(df.dtypes) else "perdidos"
+        print(f"{formato:<10}{segundos:>10.2f}{size / 1e6:>10.1f}{dtypes:>10}")
+
+    for formato in ("parquet", "feather"):
+        print(f"Speedup {formato} vs csv: {resultados['csv'] / resultados[formato]:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del formato intermedio entre etapas")
+    parser.add_argument("--filas", type=int, default=1_000_000, help="Donantes sinteticos")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del dataset sintetico")
+    main(parser.parse_args())
@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Motor de ingestion asincronico sobre aiomysql.
+
+Hace lo mismo que el motor sincronico de db-ingestion.py (upsert de dimensiones,
+resolucion de foreign keys por columna, carga de entidades y tablas de hechos,
+conteo de filas insertadas y omitidas) pero deja varios lotes en vuelo al mismo
+tiempo sobre un pool chico de conexiones. Con enlaces de alta latencia (Cloud SQL)
+la carga deja de estar limitada por el round trip de cada sentencia.
+
+Cada lote se commitea al terminar (equivale a la politica de commit `lote`).
+
+Requiere `pip install aiomysql`.
+"""
+
+import asyncio
+import aiomysql
+import pandas as pd
+from db_pool import BACKOFF, RETRIES, TRANSIENT_ERRNOS
+from dimension_cache import DimensionCache, dimension_values
+from fk_resolution import build_params, fill_missing, format_missing, resolve_foreign_keys
+from incremental import WATERMARK_SELECT, WATERMARK_UPSERT, file_fingerprint, hash_lookups, transaction_hashes
+from queries import (DONANTE_DIMENSIONS, DONANTES_COLUMNS, DONANTES_INSERT, FACT_INSERT, PROVEEDOR_DIMENSIONS,
+                     PROVEEDORES_COLUMNS, PROVEEDORES_INSERT)
+
+
+async def create_pool(db_config: dict, size: int):
+    """
+    Crea el pool de conexiones asincronico
+
+    params
+    ------
+      * db_config: dict
+        - credenciales de la base de datos (mismo formato que mysql.connector)
+      * size: int
+        - cantidad maxima de conexiones
+
+    returns:
+        - pool de aiomysql
+    """
+    return await aiomysql.create_pool(
+        host=db_config["host"], user=db_config["user"], password=db_config["password"],
+        db=db_config["database"], minsize=1, maxsize=size, autocommit=False, charset="utf8mb4"
+    )
+
+
+async def fetchall(pool, query: str, params: tuple = None) -> list:
+    """Ejecuta una consulta con una conexion del pool y devuelve todas las filas"""
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(query, params)
+            return await cursor.fetchall()
+
+
+async def fetch_existing_hashes(pool, table: str, hashes, batch_size: int = 1000) -> set:
+    """
+    Igual que incremental.fetch_existing_hashes: busca los hashes por lotes de `IN (...)`
+    (sin traer la tabla entera a memoria), con los lotes en vuelo sobre el pool
+    """
+    lotes = await asyncio.gather(*(fetchall(pool, query, params)
+                                   for query, params in hash_lookups(table, hashes, batch_size)))
+    return {row[0] for filas in lotes for row in filas}
+
+
+async def execute(pool, query: str, params: tuple = None) -> None:
+    """Ejecuta una sentencia con una conexion del pool y hace commit"""
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(query, params)
+        await conn.commit()
+
+
+async def _insert_batch(conn, query: str, rows: list) -> tuple:
+    """
+    Inserta un lote con un INSERT multi-fila. Si falla por integridad se
+    reintenta fila por fila para omitir solo las filas invalidas
+    """
+    async with conn.cursor() as cursor:
+        try:
+            await cursor.executemany(query, rows)
+            await conn.commit()
+            return len(rows), 0
+        except aiomysql.IntegrityError:
+            await conn.rollback()
+            inserted = 0
+            for row in rows:
+                try:
+                    await cursor.execute(query, row)
+                    inserted += 1
+                except aiomysql.IntegrityError:
+                    pass
+            await conn.commit()
+            return inserted, len(rows) - inserted
+
+
+async def insert_batch(pool, query: str, rows: list) -> tuple:
+    """
+    Inserta un lote con una conexion del pool, reintentando con backoff los
+    errores transitorios (el lote se deshace entero, asi que es seguro repetirlo)
+
+    params
+    ------
+      * pool:
+        - pool de aiomysql
+      * query: str
+        - Sentencia INSERT de SQL con placeholders (%s)
+      * rows: list
+        - lista de tuplas con los valores a insertar
+
+    returns:
+        - tupla con (filas insertadas, filas omitidas)
+    """
+    for intento in range(RETRIES + 1):
+        try:
+            async with pool.acquire() as conn:
+                return await _insert_batch(conn, query, rows)
+        except aiomysql.OperationalError as e:
+            if e.args[0] not in TRANSIENT_ERRNOS or intento == RETRIES:
+                raise
+            espera = BACKOFF * 2 ** intento
+            print(f"Error transitorio ({e}): reintento {intento + 1}/{RETRIES} en {espera:.1f}s")
+            await asyncio.sleep(espera)
+
+
+async def insert_rows(pool, query: str, rows: list, batch_size: int) -> tuple:
+    """
+    Inserta todas las filas en lotes que se envian en paralelo; el pool limita
+    cuantos lotes hay en vuelo a la vez
+
+    returns:
+        - tupla con (filas insertadas, filas omitidas)
+    """
+    batches = [rows[start:start + batch_size] for start in range(0, len(rows), batch_size)]
+    results = await asyncio.gather(*(insert_batch(pool, query, batch) for batch in batches))
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
+async def preload_dimensions(pool, cache: DimensionCache) -> None:
+    """Lee todas las dimensiones en paralelo y las guarda en el cache"""
+    tables = list(cache.dimensions)
+    results = await asyncio.gather(*(fetchall(pool, cache.select_query(table)) for table in tables))
+    for table, rows in zip(tables, results):
+        cache.add(table, [], rows)
+        print(f"Fetch fkeys from {table}")
+
+
+async def ingest_table(pool, cache: DimensionCache, table: str, values: list) -> None:
+    """
+    Inserta en una dimension los valores que el cache no conoce y guarda sus ids
+
+    params
+    ------
+      * pool:
+        - pool de aiomysql
+      * cache: DimensionCache
+        - cache de surrogate keys ya cargado
+      * table: str
+        - tabla de dimension
+      * values: list
+        - valores unicos de la dimension
+
+    returns:
+        - None
+    """
+    nuevos = cache.missing(table, values)
+    if nuevos:
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany(cache.upsert_query(table), [(value,) for value in nuevos])
+                await conn.commit()
+                await cursor.execute(cache.select_query(table, len(nuevos)), tuple(nuevos))
+                cache.add(table, values, await cursor.fetchall())
+    print(f"Cantidad de filas insertadas en {table}: {len(nuevos)}")
+
+
+async def ingest_dimensions(pool, cache: DimensionCache, df_proveedores: pd.DataFrame, df_donantes: pd.DataFrame) -> None:
+    """
+    Carga todas las dimensiones. Los valores de las dimensiones compartidas se
+    juntan primero, asi cada tabla se escribe una sola vez y en paralelo con las demas
+    """
+    values = {}
+    for df, dimensions in ((df_proveedores, PROVEEDOR_DIMENSIONS), (df_donantes, DONANTE_DIMENSIONS)):
+        for table, col in dimensions.items():
+            values.setdefault(table, []).extend(dimension_values(df[col]))
+    await asyncio.gather(*(ingest_table(pool, cache, table, table_values) for table, table_values in values.items()))
+
+
+async def ingest_entity(pool, df: pd.DataFrame, table: str, query: str, cols: list, specs: dict, batch_size: int) -> None:
+    """
+    Carga una tabla de entidades (proveedores o donantes) con sus foreign keys
+
+    params
+    ------
+      * pool:
+        - pool de aiomysql
+      * df: pd.DataFrame
+        - entidades unicas
+      * table: str
+        - tabla de la entidad
+      * query: str
+        - sentencia INSERT ... ON DUPLICATE KEY UPDATE
+      * cols: list
+        - columnas en el orden de los placeholders
+      * specs: dict
+        - {columna fk: (columna de origen, mapeo)}
+      * batch_size: int
+        - filas por lote
+
+    returns:
+        - None
+    """
+    df_fk, missing_keys = resolve_foreign_keys(df.reset_index(drop=True), specs)
+    count, skipped = await insert_rows(pool, query, build_params(df_fk, cols), batch_size)
+
+    print(f"Cantidad de filas insertadas en {table}: {count}")
+    if skipped > 0:
+        print(f"Filas omitidas por errores de integridad en {table}: {skipped}")
+    missing_summary = format_missing(missing_keys)
+    if missing_summary:
+        print(f"Filas omitidas por claves foraneas faltantes en {table}: {len(df) - len(df_fk)}")
+        print(f"Claves foraneas faltantes: {missing_summary}")
+
+
+async def ingest_fact_table(pool, df: pd.DataFrame, table: str, entity_table: str, id_col: str, cuenta_mapping: dict,
+                            batch_size: int) -> None:
+    """
+    Carga una tabla de hechos (gastos o ingresos) con el hash de cada transaccion.
+    Las transacciones cuyo hash ya esta en la tabla se omiten (igual que el motor sincronico)
+
+    params
+    ------
+      * pool:
+        - pool de aiomysql
+      * df: pd.DataFrame
+        - todas las transacciones
+      * table: str
+        - tabla de hechos (gastos, ingresos)
+      * entity_table: str
+        - tabla de la entidad (proveedores, donantes)
+      * id_col: str
+        - columna de la foreign key a la entidad
+      * cuenta_mapping: dict
+        - foreign keys de cuentas
+      * batch_size: int
+        - filas por lote
+
+    returns:
+        - None
+    """
+    entidad_mapping = {numero: id_ for id_, numero in await fetchall(pool, f"SELECT `id`, `numero` FROM `{entity_table}`")}
+
+    df = df[["numero", "nro_cuenta", "importe", "fecha"]].reset_index(drop=True)
+    df["hash"] = transaction_hashes(df)
+    df_fk, _ = resolve_foreign_keys(df, {
+        id_col: ("numero", entidad_mapping),
+        "id_cuenta": ("nro_cuenta", cuenta_mapping),
+    })
+    df_nuevas = df_fk[~df_fk["hash"].isin(await fetch_existing_hashes(pool, table, df_fk["hash"]))]
+    if len(df_nuevas) < len(df_fk):
+        print(f"Filas ya cargadas en {table}: {len(df_fk) - len(df_nuevas)}")
+
+    query = FACT_INSERT.format(table=table, id_col=id_col)
+    rows = build_params(df_nuevas, ["importe", "fecha", id_col, "id_cuenta", "hash"])
+    count, skipped = await insert_rows(pool, query, rows, batch_size)
+    skipped += len(df) - len(df_fk)
+
+    print(f"Cantidad de filas insertadas en {table}: {count}")
+    print(f"Filas omitidas en {table}: {skipped}")
+
+
+async def load_proveedores(pool, cache: DimensionCache, df: pd.DataFrame, batch_size: int) -> None:
+    """Rama proveedores -> gastos"""
+    await ingest_entity(pool, df.drop_duplicates(subset="numero"), "proveedores", PROVEEDORES_INSERT, PROVEEDORES_COLUMNS, {
+        "id_categoria": ("categoria", cache.mapping("categoria_proveedores")),
+        "id_contribuyente": ("contribuyente", cache.mapping("tipo_contribuyentes")),
+        "id_razon": ("razon", cache.mapping("razones_sociales")),
+        "id_ciudad": ("ciudad", cache.mapping("ciudades")),
+    }, batch_size)
+    await ingest_fact_table(pool, df, "gastos", "proveedores", "id_proveedor", cache.mapping("cuentas"), batch_size)
+
+
+async def load_donantes(pool, cache: DimensionCache, df: pd.DataFrame, batch_size: int) -> None:
+    """Rama donantes -> ingresos"""
+    await ingest_entity(pool, df.drop_duplicates(subset="numero"), "donantes", DONANTES_INSERT, DONANTES_COLUMNS, {
+        "id_frecuencia": ("frecuencia", cache.mapping("frecuencias")),
+        "id_contribuyente": ("contribuyente", cache.mapping("tipo_contribuyentes")),
+        "id_razon": ("razon", cache.mapping("razones_sociales")),
+        "id_tipo": ("tipo", cache.mapping("tipo_donantes")),
+        "id_pais": ("pais", cache.mapping("paises")),
+    }, batch_size)
+    await ingest_fact_table(pool, df, "ingresos", "donantes", "id_donante", cache.mapping("cuentas"), batch_size)
+
+
+async def run_async(db_config: dict, df_proveedores: pd.DataFrame, df_donantes: pd.DataFrame, paths: list,
+                    batch_size: int, pool_size: int, incremental: bool = False) -> None:
+    """
+    Ingestion completa con el motor asincronico
+
+    params
+    ------
+      * db_config: dict
+        - credenciales de la base de datos
+      * df_proveedores: pd.DataFrame
+        - dataframe de proveedores
+      * df_donantes: pd.DataFrame
+        - dataframe de donantes
+      * paths: list
+        - archivos de origen (proveedores, donantes) para el modo incremental
+      * batch_size: int
+        - filas por lote
+      * pool_size: int
+        - conexiones del pool
+      * incremental: bool
+        - cargar solo los archivos que cambiaron (las transacciones ya cargadas se omiten siempre)
+
+    returns:
+        - None
+    """
+    # Manejar valores nulos en razon - asignar valor predeterminado (igual que el motor sincronico)
+    df_donantes = df_donantes.assign(razon=fill_missing(df_donantes["razon"], "Sin Razón Social"))
+
+    pool = await create_pool(db_config, pool_size)
+    print(f"Pool asincronico creado ({pool_size} conexiones)")
+    try:
+        cambios = {}
+        # Sin paths (datos en memoria) no hay archivos que comparar con la ultima carga
+        if incremental and paths:
+            for path in paths:
+                huella = file_fingerprint(path)
+                rows = await fetchall(pool, WATERMARK_SELECT, (path.name,))
+                if rows and rows[0][0] == huella:
+                    print(f"{path.name} sin cambios desde la ultima carga, se omite")
+                else:
+                    cambios[path.name] = huella
+            if not cambios:
+                print("No hay cambios en los archivos de origen")
+                return
+            if paths[0].name not in cambios:
+                df_proveedores = df_proveedores.iloc[:0]
+            if paths[1].name not in cambios:
+                df_donantes = df_donantes.iloc[:0]
+
+        cache = DimensionCache()
+        await preload_dimensions(pool, cache)
+        await ingest_dimensions(pool, cache, df_proveedores, df_donantes)
+
+        # Las dos ramas solo comparten dimensiones, que ya estan cargadas
+        await asyncio.gather(
+            load_proveedores(pool, cache, df_proveedores, batch_size),
+            load_donantes(pool, cache, df_donantes, batch_size),
+        )
+
+        for path, df in zip(paths, (df_proveedores, df_donantes)):
+            if path.name in cambios:
+                await execute(pool, WATERMARK_UPSERT, (path.name, cambios[path.name], len(df)))
+    finally:
+        pool.close()
+        await pool.wait_closed()
+        print("Desconectando Base de datos...")
@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Carga masiva de proveedores, donantes, gastos e ingresos.
+
+En lugar de un INSERT parametrizado por fila, cada tabla se vuelca a un TSV
+de staging con las surrogate keys de las dimensiones ya resueltas, se sube con
+`LOAD DATA LOCAL INFILE` a una tabla temporal y se termina con un
+`INSERT ... SELECT` set-based hacia la tabla final.
+
+Requiere `local_infile=ON` en el servidor y `allow_local_infile=True` en la conexion.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+import pandas as pd
+from fk_resolution import map_keys
+from incremental import transaction_hashes
+from queries import (DONANTES_COLUMNS, DONANTES_INTO, DONANTES_UPDATE, FACT_INTO, PROVEEDORES_COLUMNS, PROVEEDORES_INTO,
+                     PROVEEDORES_UPDATE)
+
+# Columnas de cada tabla de staging (en el orden del TSV)
+STAGING_TABLES = {
+    "stg_proveedores": {
+        "numero": "VARCHAR(100)",
+        "nombre": "VARCHAR(100)",
+        "cuit": "VARCHAR(100)",
+        "contacto": "VARCHAR(100)",
+        "mail": "VARCHAR(255)",
+        "telefono": "VARCHAR(30)",
+        "id_categoria": "INT",
+        "id_contribuyente": "INT",
+        "id_razon": "INT",
+        "id_ciudad": "INT",
+    },
+    "stg_donantes": {
+        "numero": "VARCHAR(100)",
+        "nombre": "VARCHAR(100)",
+        "cuit": "VARCHAR(100)",
+        "contacto": "VARCHAR(100)",
+        "mail": "VARCHAR(255)",
+        "telefono": "VARCHAR(50)",
+        "activo": "BOOL",
+        "id_frecuencia": "INT",
+        "id_contribuyente": "INT",
+        "id_razon": "INT",
+        "id_tipo": "INT",
+        "id_pais": "INT",
+    },
+    "stg_gastos": {
+        "importe": "DECIMAL(10, 2)",
+        "fecha": "DATE",
+        "numero": "VARCHAR(100)",
+        "id_cuenta": "INT",
+        "hash": "CHAR(64)",
+    },
+    "stg_ingresos": {
+        "importe": "DECIMAL(10, 2)",
+        "fecha": "DATE",
+        "numero": "VARCHAR(100)",
+        "id_cuenta": "INT",
+        "hash": "CHAR(64)",
+    },
+}
+
+# Columnas NOT NULL de las tablas finales, las filas con nulos se omiten
+REQUIRED = {
+    "stg_proveedores": ["numero", "nombre", "cuit", "id_categoria", "id_contribuyente", "id_razon", "id_ciudad"],
+    "stg_donantes": ["numero", "nombre", "cuit", "activo", "id_frecuencia", "id_contribuyente", "id_razon", "id_tipo", "id_pais"],
+    "stg_gastos": ["importe", "fecha", "numero", "id_cuenta", "hash"],
+    "stg_ingresos": ["importe", "fecha", "numero", "id_cuenta", "hash"],
+}
+
+
+def format_tsv_column(serie: pd.Series) -> pd.Series:
+    """
+    Formatea una columna para el TSV de `LOAD DATA`: escapa los separadores,
+    pasa los booleanos a 1/0 y los nulos a \\N
+
+    params
+    ------
+      * serie: pd.Series
+        - columna a formatear
+
+    returns:
+        - serie de strings
+    """
+    nulos = serie.isna()
+    if pd.api.types.is_bool_dtype(serie):
+        texto = serie.astype(int).astype(str)
+    elif pd.api.types.is_numeric_dtype(serie):
+        texto = serie.astype(str)
+    else:
+        texto = (serie.astype(str)
+                 .str.replace("\\", "\\\\", regex=False)
+                 .str.replace("\t", "\\t", regex=False)
+                 .str.replace("\n", "\\n", regex=False))
+    return texto.where(~nulos, "\\N")
+
+
+def write_staging_tsv(df: pd.DataFrame, cols: list, path: Path) -> int:
+    """
+    Escribe el TSV de staging armando cada linea de forma vectorizada
+
+    params
+    ------
+      * df: pd.DataFrame
+        - datos con las foreign keys ya resueltas
+      * cols: list
+        - columnas en el orden de la tabla de staging
+      * path: Path
+        - ruta del archivo TSV
+
+    returns:
+        - cantidad de filas escritas
+    """
+    if df.empty:
+        Path(path).write_text("", encoding="utf-8")
+        return 0
+    columnas = [format_tsv_column(df[col]) for col in cols]
+    lineas = columnas[0].str.cat(columnas[1:], sep="\t")
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("\n".join(lineas))
+        f.write("\n")
+    return len(lineas)
+
+
+def create_staging_table(cursor, table: str) -> None:
+    """
+    Crea (o recrea) la tabla temporal de staging
+
+    params
+    ------
+      * cursor:
+        - cursor de la db
+      * table: str
+        - nombre de la tabla de staging
+
+    returns:
+        - None
+    """
+    cols = ", ".join(f"`{col}` {tipo}" for col, tipo in STAGING_TABLES[table].items())
+    cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS `{table}`")
+    # `fila` conserva el orden del archivo para el INSERT ... SELECT
+    cursor.execute(f"CREATE TEMPORARY TABLE `{table}` (fila INT PRIMARY KEY AUTO_INCREMENT, {cols})")
+
+
+def stage_frame(cursor, df: pd.DataFrame, table: str, tmp_dir: Path = None) -> int:
+    """
+    Vuelca el dataframe a un TSV y lo sube con `LOAD DATA LOCAL INFILE` a la tabla de staging
+
+    params
+    ------
+      * cursor:
+        - cursor de la db
+      * df: pd.DataFrame
+        - datos con las foreign keys ya resueltas
+      * table: str
+        - nombre de la tabla de staging
+      * tmp_dir: Path
+        - directorio para el TSV, por defecto el temporal del sistema
+
+    returns:
+        - cantidad de filas en staging
+    """
+    cols = list(STAGING_TABLES[table])
+    create_staging_table(cursor, table)
+
+    fd, path = tempfile.mkstemp(prefix=f"{table}-", suffix=".tsv", dir=tmp_dir)
+    os.close(fd)
+    try:
+        staged = write_staging_tsv(df, cols, path)
+        col_list = ", ".join(f"`{col}`" for col in cols)
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+            r"FIELDS TERMINATED BY '\t' ESCAPED BY '\\' LINES TERMINATED BY '\n' "
+            f"({col_list})",
+            (str(path),)
+        )
+    finally:
+        os.remove(path)
+    print(f"Filas en {table}: {staged}")
+    return staged
+
+
+def insert_from_staging(conn, cursor, table: str, insert: str, select: str, source: str, staged: int, on_duplicate: str = "",
+                        condition: str = "") -> None:
+    """
+    Ejecuta el `INSERT ... SELECT` desde staging, hace commit e informa las filas
+    insertadas y omitidas
+
+    params
+    ------
+      * conn:
+        - conexion a la db
+      * cursor:
+        - cursor de la db
+      * table: str
+        - nombre de la tabla de staging
+      * insert: str
+        - clausula INSERT INTO tabla (columnas)
+      * select: str
+        - columnas del SELECT
+      * source: str
+        - clausula FROM (con sus JOIN) sobre la tabla de staging con alias `s`
+      * staged: int
+        - filas cargadas en staging
+      * on_duplicate: str
+        - clausula ON DUPLICATE KEY UPDATE opcional
+      * condition: str
+        - condicion adicional del WHERE (opcional)
+
+    returns:
+        - None
+    """
+    # En el INSERT ... SELECT no hay fila por fila: las que no cumplen las
+    # restricciones NOT NULL se filtran con el WHERE y se cuentan como omitidas
+    where = " AND ".join(f"s.`{col}` IS NOT NULL" for col in REQUIRED[table])
+    if condition:
+        where += f" AND {condition}"
+    cursor.execute(f"{insert} SELECT {select} {source} WHERE {where} ORDER BY s.fila {on_duplicate}")
+    count = cursor.rowcount
+    conn.commit()
+    cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS `{table}`")
+
+    if on_duplicate:
+        # Con ON DUPLICATE KEY UPDATE MySQL cuenta 1 por fila insertada y 2 por fila actualizada
+        print(f"Filas afectadas: {count}")
+    else:
+        print(f"Cantidad de filas insertadas: {count}")
+        print(f"Filas omitidas: {staged - count}")
+
+
+def bulk_load_proveedores(conn, cursor, df_proveedores: pd.DataFrame, mappings_fk_proveedor: tuple, tmp_dir: Path = None) -> None:
+    """
+    Carga masiva de la tabla proveedores
+
+    params
+    ------
+      * conn:
+        - conexion a la db
+      * cursor:
+        - cursor de la db
+      * df_proveedores: pd.DataFrame
+        - dataframe con los proveedores unicos
+      * mappings_fk_proveedor: tuple
+        - tupla con las foreign keys (categoria, contribuyente, razon, ciudad)
+      * tmp_dir: Path
+        - directorio para el TSV de staging
+
+    returns:
+        - None
+    """
+    categoria_mapping, contribuyente_mapping, razon_mapping, ciudades_mapping = mappings_fk_proveedor
+    df_stg = df_proveedores[["numero", "nombre", "cuit", "contacto", "mail", "telefono"]].copy()
+    df_stg["id_categoria"] = map_keys(df_proveedores["categoria"], categoria_mapping)
+    df_stg["id_contribuyente"] = map_keys(df_proveedores["contribuyente"], contribuyente_mapping)
+    df_stg["id_razon"] = map_keys(df_proveedores["razon"], razon_mapping)
+    df_stg["id_ciudad"] = map_keys(df_proveedores["ciudad"], ciudades_mapping)
+
+    staged = stage_frame(cursor, df_stg, "stg_proveedores", tmp_dir)
+    insert_from_staging(
+        conn, cursor, "stg_proveedores",
+        insert=PROVEEDORES_INTO,
+        select=", ".join(f"s.{col}" for col in PROVEEDORES_COLUMNS),
+        source="FROM stg_proveedores s",
+        staged=staged,
+        on_duplicate=PROVEEDORES_UPDATE,
+    )
+
+
+def bulk_load_donantes(conn, cursor, df_donantes: pd.DataFrame, mappings_fk_donantes: tuple, tmp_dir: Path = None) -> None:
+    """
+    Carga masiva de la tabla donantes
+
+    params
+    ------
+      * conn:
+        - conexion a la db
+      * cursor:
+        - cursor de la db
+      * df_donantes: pd.DataFrame
+        - dataframe con los donantes unicos
+      * mappings_fk_donantes: tuple
+        - tupla con las foreign keys (frecuencia, contribuyente, razon, tipo, pais)
+      * tmp_dir: Path
+        - directorio para el TSV de staging
+
+    returns:
+        - None
+    """
+    frecuencia_mapping, contribuyente_mapping, razon_mapping, tipo_mapping, pais_mapping = mappings_fk_donantes
+    df_stg = df_donantes[["numero", "nombre", "cuit", "contacto", "mail", "telefono", "activo"]].copy()
+    df_stg["id_frecuencia"] = map_keys(df_donantes["frecuencia"], frecuencia_mapping)
+    df_stg["id_contribuyente"] = map_keys(df_donantes["contribuyente"], contribuyente_mapping)
+    df_stg["id_razon"] = map_keys(df_donantes["razon"], razon_mapping)
+    df_stg["id_tipo"] = map_keys(df_donantes["tipo"], tipo_mapping)
+    df_stg["id_pais"] = map_keys(df_donantes["pais"], pais_mapping)
+
+    staged = stage_frame(cursor, df_stg, "stg_donantes", tmp_dir)
+    insert_from_staging(
+        conn, cursor, "stg_donantes",
+        insert=DONANTES_INTO,
+        select=", ".join(f"s.{col}" for col in DONANTES_COLUMNS),
+        source="FROM stg_donantes s",
+        staged=staged,
+        on_duplicate=DONANTES_UPDATE,
+    )
+
+
+def bulk_load_fact_table(conn, cursor, df: pd.DataFrame, table: str, entity_table: str, id_col: str, cuenta_mapping: dict, tmp_dir: Path = None) -> None:
+    """
+    Carga masiva de una tabla de hechos (gastos o ingresos). La cuenta se resuelve
+    en el TSV y la entidad (proveedor o donante) con un JOIN por `numero`.
+    Las transacciones cuyo hash ya esta en la tabla se omiten
+
+    params
+    ------
+      * conn:
+        - conexion a la db
+      * cursor:
+        - cursor de la db
+      * df: pd.DataFrame
+        - dataframe con todas las transacciones
+      * table: str
+        - tabla de hechos (gastos, ingresos)
+      * entity_table: str
+        - tabla de la entidad (proveedores, donantes)
+      * id_col: str
+        - columna de la foreign key a la entidad (id_proveedor, id_donante)
+      * cuenta_mapping: dict
+        - foreign keys de cuentas {nro_cuenta: id_cuenta}
+      * tmp_dir: Path
+        - directorio para el TSV de staging
+
+    returns:
+        - None
+    """
+    stg_table = f"stg_{table}"
+    df_stg = df[["importe", "fecha", "numero"]].copy()
+    df_stg["id_cuenta"] = map_keys(df["nro_cuenta"], cuenta_mapping)
+    df_stg["hash"] = transaction_hashes(df)
+
+    staged = stage_frame(cursor, df_stg, stg_table, tmp_dir)
+    insert_from_staging(
+        conn, cursor, stg_table,
+        insert=FACT_INTO.format(table=table, id_col=id_col),
+        select="s.importe, s.fecha, e.id, s.id_cuenta, s.hash",
+        source=f"FROM {stg_table} s JOIN {entity_table} e ON e.numero = s.numero LEFT JOIN {table} t ON t.hash = s.hash",
+        staged=staged,
+        condition="t.id IS NULL"
+    )
+
+
+def bulk_load_gastos(conn, cursor, df: pd.DataFrame, cuenta_mapping: dict, tmp_dir: Path = None) -> None:
+    """Carga masiva de la tabla gastos"""
+    bulk_load_fact_table(conn, cursor, df, "gastos", "proveedores", "id_proveedor", cuenta_mapping, tmp_dir)
+
+
+def bulk_load_ingresos(conn, cursor, df: pd.DataFrame, cuenta_mapping: dict, tmp_dir: Path = None) -> None:
+    """Carga masiva de la tabla ingresos"""
+    bulk_load_fact_table(conn, cursor, df, "ingresos", "donantes", "id_donante", cuenta_mapping, tmp_dir)
@@ -1,54 +1,100 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-import os
-from dotenv import load_dotenv
+import argparse
+import asyncio
 import pandas as pd
 import numpy as np
-from mysql.connector import connect, Error, IntegrityError
+from mysql.connector import Error, IntegrityError
 from pathlib import Path
 import sys
-
-def create_connection(db_config: dict):
+from concurrent.futures import ThreadPoolExecutor
+from bulk_load import bulk_load_proveedores, bulk_load_donantes, bulk_load_gastos, bulk_load_ingresos
+from dimension_cache import DimensionCache, dimension_values
+from fk_resolution import build_params, fill_missing, format_missing, resolve_foreign_keys
+from db_pool import ConnectionPool, POOL_SIZE, RETRIES, is_transient, load_db_config, retry_call
+from incremental import fetch_existing_hashes, file_fingerprint, get_watermark, transaction_hashes, update_watermark
+from queries import (DONANTE_DIMENSIONS, DONANTES_COLUMNS, DONANTES_INSERT, FACT_INSERT, PROVEEDOR_DIMENSIONS,
+                     PROVEEDORES_COLUMNS, PROVEEDORES_INSERT)
+
+# Las etapas del pipeline comparten el formato de almacenamiento intermedio (src/pipeline/storage.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent / "pipeline"))
+from storage import find_table, iter_table, read_table
+
+# Cantidad de filas por lote (INSERT multi-fila)
+BATCH_SIZE = 1000
+# Particiones en las que se divide cada tabla de hechos para cargarla en paralelo
+PARTITIONS = 2
+
+class CommitPolicy:
+    """
+    Politica de commit de la ingestion. Define cada cuanto se hace `conn.commit()`
+
+    modos
+    -----
+      * fila: commit despues de cada sentencia (comportamiento original)
+      * lote: commit cada `batch_size` filas
+      * tabla: commit al terminar cada tabla
+      * total: un solo commit al terminar toda la ingestion
     """
-    Conexion a la base de datos
+    MODOS = ("fila", "lote", "tabla", "total")
+
+    def __init__(self, modo: str = "lote", batch_size: int = BATCH_SIZE):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de commit invalido: {modo}. Opciones: {self.MODOS}")
+        self.modo = modo
+        # En modo fila cada sentencia lleva una sola fila
+        self.batch_size = 1 if modo == "fila" else max(1, batch_size)
+        self.pendientes = 0
+
+    def commit(self, conn) -> None:
+        """Hace commit de las filas pendientes"""
+        conn.commit()
+        self.pendientes = 0
 
-    params
-    ------
-      * db_config: dict
-        - credenciales de la base de datos
+    def after_write(self, conn, n: int = 1) -> None:
+        """Registra `n` filas escritas y hace commit si la politica lo pide"""
+        self.pendientes += n
+        if self.modo == "fila" or (self.modo == "lote" and self.pendientes >= self.batch_size):
+            self.commit(conn)
 
-    returns:
-        - conexion a la db
-    """
-    conn = None
-    try:
-        conn = connect(**db_config)   # < --
-        if conn.is_connected():
-            print("Conectadisimo")
-    except Error as e:
-        print(f"Error: {e}")
-    return conn
+    def end_table(self, conn) -> None:
+        """Cierra la carga de una tabla"""
+        if self.modo != "total" and self.pendientes:
+            self.commit(conn)
+
+    def end_run(self, conn) -> None:
+        """Cierra la ingestion completa"""
+        if self.pendientes:
+            self.commit(conn)
+
+    def for_worker(self):
+        """Copia de la politica para otra conexion (las filas pendientes son por conexion)"""
+        return CommitPolicy(self.modo, self.batch_size)
 
-def crear_cursor(conn):
+def to_native(data: tuple) -> tuple:
     """
-    Crear el cursor en la base de datos
+    Convierte los enteros de numpy a enteros de Python y NaN a None
 
     params
     ------
-      * conn:
-        - conexion de la base de datos
+      * data: tuple
+        - valores de una fila
 
-    returns: 
-        - cursor de la base de datos
+    returns:
+        - tupla con tipos nativos
     """
-    try:
-        cursor = conn.cursor(buffered=True)
-    except Error as e:
-        print(f"Error: {e}")
-    return cursor
+    processed_data = []
+    for x in data:
+        if pd.isna(x):  # Handle NaN values properly
+            processed_data.append(None)
+        elif isinstance(x, (np.integer)):
+            processed_data.append(int(x))
+        else:
+            processed_data.append(x)
+    return tuple(processed_data)
 
-def insert_or_ignore(conn, cursor, query: str, data: tuple) -> None:
+def insert_or_ignore(conn, cursor, query: str, data: tuple, policy: CommitPolicy = None) -> bool:
     """
     Funcion para insertar los datos, evitar duplicados
     y corregir tipo de dato para el numero de cuentas
@@ -61,34 +107,157 @@ def insert_or_ignore(conn, cursor, query: str, data: tuple) -> None:
         - Sentencia INSERT de SQL para la db
       * data: tuple
         - valor que se va a insertar, tupla (valor, ) de ser de un solo campo 
+      * policy: CommitPolicy
+        - politica de commit, sin politica se hace commit por fila
 
     returns:
-        - None
+        - True si se inserto la fila
     """
     # Importante que el `dato` sea una tupla en forma de `(value,)`
     # si es que los datos vienen de una sola columna
     try:
-        # Convert numpy integers to Python integers and handle NaN values
-        processed_data = []
-        for x in data:
-            if pd.isna(x):  # Handle NaN values properly
-                processed_data.append(None)
-            elif isinstance(x, (np.integer)):
-                processed_data.append(int(x))
-            else:
-                processed_data.append(x)
-        
-        cursor.execute(query, tuple(processed_data))
-        conn.commit()
+        cursor.execute(query, to_native(data))
+        if policy is None:
+            conn.commit()
+        else:
+            policy.after_write(conn)
         return True
     except IntegrityError as e:
         # Silently ignore common integrity errors like NOT NULL violations
         # These are expected during ETL process
         return False
     except Exception as e:
+        if is_transient(e):
+            # Una conexion caida no es una fila invalida: no se cuenta como omitida
+            raise
         print(f"Error inesperado: {e}")
         return False
 
+def insert_batch(conn, cursor, query: str, rows: list, policy: CommitPolicy = None) -> tuple:
+    """
+    Inserta un lote de filas con un solo `executemany` (INSERT multi-fila).
+    Si el lote falla por un error de integridad se reintenta fila por fila
+    para omitir solamente las filas invalidas de ese lote
+
+    params
+    ------
+      * conn: - conexion con la base de datos
+      * cursor: - cursor de la base de datos
+      * query: str
+        - Sentencia INSERT de SQL con placeholders (%s)
+      * rows: list
+        - lista de tuplas con los valores a insertar
+      * policy: CommitPolicy
+        - politica de commit, sin politica se hace un commit por lote
+
+    returns:
+        - tupla con (filas insertadas, filas omitidas)
+    """
+    if not rows:
+        return 0, 0
+    # Si se corta la conexion solo se reintenta cuando no hay filas previas sin commit,
+    # porque la reconexion descarta la transaccion abierta
+    can_retry = policy is None or policy.pendientes == 0
+    try:
+        retry_call(lambda: cursor.executemany(query, rows), conn=conn, can_retry=can_retry)
+        if policy is None:
+            conn.commit()
+        else:
+            policy.after_write(conn, len(rows))
+        return len(rows), 0
+    except IntegrityError:
+        # El INSERT multi-fila es atomico: si una fila falla no se inserta ninguna
+        # (MySQL solo deshace la sentencia, no la transaccion), asi que volvemos
+        # a fila por fila solo para este lote
+        inserted = sum(1 for row in rows if insert_or_ignore(conn, cursor, query, row, policy))
+        return inserted, len(rows) - inserted
+    except Error as e:
+        if is_transient(e):
+            # La conexion no se recupero con los reintentos: no tiene sentido seguir
+            raise
+        print(f"Error inesperado: {e}")
+        return 0, len(rows)
+    except Exception as e:
+        print(f"Error inesperado: {e}")
+        return 0, len(rows)
+
+def insert_rows(conn, cursor, query: str, rows: list, policy: CommitPolicy) -> tuple:
+    """
+    Inserta todas las filas en lotes del tamaño que indique la politica de commit
+
+    params
+    ------
+      * conn: - conexion con la base de datos
+      * cursor: - cursor de la base de datos
+      * query: str
+        - Sentencia INSERT de SQL con placeholders (%s)
+      * rows: list
+        - lista de tuplas con los valores a insertar
+      * policy: CommitPolicy
+        - politica de commit
+
+    returns:
+        - tupla con (filas insertadas, filas omitidas)
+    """
+    count = 0
+    skipped = 0
+    for start in range(0, len(rows), policy.batch_size):
+        inserted, omitted = insert_batch(conn, cursor, query, rows[start:start + policy.batch_size], policy)
+        count += inserted
+        skipped += omitted
+    return count, skipped
+
+def insert_partition(pool: ConnectionPool, query: str, rows: list, policy: CommitPolicy) -> tuple:
+    """
+    Inserta una particion de filas con su propia conexion del pool y hace commit al terminar
+
+    params
+    ------
+      * pool: ConnectionPool
+        - pool del que se saca la conexion
+      * query: str
+        - Sentencia INSERT de SQL con placeholders (%s)
+      * rows: list
+        - filas de la particion
+      * policy: CommitPolicy
+        - politica de commit de la carga (se copia para la conexion del worker)
+
+    returns:
+        - tupla con (filas insertadas, filas omitidas)
+    """
+    worker_policy = policy.for_worker()
+    with pool.connection() as (conn, cursor):
+        result = insert_rows(conn, cursor, query, rows, worker_policy)
+        worker_policy.end_run(conn)
+    return result
+
+def insert_partitioned(pool: ConnectionPool, query: str, rows: list, policy: CommitPolicy, partitions: int) -> tuple:
+    """
+    Divide las filas en particiones contiguas y las inserta en paralelo,
+    cada una con su conexion del pool
+
+    params
+    ------
+      * pool: ConnectionPool
+        - pool de conexiones
+      * query: str
+        - Sentencia INSERT de SQL con placeholders (%s)
+      * rows: list
+        - lista de tuplas con los valores a insertar
+      * policy: CommitPolicy
+        - politica de commit
+      * partitions: int
+        - cantidad de particiones
+
+    returns:
+        - tupla con (filas insertadas, filas omitidas)
+    """
+    size = -(-len(rows) // partitions)
+    chunks = [rows[start:start + size] for start in range(0, len(rows), size)]
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        results = list(executor.map(lambda chunk: insert_partition(pool, query, chunk, policy), chunks))
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
 def get_all_tables(cursor) -> list:
     """
     Agarra los nombres de todas las tablas
@@ -106,9 +275,10 @@ def get_all_tables(cursor) -> list:
     tables = cursor.fetchall()
     return [table[0] for table in tables]
 
-def ingest_table(conn, cursor, df: pd.DataFrame, table: str, col_name: str) -> None:
+def ingest_table(conn, cursor, df: pd.DataFrame, table: str, col_name: str, policy: CommitPolicy = None, cache: DimensionCache = None) -> None:
     """
-    Inserta los datos a la base de datos
+    Inserta los datos a la base de datos. Solo se insertan los valores
+    que el cache de dimensiones todavia no conoce
 
     params
     ------
@@ -122,25 +292,21 @@ def ingest_table(conn, cursor, df: pd.DataFrame, table: str, col_name: str) -> N
         - tabla que seleccionar
       * col_name: str
         - columna a seleccionar
+      * policy: CommitPolicy
+        - politica de commit
+      * cache: DimensionCache
+        - cache de surrogate keys de las dimensiones
     
     returns:
         - None
     """
-    count = 0
-    # Get unique values and filter out NaN/None values
-    unique_values = df[col_name].dropna().unique()
-    
-    for value in unique_values:
-        # Skip empty strings or None values
-        if value is None or (isinstance(value, str) and value.strip() == ''):
-            continue
-            
-        query = f"""
-        INSERT INTO `{table}` (`{col_name}`) VALUES (%s)
-        ON DUPLICATE KEY UPDATE `{col_name}`=VALUES(`{col_name}`);
-        """
-        insert_or_ignore(conn, cursor, query, (value,)) ## placeholder (%s)
-        count += 1
+    policy = policy or CommitPolicy()
+    cache = cache if cache is not None else DimensionCache()
+    # Get unique values and filter out NaN/None/empty values
+    values = dimension_values(df[col_name])
+
+    count = cache.ensure(conn, cursor, table, values, policy)
+    policy.end_table(conn)
     print(f"Cantidad de filas insertadas en {table}: {count}")
 
 # funciona para mapear las foreign keys con la columna pertinente
@@ -173,7 +339,7 @@ def fetch_fk(cursor, id: str, col: str, table: str) -> dict:
     return mapping
 
 
-def ingest_proveedores(conn, cursor, df_proveedores: pd.DataFrame, mappings_fk_proveedor: dict) -> None:
+def ingest_proveedores(conn, cursor, df_proveedores: pd.DataFrame, mappings_fk_proveedor: dict, policy: CommitPolicy = None) -> None:
     """
     Ingresa los datos a la tabla proveedores y las foreign keys de las tabla relacionadas
 
@@ -187,54 +353,118 @@ def ingest_proveedores(conn, cursor, df_proveedores: pd.DataFrame, mappings_fk_p
         - dataframe con los datos de los proveedores 
       * mappings_fk_proveedor: dict
         - diccionario con las foreign keys
+      * policy: CommitPolicy
+        - politica de commit
 
     returns:
         - None
     """
-    count = 0
-    skipped = 0
+    policy = policy or CommitPolicy()
     # Step 6: Insert unique data into proveedores
+    query = PROVEEDORES_INSERT
+
+    # Resolver las foreign keys por columna, las filas sin alguna fk no se insertan
     categoria_mapping, contribuyente_mapping, razon_mapping, ciudades_mapping = mappings_fk_proveedor
-    for _, row in df_proveedores.iterrows():
-        # Agarramos la foreign key que mapee con el valor de la fila en cuestion
-        id_categoria = categoria_mapping.get(row['categoria'])
-        id_contribuyente = contribuyente_mapping.get(row['contribuyente'])
-        id_razon = razon_mapping.get(row['razon'])
-        id_ciudad = ciudades_mapping.get(row['ciudad'])
-    
-        query = """
-        INSERT INTO proveedores (numero, nombre, cuit, contacto, mail, telefono, id_categoria, id_contribuyente, id_razon, id_ciudad)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE 
-            nombre = VALUES(nombre), 
-            cuit = VALUES(cuit), 
-            contacto = VALUES(contacto), 
-            mail = VALUES(mail), 
-            telefono = VALUES(telefono), 
-            id_categoria = VALUES(id_categoria), 
-            id_contribuyente = VALUES(id_contribuyente), 
-            id_razon = VALUES(id_razon), 
-            id_ciudad = VALUES(id_ciudad);
-        """
-        data = (
-            row['numero'], row['nombre'], row['cuit'], row['contacto'], 
-            row['mail'], row['telefono'], id_categoria, 
-            id_contribuyente, id_razon, id_ciudad
-        )
+    df_fk, missing_keys = resolve_foreign_keys(df_proveedores, {
+        "id_categoria": ("categoria", categoria_mapping),
+        "id_contribuyente": ("contribuyente", contribuyente_mapping),
+        "id_razon": ("razon", razon_mapping),
+        "id_ciudad": ("ciudad", ciudades_mapping),
+    })
+    rows = build_params(df_fk, PROVEEDORES_COLUMNS)
     
-        # Insert into proveedores table
-        success = insert_or_ignore(conn, cursor, query, data)
-        if success:
-            count += 1
-        else:
-            skipped += 1
+    # Insert into proveedores table
+    count, skipped = insert_rows(conn, cursor, query, rows, policy)
+    policy.end_table(conn)
     
     print(f"Cantidad de filas insertadas: {count}")
     if skipped > 0:
         print(f"Filas omitidas por errores de integridad: {skipped}")
 
+    # Mostrar estadisticas de claves foraneas faltantes
+    missing_summary = format_missing(missing_keys)
+    if missing_summary:
+        print(f"Filas omitidas por claves foraneas faltantes: {len(df_proveedores) - len(df_fk)}")
+        print(f"Claves foraneas faltantes: {missing_summary}")
+
+
+def ingest_fact_table(conn, cursor, df: pd.DataFrame, table: str, id_col: str, mappings_fk, policy: CommitPolicy = None,
+                      pool: ConnectionPool = None, partitions: int = 1, ocurrencias: dict = None) -> None:
+    """
+    Ingresa las transacciones a una tabla de hechos (gastos o ingresos) en lotes.
+    Las foreign keys se resuelven por columna y cada lote se envia con `executemany`.
+    Con un pool y mas de una particion la tabla se carga en paralelo.
+    Cada transaccion lleva el hash de su contenido y solo se insertan las que
+    todavia no estan en la tabla
+
+    params
+    ------
+      * conn:
+        - conexion a la db
+      * cursor:
+        - cursor de la db
+      * df: pd.DataFrame
+        - dataframe de donde se sacan las transacciones
+      * table: str
+        - tabla de hechos (gastos, ingresos)
+      * id_col: str
+        - columna de la foreign key a la entidad (id_proveedor, id_donante)
+      * mappings_fk: tuple
+        - tupla con las foreign keys (entidad, cuentas)
+      * policy: CommitPolicy
+        - politica de commit, define tambien el tamaño de cada lote
+      * pool: ConnectionPool
+        - pool de conexiones para las particiones
+      * partitions: int
+        - cantidad de particiones que se cargan en paralelo
+      * ocurrencias: dict
+        - conteo de ocurrencias de los chunks anteriores (modo streaming)
+
+    returns:
+        - None
+    """
+    policy = policy or CommitPolicy()
+    entidad_mapping, cuenta_mapping = mappings_fk
+
+    # Resolver las foreign keys para todo el dataframe de una vez,
+    # solo se insertan las filas con ambas foreign keys
+    df = df[["numero", "nro_cuenta", "importe", "fecha"]].reset_index(drop=True)
+    # El hash se calcula sobre el archivo completo para que la ocurrencia de las filas repetidas sea estable
+    df["hash"] = transaction_hashes(df, ocurrencias)
+    df_fk, _ = resolve_foreign_keys(df, {
+        id_col: ("numero", entidad_mapping),
+        "id_cuenta": ("nro_cuenta", cuenta_mapping),
+    })
+    # Las transacciones ya cargadas (por hash, consultado por lotes) se omiten siempre:
+    # una recarga no choca con el indice UNIQUE de hash ni cae al insert fila por fila
+    df_nuevas = df_fk[~df_fk["hash"].isin(fetch_existing_hashes(cursor, table, df_fk["hash"]))]
+    if len(df_nuevas) < len(df_fk):
+        print(f"Filas ya cargadas: {len(df_fk) - len(df_nuevas)}")
+    rows = build_params(df_nuevas, ["importe", "fecha", id_col, "id_cuenta", "hash"])
+
+    query = FACT_INSERT.format(table=table, id_col=id_col)
+    # En modo total todo tiene que quedar en una sola transaccion, no se particiona
+    if pool is not None and partitions > 1 and policy.modo != "total" and len(rows) > policy.batch_size:
+        # Las filas previas de esta conexion se commitean antes de repartir la tabla
+        policy.end_table(conn)
+        count, skipped = insert_partitioned(pool, query, rows, policy, partitions)
+    else:
+        count, skipped = insert_rows(conn, cursor, query, rows, policy)
+        policy.end_table(conn)
+    skipped += len(df) - len(df_fk)
+
+    print(f"Cantidad de filas insertadas: {count}")
+    print(f"Filas omitidas: {skipped}")
+
+    # Solo imprimir un resumen de las claves foraneas ausentes, no cada una
+    sin_fk = df.drop(df_fk.index)
+    missing_fk = (sin_fk["numero"].astype(str) + " o " + sin_fk["nro_cuenta"].astype(str)).nunique()
+    if missing_fk:
+        print(f"Se omitieron registros con {missing_fk} combinaciones distintas de claves foraneas ausentes")
 
-def ingest_gastos(conn, cursor, df: pd.DataFrame, mappings_fk_gastos) -> None:
+
+def ingest_gastos(conn, cursor, df: pd.DataFrame, mappings_fk_gastos, policy: CommitPolicy = None,
+                 pool: ConnectionPool = None, partitions: int = 1) -> None:
     """
     Ingresa los datos a la tabla gastos y las foreign keys de la tabla relacionadas (proveedores, cuentas)
 
@@ -248,47 +478,21 @@ def ingest_gastos(conn, cursor, df: pd.DataFrame, mappings_fk_gastos) -> None:
         - dataframe de donde se sacan los gastos 
       * mappings_fk_gastos: tuple
         - tupla con las foreign keys
+      * policy: CommitPolicy
+        - politica de commit
+      * pool: ConnectionPool
+        - pool de conexiones para cargar en paralelo
+      * partitions: int
+        - cantidad de particiones
 
     returns:
         - None
     """
-    count = 0
-    skipped = 0
-    missing_fk = set()  # Para conteo de registros ignorados por falta de FK
-    
     # Step 8: Insert unique data into gastos --> todo el df ya que son todas las transacciones
-    proveedor_mapping, cuenta_mapping = mappings_fk_gastos
-    for _, row in df.iterrows():  # This should iterate through the full dataset
-        # Retrieve foreign key ids from pre-fetched mappings
-        id_proveedor = proveedor_mapping.get(row['numero'])
-        id_cuenta = cuenta_mapping.get(row['nro_cuenta'])
-    
-        # Only insert if foreign keys are found
-        if id_proveedor is not None and id_cuenta is not None:
-            query = """
-            INSERT INTO gastos (importe, fecha, id_proveedor, id_cuenta)
-            VALUES (%s, %s, %s, %s);
-            """
-            data = (row['importe'], row['fecha'], id_proveedor, id_cuenta)
-            success = insert_or_ignore(conn, cursor, query, data)
-            if success:
-                count += 1
-            else:
-                skipped += 1
-        else:
-            # En lugar de imprimir cada fila, solo agregamos a un contador
-            missing_fk.add(f"{row['numero']} o {row['nro_cuenta']}")
-            skipped += 1
-    
-    print(f"Cantidad de filas insertadas: {count}")
-    print(f"Filas omitidas: {skipped}")
-    
-    # Solo imprimir un resumen de las claves foraneas ausentes, no cada una
-    if missing_fk:
-        print(f"Se omitieron registros con {len(missing_fk)} combinaciones distintas de claves foraneas ausentes")
+    ingest_fact_table(conn, cursor, df, "gastos", "id_proveedor", mappings_fk_gastos, policy, pool, partitions)
 
 
-def ingest_donantes(conn, cursor, df_donantes: pd.DataFrame, mappings_fk_donantes) -> None:
+def ingest_donantes(conn, cursor, df_donantes: pd.DataFrame, mappings_fk_donantes, policy: CommitPolicy = None) -> None:
     """
     Ingresa los datos a la tabla donantes y las foreign keys de las tabla relacionadas
 
@@ -302,73 +506,47 @@ def ingest_donantes(conn, cursor, df_donantes: pd.DataFrame, mappings_fk_donante
         - dataframe con los datos de los donantes 
       * mappings_fk_donantes: tuple
         - tupla con las foreign keys
+      * policy: CommitPolicy
+        - politica de commit
 
     returns:
         - None
     """
+    policy = policy or CommitPolicy()
     # to test
     df_donantes = df_donantes.reset_index(drop=True)
-    count = 0
-    skipped = 0
-    missing_keys = {"id_frecuencia": 0, "id_contribuyente": 0, "id_razon": 0, "id_tipo": 0, "id_pais": 0}
     
-    # Step 6: Insert unique data into proveedores
+    # Step 6: Insert unique data into donantes
+    query = DONANTES_INSERT
+
+    # Resolver las foreign keys por columna, las filas sin alguna fk no se insertan
     frecuencia_mapping, contribuyente_mapping, razon_mapping, tipo_mapping, pais_mapping = mappings_fk_donantes 
-    for _, row in df_donantes.iterrows():
-        # Agarramos la foreign key que mapee con el valor de la fila en cuestion
-        id_frecuencia = frecuencia_mapping.get(row['frecuencia'])
-        id_contribuyente = contribuyente_mapping.get(row['contribuyente'])
-        id_razon = razon_mapping.get(row['razon'])
-        id_tipo = tipo_mapping.get(row['tipo'])
-        id_pais = pais_mapping.get(row['pais'])
-        
-        # Contar valores faltantes para estadisticas
-        if id_frecuencia is None: missing_keys["id_frecuencia"] += 1
-        if id_contribuyente is None: missing_keys["id_contribuyente"] += 1
-        if id_razon is None: missing_keys["id_razon"] += 1
-        if id_tipo is None: missing_keys["id_tipo"] += 1
-        if id_pais is None: missing_keys["id_pais"] += 1
-    
-        query = """
-        INSERT INTO donantes (numero, nombre, cuit, contacto, mail, telefono, activo, id_frecuencia, id_contribuyente, id_razon, id_tipo, id_pais)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE 
-            nombre = VALUES(nombre), 
-            cuit = VALUES(cuit), 
-            contacto = VALUES(contacto), 
-            mail = VALUES(mail), 
-            activo = VALUES(activo), 
-            telefono = VALUES(telefono), 
-            id_frecuencia = VALUES(id_frecuencia), 
-            id_contribuyente = VALUES(id_contribuyente), 
-            id_razon = VALUES(id_razon), 
-            id_tipo = VALUES(id_tipo), 
-            id_pais = VALUES(id_pais);
-        """
-        data = (
-            row['numero'], row['nombre'], row['cuit'], row['contacto'], 
-            row['mail'], row['telefono'], row['activo'], id_frecuencia, 
-            id_contribuyente, id_razon, id_tipo, id_pais
-        )
+    df_fk, missing_keys = resolve_foreign_keys(df_donantes, {
+        "id_frecuencia": ("frecuencia", frecuencia_mapping),
+        "id_contribuyente": ("contribuyente", contribuyente_mapping),
+        "id_razon": ("razon", razon_mapping),
+        "id_tipo": ("tipo", tipo_mapping),
+        "id_pais": ("pais", pais_mapping),
+    })
+    rows = build_params(df_fk, DONANTES_COLUMNS)
     
-        # Insert into proveedores table
-        success = insert_or_ignore(conn, cursor, query, data)
-        if success:
-            count += 1
-        else:
-            skipped += 1
+    # Insert into donantes table
+    count, skipped = insert_rows(conn, cursor, query, rows, policy)
+    policy.end_table(conn)
     
     print(f"Cantidad de filas insertadas: {count}")
     if skipped > 0:
         print(f"Filas omitidas por errores de integridad: {skipped}")
         
     # Mostrar estadisticas de claves foraneas faltantes
-    missing_summary = ", ".join([f"{key}: {value}" for key, value in missing_keys.items() if value > 0])
+    missing_summary = format_missing(missing_keys)
     if missing_summary:
+        print(f"Filas omitidas por claves foraneas faltantes: {len(df_donantes) - len(df_fk)}")
         print(f"Claves foraneas faltantes: {missing_summary}")
 
 
-def ingest_ingresos(conn, cursor, df: pd.DataFrame, mappings_fk_ingresos) -> None:
+def ingest_ingresos(conn, cursor, df: pd.DataFrame, mappings_fk_ingresos, policy: CommitPolicy = None,
+                 pool: ConnectionPool = None, partitions: int = 1) -> None:
     """
     Ingresa los datos a la tabla ingresos y las foreign keys de la tabla relacionadas (donantes, cuentas)
 
@@ -382,108 +560,221 @@ def ingest_ingresos(conn, cursor, df: pd.DataFrame, mappings_fk_ingresos) -> Non
         - dataframe de donde se sacan los ingresos 
       * mappings_fk_ingresos: tuple
         - tupla con las foreign keys
+      * policy: CommitPolicy
+        - politica de commit
+      * pool: ConnectionPool
+        - pool de conexiones para cargar en paralelo
+      * partitions: int
+        - cantidad de particiones
 
     returns:
         - None
     """
-    count = 0
-    skipped = 0
-    missing_fk = set()  # Para conteo de registros ignorados por falta de FK
-    
     # Step 8: Insert unique data into ingresos --> todo el df ya que son todas las transacciones
-    proveedor_mapping, cuenta_mapping = mappings_fk_ingresos
-    for _, row in df.iterrows():  # This should iterate through the full dataset
-        # Retrieve foreign key ids from pre-fetched mappings
-        id_donante = proveedor_mapping.get(row['numero'])
-        id_cuenta = cuenta_mapping.get(row['nro_cuenta'])
-    
-        # Only insert if foreign keys are found
-        if id_donante is not None and id_cuenta is not None:
-            query = """
-            INSERT INTO ingresos (importe, fecha, id_donante, id_cuenta)
-            VALUES (%s, %s, %s, %s);
-            """
-            data = (row['importe'], row['fecha'], id_donante, id_cuenta)
-            success = insert_or_ignore(conn, cursor, query, data)
-            if success:
-                count += 1
-            else:
-                skipped += 1
-        else:
-            # En lugar de imprimir cada fila, solo agregamos a un contador
-            missing_fk.add(f"{row['numero']} o {row['nro_cuenta']}")
-            skipped += 1
-    
-    print(f"Cantidad de filas insertadas: {count}")
-    print(f"Filas omitidas: {skipped}")
-    
-    # Solo imprimir un resumen de las claves foraneas ausentes, no cada una
-    if missing_fk:
-        print(f"Se omitieron registros con {len(missing_fk)} combinaciones distintas de claves foraneas ausentes")
+    ingest_fact_table(conn, cursor, df, "ingresos", "id_donante", mappings_fk_ingresos, policy, pool, partitions)
 
 def load_datasets(path_proveedores: Path, path_donantes: Path) -> tuple:
     """
-    Carga los datasets de proveedores y donantes desde archivos CSV
+    Carga los datasets de proveedores y donantes (parquet, feather o csv segun la extension)
 
     params
     ------
       * path_proveedores: Path
-        - ruta al archivo CSV de proveedores
+        - ruta al archivo de proveedores
       * path_donantes: Path
-        - ruta al archivo CSV de donantes
+        - ruta al archivo de donantes
 
     returns:
         - tuple con (dataframe de proveedores, dataframe de donantes)
     """
-    df_proveedores = pd.read_csv(path_proveedores)
-    df_donantes = pd.read_csv(path_donantes)
+    df_proveedores = read_table(path_proveedores)
+    df_donantes = read_table(path_donantes)
     np.random.seed(42)
     
     return df_proveedores, df_donantes
 
 
-def setup_database_connection() -> tuple:
+def read_chunks(path: Path, chunk_size: int):
     """
-    Configura la conexion a la base de datos y el cursor
+    Lee un archivo por partes para que la memoria no crezca con el tamaño del archivo
 
     params
     ------
+      * path: Path
+        - ruta al archivo (parquet, feather o csv)
+      * chunk_size: int
+        - filas por chunk
 
     returns:
-        - tuple con (conexion, cursor)
-    """
-    # Check if we should use .env.example for local Docker environment
-    if os.environ.get("USE_ENV_EXAMPLE") == "1":
-        # Load environment variables from .env.example
-        local_env_file = Path(__file__).resolve().parent / ".env.example"
-        if not local_env_file.exists():
-            print(f"Error: .env.example file not found at {local_env_file}")
-            sys.exit(1)
-        print(f"Loading environment from {local_env_file}")
-        load_dotenv(dotenv_path=local_env_file)
-    else:
-        # Load environment variables from .env (production)
-        load_dotenv()
-    
-    # Get database configuration from environment variables
-    db_config = {
-        "host": os.getenv("DATABASE_HOST"),
-        "user": os.getenv("DATABASE_USER"),
-        "password": os.getenv("DATABASE_PASSWORD"),
-        "database": os.getenv("DATABASE_NAME")
-    }
-    
-    # Print connection info (excluding password)
-    connection_info = {k: v for k, v in db_config.items() if k != "password"}
-    print(f"Connecting to database with: {connection_info}")
-    
-    conn = create_connection(db_config)
-    cursor = crear_cursor(conn)
-    
-    return conn, cursor
+        - iterador de dataframes
+    """
+    return iter_table(path, chunk_size)
+
+
+def first_occurrences(chunk: pd.DataFrame, seen: set) -> pd.DataFrame:
+    """
+    Primera aparicion de cada entidad (como `drop_duplicates(subset='numero')`)
+    teniendo en cuenta los chunks anteriores
+
+    params
+    ------
+      * chunk: pd.DataFrame
+        - chunk de transacciones
+      * seen: set
+        - numeros ya vistos en los chunks anteriores (se actualiza)
+
+    returns:
+        - dataframe con las entidades que aparecen por primera vez
+    """
+    df_nuevos = chunk.drop_duplicates(subset="numero")
+    df_nuevos = df_nuevos[~df_nuevos["numero"].isin(seen)]
+    seen.update(df_nuevos["numero"])
+    return df_nuevos
+
+
+def fetch_entity_ids(cursor, table: str, numeros: list) -> dict:
+    """
+    Foreign keys {numero: id} solo de las entidades indicadas, consultando por lotes
+
+    params
+    ------
+      * cursor:
+        - cursor de la db
+      * table: str
+        - tabla de la entidad (proveedores, donantes)
+      * numeros: list
+        - numeros de las entidades
+
+    returns:
+        - diccionario en forma {numero: id}
+    """
+    mapping = {}
+    for start in range(0, len(numeros), BATCH_SIZE):
+        lote = numeros[start:start + BATCH_SIZE]
+        placeholders = ", ".join(["%s"] * len(lote))
+        cursor.execute(f"SELECT `id`, `numero` FROM `{table}` WHERE `numero` IN ({placeholders})", tuple(lote))
+        mapping.update({numero: id for id, numero in cursor.fetchall()})
+    return mapping
+
+
+def stream_proveedor_data(conn, cursor, path: Path, chunk_size: int, policy: CommitPolicy, cache: DimensionCache) -> int:
+    """
+    Carga proveedores y gastos chunk por chunk: cada chunk inserta sus dimensiones,
+    los proveedores que aparecen por primera vez y sus gastos antes de leer el siguiente
+
+    params
+    ------
+      * conn:
+        - conexion a la base de datos
+      * cursor:
+        - cursor de la base de datos
+      * path: Path
+        - ruta al archivo de proveedores
+      * chunk_size: int
+        - filas por chunk
+      * policy: CommitPolicy
+        - politica de commit
+      * cache: DimensionCache
+        - cache de surrogate keys de las dimensiones
+
+    returns:
+        - cantidad de filas leidas
+    """
+    seen = set()
+    proveedor_mapping = {}
+    ocurrencias = {}
+    filas = 0
+    for n, chunk in enumerate(read_chunks(path, chunk_size), start=1):
+        print(f"\n{path.name} - chunk {n}: {len(chunk)} filas")
+        handle_proveedor_dimension_tables(conn, cursor, chunk, policy, cache)
+        mappings_fk_proveedor = (
+            cache.mapping("categoria_proveedores"),
+            cache.mapping("tipo_contribuyentes"),
+            cache.mapping("razones_sociales"),
+            cache.mapping("ciudades"),
+        )
+
+        df_proveedores = first_occurrences(chunk, seen)
+        ingest_proveedores(conn, cursor, df_proveedores, mappings_fk_proveedor, policy)
+        proveedor_mapping.update(fetch_entity_ids(cursor, "proveedores", df_proveedores["numero"].tolist()))
+
+        ingest_fact_table(conn, cursor, chunk, "gastos", "id_proveedor", (proveedor_mapping, cache.mapping("cuentas")),
+                          policy, ocurrencias=ocurrencias)
+        filas += len(chunk)
+    return filas
+
+
+def stream_donante_data(conn, cursor, path: Path, chunk_size: int, policy: CommitPolicy, cache: DimensionCache) -> int:
+    """
+    Carga donantes e ingresos chunk por chunk: cada chunk inserta sus dimensiones,
+    los donantes que aparecen por primera vez y sus ingresos antes de leer el siguiente
+
+    params
+    ------
+      * conn:
+        - conexion a la base de datos
+      * cursor:
+        - cursor de la base de datos
+      * path: Path
+        - ruta al archivo de donantes
+      * chunk_size: int
+        - filas por chunk
+      * policy: CommitPolicy
+        - politica de commit
+      * cache: DimensionCache
+        - cache de surrogate keys de las dimensiones
+
+    returns:
+        - cantidad de filas leidas
+    """
+    seen = set()
+    donante_mapping = {}
+    ocurrencias = {}
+    filas = 0
+    for n, chunk in enumerate(read_chunks(path, chunk_size), start=1):
+        print(f"\n{path.name} - chunk {n}: {len(chunk)} filas")
+        # Manejar valores nulos en razon sobre el mismo chunk, sin copiarlo
+        chunk["razon"] = fill_missing(chunk["razon"], 'Sin Razón Social')
+        handle_donante_dimension_tables(conn, cursor, chunk, policy, cache)
+        mappings_fk_donantes = (
+            cache.mapping("frecuencias"),
+            cache.mapping("tipo_contribuyentes"),
+            cache.mapping("razones_sociales"),
+            cache.mapping("tipo_donantes"),
+            cache.mapping("paises"),
+        )
+
+        df_donantes = first_occurrences(chunk, seen)
+        ingest_donantes(conn, cursor, df_donantes, mappings_fk_donantes, policy)
+        donante_mapping.update(fetch_entity_ids(cursor, "donantes", df_donantes["numero"].tolist()))
+
+        ingest_fact_table(conn, cursor, chunk, "ingresos", "id_donante", (donante_mapping, cache.mapping("cuentas")),
+                          policy, ocurrencias=ocurrencias)
+        filas += len(chunk)
+    return filas
 
 
-def handle_proveedor_dimension_tables(conn, cursor, df) -> dict:
+def setup_connection_pool(allow_local_infile: bool = False, pool_size: int = POOL_SIZE, retries: int = RETRIES) -> ConnectionPool:
+    """
+    Crea el pool de conexiones compartido por los workers de carga
+
+    params
+    ------
+      * allow_local_infile: bool
+        - habilita `LOAD DATA LOCAL INFILE` para la carga masiva
+      * pool_size: int
+        - cantidad de conexiones del pool
+      * retries: int
+        - reintentos ante errores transitorios
+
+    returns:
+        - pool de conexiones
+    """
+    db_config = load_db_config(allow_local_infile)
+    return ConnectionPool(db_config, size=pool_size, retries=retries)
+
+
+def handle_proveedor_dimension_tables(conn, cursor, df, policy: CommitPolicy = None, cache: DimensionCache = None) -> dict:
     """
     Inserta datos en las tablas de dimension para proveedores y devuelve los mapeos de columnas
 
@@ -495,6 +786,10 @@ def handle_proveedor_dimension_tables(conn, cursor, df) -> dict:
         - cursor de la base de datos
       * df: pd.DataFrame
         - dataframe de proveedores
+      * policy: CommitPolicy
+        - politica de commit
+      * cache: DimensionCache
+        - cache de surrogate keys de las dimensiones
 
     returns:
         - diccionario con mapeo de tablas a columnas
@@ -503,22 +798,18 @@ def handle_proveedor_dimension_tables(conn, cursor, df) -> dict:
     print("proveedor dataframe columns:", df.columns.tolist())
     
     # Define column mapping for proveedor dimension tables with correct CSV column names
-    table_to_col = {
-        "categoria_proveedores": "categoria",
-        "tipo_contribuyentes": "contribuyente",
-        "razones_sociales": "razon",
-        "ciudades": "ciudad",
-        "cuentas": "nro_cuenta"
-    }
+    table_to_col = dict(PROVEEDOR_DIMENSIONS)
     
     # Insert data into dimension tables
+    cache = cache if cache is not None else DimensionCache()
     for table, col in table_to_col.items():
-        ingest_table(conn, cursor, df, table, col)
+        ingest_table(conn, cursor, df, table, col, policy, cache)
     
     return table_to_col
 
 
-def process_proveedor_data(conn, cursor, df, table_to_col) -> None:
+def process_proveedor_data(conn, cursor, df, table_to_col, policy: CommitPolicy = None, bulk: bool = False, cache: DimensionCache = None,
+                           pool: ConnectionPool = None, partitions: int = 1) -> None:
     """
     Procesa los datos de proveedores: prepara las claves foraneas e inserta en las tablas de proveedores y gastos
 
@@ -532,6 +823,16 @@ def process_proveedor_data(conn, cursor, df, table_to_col) -> None:
         - dataframe de proveedores
       * table_to_col: dict
         - diccionario con mapeo de tablas a columnas
+      * policy: CommitPolicy
+        - politica de commit
+      * bulk: bool
+        - usar la carga masiva con LOAD DATA LOCAL INFILE
+      * cache: DimensionCache
+        - cache de surrogate keys de las dimensiones
+      * pool: ConnectionPool
+        - pool de conexiones para cargar gastos en paralelo
+      * partitions: int
+        - particiones de la tabla gastos
 
     returns:
         - None
@@ -540,31 +841,39 @@ def process_proveedor_data(conn, cursor, df, table_to_col) -> None:
     df_proveedores = df.drop_duplicates(subset='numero')
     
     # Prepare foreign keys for proveedor table
-    list_fk = ["id_categoria", "id_contribuyente", "id_razon", "id_ciudad"]
-    table_cols = tuple(table_to_col.items())
+    tables = tuple(table_to_col)
     
-    # Fetch all foreign key mappings
-    categoria_mapping = fetch_fk(cursor, list_fk[0], table_cols[0][1], table_cols[0][0])
-    contribuyente_mapping = fetch_fk(cursor, list_fk[1], table_cols[1][1], table_cols[1][0])
-    razon_mapping = fetch_fk(cursor, list_fk[2], table_cols[2][1], table_cols[2][0])
-    ciudades_mapping = fetch_fk(cursor, list_fk[3], table_cols[3][1], table_cols[3][0])
+    # Foreign key mappings from the dimension cache (se lee de la db solo si no estaba cargado)
+    cache = cache if cache is not None else DimensionCache()
+    cache.preload(cursor, tables)
+    categoria_mapping = cache.mapping(tables[0])
+    contribuyente_mapping = cache.mapping(tables[1])
+    razon_mapping = cache.mapping(tables[2])
+    ciudades_mapping = cache.mapping(tables[3])
     
     # Package foreign keys for proveedor insertion
     mappings_fk_proveedor = (categoria_mapping, contribuyente_mapping, razon_mapping, ciudades_mapping)
     
     # Insert proveedor data
-    ingest_proveedores(conn, cursor, df_proveedores, mappings_fk_proveedor)
+    if bulk:
+        bulk_load_proveedores(conn, cursor, df_proveedores, mappings_fk_proveedor)
+    else:
+        ingest_proveedores(conn, cursor, df_proveedores, mappings_fk_proveedor, policy)
     
     # Prepare foreign keys for expenses
+    cuenta_mapping = cache.mapping("cuentas")
+    if bulk:
+        # El id del proveedor se resuelve con un JOIN en el INSERT ... SELECT
+        bulk_load_gastos(conn, cursor, df, cuenta_mapping)
+        return
     proveedor_mapping = fetch_fk(cursor, "id", "numero", "proveedores")
-    cuenta_mapping = fetch_fk(cursor, "id_cuenta", "nro_cuenta", "cuentas")
     mappings_fk_gastos = (proveedor_mapping, cuenta_mapping)
     
     # Insert expense data
-    ingest_gastos(conn, cursor, df, mappings_fk_gastos)
+    ingest_gastos(conn, cursor, df, mappings_fk_gastos, policy, pool, partitions)
 
 
-def handle_donante_dimension_tables(conn, cursor, df) -> dict:
+def handle_donante_dimension_tables(conn, cursor, df, policy: CommitPolicy = None, cache: DimensionCache = None) -> dict:
     """
     Inserta datos en las tablas de dimension para donantes y devuelve los mapeos de columnas
 
@@ -576,6 +885,8 @@ def handle_donante_dimension_tables(conn, cursor, df) -> dict:
         - cursor de la base de datos
       * df: pd.DataFrame
         - dataframe de donantes
+      * policy: CommitPolicy
+        - politica de commit
 
     returns:
         - diccionario con mapeo de tablas a columnas
@@ -596,29 +907,24 @@ def handle_donante_dimension_tables(conn, cursor, df) -> dict:
     df_db.rename(columns=col_mapping, inplace=True)
     
     # Manejar valores nulos en razon - asignar valor predeterminado
-    df_db['razon'] = df_db['razon'].fillna('Sin Razón Social')
+    df_db['razon'] = fill_missing(df_db['razon'], 'Sin Razón Social')
     
     # Define column mapping for donante dimension tables using database-friendly names
-    table_to_col = {
-        "frecuencias": "frecuencia",
-        "tipo_contribuyentes": "contribuyente",
-        "razones_sociales": "razon",
-        "tipo_donantes": "tipo",
-        "paises": "pais",
-        "cuentas": "nro_cuenta"
-    }
+    table_to_col = dict(DONANTE_DIMENSIONS)
     
     # Insert data into dimension tables
+    cache = cache if cache is not None else DimensionCache()
     for table, col in table_to_col.items():
         if col in df_db.columns:
-            ingest_table(conn, cursor, df_db, table, col)
+            ingest_table(conn, cursor, df_db, table, col, policy, cache)
         else:
             print(f"Warning: Column '{col}' not found in donante dataframe. Skipping table '{table}'")
     
     return table_to_col
 
 
-def process_donante_data(conn, cursor, df) -> None:
+def process_donante_data(conn, cursor, df, policy: CommitPolicy = None, bulk: bool = False, cache: DimensionCache = None,
+                         pool: ConnectionPool = None, partitions: int = 1) -> None:
     """
     Procesa los datos de donantes: prepara las claves foraneas e inserta en las tablas de donantes e ingresos
 
@@ -630,6 +936,16 @@ def process_donante_data(conn, cursor, df) -> None:
         - cursor de la base de datos
       * df: pd.DataFrame
         - dataframe de donantes
+      * policy: CommitPolicy
+        - politica de commit
+      * bulk: bool
+        - usar la carga masiva con LOAD DATA LOCAL INFILE
+      * cache: DimensionCache
+        - cache de surrogate keys de las dimensiones
+      * pool: ConnectionPool
+        - pool de conexiones para cargar ingresos en paralelo
+      * partitions: int
+        - particiones de la tabla ingresos
 
     returns:
         - None
@@ -656,7 +972,7 @@ def process_donante_data(conn, cursor, df) -> None:
     df_db.rename(columns=col_mapping, inplace=True)
     
     # Manejar valores nulos en razon - asignar valor predeterminado
-    df_db['razon'] = df_db['razon'].fillna('Sin Razón Social')
+    df_db['razon'] = fill_missing(df_db['razon'], 'Sin Razón Social')
     
     # Using the correct donante number column name from the dataframe
     numero_col = 'numero'
@@ -664,82 +980,327 @@ def process_donante_data(conn, cursor, df) -> None:
     # Get unique donantes
     df_donantes = df_db.drop_duplicates(subset=numero_col)
     
-    # Fetch foreign keys for donante table - using the database column names
-    frecuencia_mapping = fetch_fk(cursor, id="id_frecuencia", col="frecuencia", table="frecuencias")
-    contribuyente_mapping = fetch_fk(cursor, id="id_contribuyente", col="contribuyente", table="tipo_contribuyentes")
-    razon_mapping = fetch_fk(cursor, id="id_razon", col="razon", table="razones_sociales")
-    tipo_mapping = fetch_fk(cursor, id="id_tipo", col="tipo", table="tipo_donantes")
-    pais_mapping = fetch_fk(cursor, id="id_pais", col="pais", table="paises")
+    # Foreign keys for donante table from the dimension cache - tipo_contribuyentes,
+    # razones_sociales y cuentas ya quedaron cargadas en la pasada de proveedores
+    cache = cache if cache is not None else DimensionCache()
+    cache.preload(cursor, ["frecuencias", "tipo_contribuyentes", "razones_sociales", "tipo_donantes", "paises", "cuentas"])
+    frecuencia_mapping = cache.mapping("frecuencias")
+    contribuyente_mapping = cache.mapping("tipo_contribuyentes")
+    razon_mapping = cache.mapping("razones_sociales")
+    tipo_mapping = cache.mapping("tipo_donantes")
+    pais_mapping = cache.mapping("paises")
     
     # Package foreign keys for donante insertion
     mappings_fk_donantes = (frecuencia_mapping, contribuyente_mapping, razon_mapping, tipo_mapping, pais_mapping)
     
     # Insert donante data
-    ingest_donantes(conn, cursor, df_donantes, mappings_fk_donantes)
+    if bulk:
+        bulk_load_donantes(conn, cursor, df_donantes, mappings_fk_donantes)
+    else:
+        ingest_donantes(conn, cursor, df_donantes, mappings_fk_donantes, policy)
     
     # Prepare foreign keys for incomes
+    cuenta_mapping = cache.mapping("cuentas")
+    if bulk:
+        # El id del donante se resuelve con un JOIN en el INSERT ... SELECT
+        bulk_load_ingresos(conn, cursor, df_db, cuenta_mapping)
+        return
     donantes_mapping = fetch_fk(cursor, "id", "numero", "donantes")
-    cuenta_mapping = fetch_fk(cursor, "id_cuenta", "nro_cuenta", "cuentas")
     mappings_fk_ingresos = (donantes_mapping, cuenta_mapping)
     
     # Insert income data
-    ingest_ingresos(conn, cursor, df_db, mappings_fk_ingresos)
+    ingest_ingresos(conn, cursor, df_db, mappings_fk_ingresos, policy, pool, partitions)
 
 
-def close_connection(conn, cursor) -> None:
+def changed_sources(cursor, paths: list) -> dict:
     """
-    Cierra la conexion a la base de datos y el cursor
+    Compara la huella de cada archivo de origen con la de su ultima carga
 
     params
     ------
-      * conn:
-        - conexion a la base de datos
       * cursor:
-        - cursor de la base de datos
+        - cursor de la db
+      * paths: list
+        - rutas de los archivos de origen
+
+    returns:
+        - diccionario {archivo: huella} solo con los archivos que cambiaron
+    """
+    cambios = {}
+    for path in paths:
+        huella = file_fingerprint(path)
+        if get_watermark(cursor, path.name) == huella:
+            print(f"{path.name} sin cambios desde la ultima carga, se omite")
+        else:
+            cambios[path.name] = huella
+    return cambios
+
+
+def run_branch(pool: ConnectionPool, process, *args, policy: CommitPolicy, **kwargs) -> None:
+    """
+    Corre una rama de la carga (entidad -> tabla de hechos) con su propia conexion del pool
+
+    params
+    ------
+      * pool: ConnectionPool
+        - pool del que se saca la conexion (tambien lo usan las particiones)
+      * process: callable
+        - process_proveedor_data o process_donante_data
+      * args:
+        - argumentos de `process` despues de (conn, cursor)
+      * policy: CommitPolicy
+        - politica de commit (se copia para la conexion de la rama)
+      * kwargs:
+        - argumentos con nombre de `process`
+
+    returns:
+        - None
+    """
+    worker_policy = policy.for_worker()
+    with pool.connection() as (conn, cursor):
+        process(conn, cursor, *args, policy=worker_policy, pool=pool, **kwargs)
+        worker_policy.end_run(conn)
+
+
+def load_branches_parallel(pool: ConnectionPool, df_proveedores, df_donantes, table_to_col: dict, policy: CommitPolicy,
+                           bulk: bool = False, cache: DimensionCache = None, partitions: int = PARTITIONS) -> None:
+    """
+    Carga en paralelo las ramas proveedores -> gastos y donantes -> ingresos.
+    Las dimensiones tienen que estar cargadas y commiteadas antes: las ramas
+    solo leen el cache. Cada rama usa una conexion y las particiones de las
+    tablas de hechos de cada rama usan la mitad de las conexiones que sobran del pool
+
+    params
+    ------
+      * pool: ConnectionPool
+        - pool de conexiones
+      * df_proveedores: pd.DataFrame
+        - dataframe de proveedores
+      * df_donantes: pd.DataFrame
+        - dataframe de donantes
+      * table_to_col: dict
+        - mapeo de tablas a columnas de las dimensiones de proveedores
+      * policy: CommitPolicy
+        - politica de commit
+      * bulk: bool
+        - usar la carga masiva con LOAD DATA LOCAL INFILE
+      * cache: DimensionCache
+        - cache de surrogate keys ya cargado
+      * partitions: int
+        - particiones por tabla de hechos
 
     returns:
         - None
     """
-    if conn:
-        cursor.close()
-        conn.close()
-        print("Desconectando Base de datos...")
+    # Cada rama ocupa una conexion y las sobrantes se reparten entre las dos ramas:
+    # con mas particiones que conexiones libres los hilos esperarian en el pool
+    partitions = max(1, min(partitions, (pool.size - 2) // 2))
+    print(f"Carga en paralelo: 2 ramas, {partitions} particiones por tabla de hechos")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(run_branch, pool, process_proveedor_data, df_proveedores, table_to_col,
+                            policy=policy, bulk=bulk, cache=cache, partitions=partitions),
+            executor.submit(run_branch, pool, process_donante_data, df_donantes,
+                            policy=policy, bulk=bulk, cache=cache, partitions=partitions),
+        ]
+        # Propagar el error de cualquiera de las ramas
+        for future in futures:
+            future.result()
+
+
+def run_async_engine(df_proveedores, df_donantes, paths: list, policy: CommitPolicy, pool_size: int,
+                     bulk: bool = False, incremental: bool = False) -> None:
+    """
+    Corre la ingestion con el motor asincronico (async_ingestion.py)
 
+    params
+    ------
+      * df_proveedores: pd.DataFrame
+        - dataframe de proveedores
+      * df_donantes: pd.DataFrame
+        - dataframe de donantes
+      * paths: list
+        - archivos de origen (proveedores, donantes)
+      * policy: CommitPolicy
+        - politica de commit, del motor async solo se usa el tamaño de lote
+      * pool_size: int
+        - conexiones del pool
+      * bulk: bool
+        - la carga masiva no esta disponible en el motor async
+      * incremental: bool
+        - cargar solo los archivos que cambiaron y las transacciones nuevas
 
-def main() -> None:
+    returns:
+        - None
+    """
+    if bulk:
+        print("Error: --bulk no esta disponible con el motor async")
+        sys.exit(1)
+    try:
+        # aiomysql es opcional, solo hace falta para este motor
+        from async_ingestion import run_async
+    except ImportError:
+        print("Error: el motor async requiere aiomysql (pip install aiomysql)")
+        sys.exit(1)
+    if policy.modo != "lote":
+        print(f"El motor async commitea cada lote, se ignora la politica '{policy.modo}'")
+    asyncio.run(run_async(load_db_config(), df_proveedores, df_donantes, paths, policy.batch_size, pool_size, incremental))
+
+
+def main(args=None, datasets: tuple = None) -> None:
     """
     Funcion principal para orquestar el proceso de ingestion de datos a la base de datos
 
     params
     ------
+      * args: argparse.Namespace
+        - argumentos de linea de comandos (commit, batch_size, bulk, pool_size, reintentos, particiones, incremental, motor, chunk_size)
+      * datasets: tuple
+        - (df_proveedores, df_donantes) ya limpios en memoria (runner de main.py);
+          si es None se leen de data/cleaned
 
     returns:
         - None
     """
+    if args:
+        policy = CommitPolicy(args.commit, args.batch_size)
+        bulk = args.bulk
+        pool_size, retries = args.pool_size, args.reintentos
+        partitions = args.particiones
+        incremental = args.incremental
+        motor = args.motor
+        chunk_size = args.chunk_size
+    else:
+        policy = CommitPolicy()
+        bulk = False
+        pool_size, retries = POOL_SIZE, RETRIES
+        partitions = PARTITIONS
+        incremental = False
+        motor = "sync"
+        chunk_size = 0
+    print(f"Politica de commit: {policy.modo} (lotes de {policy.batch_size} filas)")
+
     # root directory of repo
     repo_root = Path(__file__).resolve().parent.parent
-    data_prov = repo_root / "data" / "cleaned" / "proveedores-clean.csv"
-    data_donan = repo_root / "data" / "cleaned" / "donantes-clean.csv"
+    data_prov = find_table(repo_root / "data" / "cleaned", "proveedores-clean")
+    data_donan = find_table(repo_root / "data" / "cleaned", "donantes-clean")
+    # Modo streaming: los archivos se leen por chunks mas adelante, no se cargan enteros
+    streaming = chunk_size > 0
+    if streaming and (bulk or motor == "async"):
+        print("Error: el modo streaming (--chunk-size) solo esta disponible con el motor sync por filas")
+        sys.exit(1)
+    if streaming and datasets is not None:
+        print("Error: el modo streaming (--chunk-size) lee los archivos, no se puede usar con datos en memoria")
+        sys.exit(1)
+    # En memoria no hay archivo de origen que comparar con la ultima carga: el modo
+    # incremental no omite nada (las transacciones ya cargadas se omiten siempre por hash)
+    sources = [data_prov, data_donan] if datasets is None else []
+    
     # Step 1: Load datasets
-    df_proveedores, df_donantes = load_datasets(data_prov, data_donan)
+    if datasets is not None:
+        df_proveedores, df_donantes = datasets
+        np.random.seed(42)
+    elif not streaming:
+        df_proveedores, df_donantes = load_datasets(data_prov, data_donan)
+    
+    if motor == "async":
+        run_async_engine(df_proveedores, df_donantes, sources, policy, pool_size, bulk, incremental)
+        return
     
     # Step 2: Setup database connection
-    conn, cursor = setup_database_connection()
+    pool = setup_connection_pool(allow_local_infile=bulk, pool_size=pool_size, retries=retries)
+    if not pool.health_check():
+        print("La base de datos no responde")
+        sys.exit(1)
+    # Modo incremental: los archivos que no cambiaron desde la ultima carga no se procesan
+    cambios = {}
+    if incremental and sources:
+        with pool.connection() as (conn, cursor):
+            cambios = changed_sources(cursor, sources)
+        if not cambios:
+            print("No hay cambios en los archivos de origen")
+            return
+        sources = [path for path in sources if path.name in cambios]
+        if not streaming:
+            if data_prov.name not in cambios:
+                df_proveedores = df_proveedores.iloc[:0]
+            if data_donan.name not in cambios:
+                df_donantes = df_donantes.iloc[:0]
+    
+    if streaming:
+        # Un chunk a la vez sobre una sola conexion: la memoria no depende del tamaño de los archivos
+        print(f"Modo streaming: chunks de {chunk_size} filas")
+        filas = {}
+        with pool.connection() as (conn, cursor):
+            cache = DimensionCache()
+            cache.preload(cursor)
+            if data_prov in sources:
+                filas[data_prov.name] = stream_proveedor_data(conn, cursor, data_prov, chunk_size, policy, cache)
+            if data_donan in sources:
+                filas[data_donan.name] = stream_donante_data(conn, cursor, data_donan, chunk_size, policy, cache)
+            policy.end_run(conn)
+    else:
+        # En modo total todo va en una sola transaccion, asi que la carga es serial
+        parallel = policy.modo != "total" and pool.size >= 2
     
-    # Display available tables
-    all_tables = get_all_tables(cursor)
-    print(f"Tablas\n: {all_tables}\n")
+        with pool.connection() as (conn, cursor):
+            # Display available tables
+            all_tables = get_all_tables(cursor)
+            print(f"Tablas\n: {all_tables}\n")
+        
+            # Cache de dimensiones compartido por proveedores y donantes
+            cache = DimensionCache()
+            cache.preload(cursor)
+        
+            # Step 3: Dimensiones de ambas ramas primero (comparten tipo_contribuyentes, razones_sociales y cuentas)
+            table_to_col = handle_proveedor_dimension_tables(conn, cursor, df_proveedores, policy, cache)
+            handle_donante_dimension_tables(conn, cursor, df_donantes, policy, cache)
+        
+            if parallel:
+                # Las ramas usan otras conexiones: las dimensiones tienen que estar commiteadas
+                policy.end_run(conn)
+            else:
+                # Step 4: Process proveedor and donante data
+                process_proveedor_data(conn, cursor, df_proveedores, table_to_col, policy, bulk, cache)
+                process_donante_data(conn, cursor, df_donantes, policy, bulk, cache)
+            
+                # Commit de lo que haya quedado pendiente (modo total)
+                policy.end_run(conn)
     
-    # Step 3: Process proveedor data
-    table_to_col = handle_proveedor_dimension_tables(conn, cursor, df_proveedores)
-    process_proveedor_data(conn, cursor, df_proveedores, table_to_col)
+        # Step 4: proveedores -> gastos y donantes -> ingresos en paralelo
+        if parallel:
+            load_branches_parallel(pool, df_proveedores, df_donantes, table_to_col, policy, bulk, cache, partitions)
+        filas = {data_prov.name: len(df_proveedores), data_donan.name: len(df_donantes)}
     
-    # Step 4: Process donante data
-    handle_donante_dimension_tables(conn, cursor, df_donantes)
-    process_donante_data(conn, cursor, df_donantes)
+    # Registrar la carga de los archivos recien procesados
+    if cambios:
+        with pool.connection() as (conn, cursor):
+            for archivo, huella in cambios.items():
+                update_watermark(conn, cursor, archivo, huella, filas[archivo])
     
-    # Step 5: Close database connection
-    close_connection(conn, cursor)
+    # Step 5: Las conexiones ya volvieron al pool
+    print("Desconectando Base de datos...")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Ingestion de datos limpios a la base de datos")
+    parser.add_argument("-c", "--commit", choices=CommitPolicy.MODOS, default="lote",
+                        help="Politica de commit: por fila, por lote, por tabla o uno solo al final")
+    parser.add_argument("-b", "--batch-size", type=int, default=BATCH_SIZE,
+                        help="Cantidad de filas por lote (INSERT multi-fila y commit en modo lote)")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Cargar proveedores, donantes, gastos e ingresos con LOAD DATA LOCAL INFILE")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE,
+                        help="Cantidad de conexiones del pool (con 1 la carga es serial)")
+    parser.add_argument("-p", "--particiones", type=int, default=PARTITIONS,
+                        help="Particiones en las que se divide cada tabla de hechos para cargarla en paralelo")
+    parser.add_argument("--reintentos", type=int, default=RETRIES,
+                        help="Reintentos con backoff ante errores transitorios de conexion")
+    parser.add_argument("-m", "--motor", choices=("sync", "async"), default="sync",
+                        help="Motor de ingestion: sincronico (mysql.connector) o asincronico (aiomysql). "
+                             "La paridad del async contra el sincronico se verifica con benchmarks/bench_async.py")
+    parser.add_argument("--chunk-size", type=int, default=0,
+                        help="Modo streaming: leer los archivos de a N filas y cargar cada chunk antes de leer el siguiente")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="Cargar solo los archivos que cambiaron desde la ultima carga (las transacciones ya cargadas se omiten siempre)")
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Pool de conexiones a MySQL con reintentos y backoff exponencial.
+
+Los errores transitorios (conexion caida, servidor reiniciando, demasiadas
+conexiones, deadlock, lock wait timeout o pool agotado) se reintentan una
+cantidad acotada de veces, esperando `backoff * 2**intento` segundos entre
+cada intento. Varios workers pueden pedir conexiones al mismo pool con
+`ConnectionPool.connection()`.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from dotenv import load_dotenv
+from mysql.connector import pooling, errors, Error
+
+# Tamaño del pool (mysql.connector admite hasta 32)
+POOL_SIZE = 4
+# Reintentos ante errores transitorios y espera base en segundos
+RETRIES = 5
+BACKOFF = 0.5
+
+# 1040: too many connections, 1205: lock wait timeout, 1213: deadlock,
+# 2003: no se puede conectar, 2006: server has gone away, 2013: lost connection
+TRANSIENT_ERRNOS = {1040, 1205, 1213, 2003, 2006, 2013, 2055}
+
+
+def is_transient(error: Exception) -> bool:
+    """Indica si el error es transitorio y vale la pena reintentar"""
+    if isinstance(error, (errors.PoolError, errors.OperationalError)):
+        return True
+    return getattr(error, "errno", None) in TRANSIENT_ERRNOS
+
+
+def reconnect(conn) -> None:
+    """Intenta reabrir la conexion, si falla se reintenta en la proxima vuelta"""
+    try:
+        conn.reconnect(attempts=1, delay=0)
+    except Error:
+        pass
+
+
+def retry_call(func, conn=None, retries: int = RETRIES, backoff: float = BACKOFF, can_retry: bool = True):
+    """
+    Ejecuta `func` reintentando los errores transitorios con backoff exponencial
+
+    params
+    ------
+      * func: callable
+        - funcion sin argumentos a ejecutar
+      * conn:
+        - conexion a reabrir antes de cada reintento (opcional)
+      * retries: int
+        - cantidad maxima de reintentos
+      * backoff: float
+        - espera base en segundos
+      * can_retry: bool
+        - False si reintentar no es seguro (por ejemplo con filas sin commit)
+
+    returns:
+        - el resultado de `func`
+    """
+    for intento in range(retries + 1):
+        try:
+            return func()
+        except Error as e:
+            if not (can_retry and is_transient(e)) or intento == retries:
+                raise
+            espera = backoff * 2 ** intento
+            print(f"Error transitorio ({e}): reintento {intento + 1}/{retries} en {espera:.1f}s")
+            time.sleep(espera)
+            if conn is not None:
+                reconnect(conn)
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones a la base de datos compartido por los workers de carga
+
+    params
+    ------
+      * db_config: dict
+        - credenciales de la base de datos
+      * size: int
+        - cantidad de conexiones del pool
+      * retries: int
+        - reintentos ante errores transitorios
+      * backoff: float
+        - espera base en segundos entre reintentos
+    """
+
+    def __init__(self, db_config: dict, size: int = POOL_SIZE, retries: int = RETRIES, backoff: float = BACKOFF):
+        self.size = size
+        self.retries = retries
+        self.backoff = backoff
+        self._slots = threading.BoundedSemaphore(size)
+        self._pool = retry_call(
+            lambda: pooling.MySQLConnectionPool(pool_name="guayerd", pool_size=size, pool_reset_session=True, **db_config),
+            retries=retries, backoff=backoff
+        )
+        print(f"Pool de conexiones creado ({size} conexiones)")
+
+    def get_connection(self):
+        """
+        Saca una conexion del pool y verifica que siga viva (reconecta si hace falta).
+        Se devuelve al pool con `conn.close()`
+
+        returns:
+            - conexion del pool
+        """
+        conn = retry_call(self._pool.get_connection, retries=self.retries, backoff=self.backoff)
+        conn.ping(reconnect=True, attempts=self.retries, delay=self.backoff)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager para los workers: espera a que haya una conexion libre,
+        la entrega junto a un cursor y la devuelve al pool al salir
+
+        returns:
+            - tupla con (conexion, cursor)
+        """
+        with self._slots:
+            conn = self.get_connection()
+            cursor = conn.cursor(buffered=True)
+            try:
+                yield conn, cursor
+            finally:
+                cursor.close()
+                conn.close()
+
+    def health_check(self) -> bool:
+        """Verifica que el pool pueda entregar una conexion que responda a SELECT 1"""
+        try:
+            with self.connection() as (_, cursor):
+                cursor.execute("SELECT 1")
+                return cursor.fetchone() == (1,)
+        except Error as e:
+            print(f"Health check fallido: {e}")
+            return False
+
+
+def load_env() -> None:
+    """Carga las variables de la base de datos de .env o, con USE_ENV_EXAMPLE=1, de .env.example"""
+    # Check if we should use .env.example for local Docker environment
+    if os.environ.get("USE_ENV_EXAMPLE") == "1":
+        # Load environment variables from .env.example
+        local_env_file = Path(__file__).resolve().parent / ".env.example"
+        if not local_env_file.exists():
+            print(f"Error: .env.example file not found at {local_env_file}")
+            sys.exit(1)
+        print(f"Loading environment from {local_env_file}")
+        load_dotenv(dotenv_path=local_env_file)
+    else:
+        # Load environment variables from .env (production)
+        load_dotenv()
+
+
+def db_identity() -> tuple:
+    """Base de datos destino sin credenciales: (host, puerto, nombre). main.py la usa en la clave del cache"""
+    load_env()
+    return os.getenv("DATABASE_HOST"), os.getenv("DATABASE_PORT"), os.getenv("DATABASE_NAME")
+
+
+def load_db_config(allow_local_infile: bool = False) -> dict:
+    """
+    Lee las credenciales de la base de datos del entorno (.env o .env.example)
+
+    params
+    ------
+      * allow_local_infile: bool
+        - habilita `LOAD DATA LOCAL INFILE` para la carga masiva
+
+    returns:
+        - diccionario con la configuracion de la conexion
+    """
+    load_env()
+    
+    # Get database configuration from environment variables
+    db_config = {
+        "host": os.getenv("DATABASE_HOST"),
+        "user": os.getenv("DATABASE_USER"),
+        "password": os.getenv("DATABASE_PASSWORD"),
+        "database": os.getenv("DATABASE_NAME")
+    }
+    if allow_local_infile:
+        db_config["allow_local_infile"] = True
+    
+    # Print connection info (excluding password)
+    connection_info = {k: v for k, v in db_config.items() if k != "password"}
+    print(f"Connecting to database with: {connection_info}")
+    return db_config
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Cache en memoria de las surrogate keys de las tablas de dimension.
+
+Cada dimension se lee una sola vez de la base de datos. Despues solo se insertan
+los valores que el cache todavia no vio y sus ids se toman de `lastrowid`
+(un solo valor nuevo) o de un unico SELECT posterior (varios valores nuevos).
+Las dimensiones compartidas entre proveedores y donantes (tipo_contribuyentes,
+razones_sociales, cuentas) no se vuelven a leer en la pasada de donantes.
+"""
+
+# tabla: (columna id, columna valor)
+DIMENSIONS = {
+    "categoria_proveedores": ("id_categoria", "categoria"),
+    "tipo_contribuyentes": ("id_contribuyente", "contribuyente"),
+    "razones_sociales": ("id_razon", "razon"),
+    "ciudades": ("id_ciudad", "ciudad"),
+    "paises": ("id_pais", "pais"),
+    "tipo_donantes": ("id_tipo", "tipo"),
+    "frecuencias": ("id_frecuencia", "frecuencia"),
+    "cuentas": ("id_cuenta", "nro_cuenta"),
+}
+
+
+def dimension_values(serie) -> list:
+    """
+    Valores unicos de una columna listos para insertar en una dimension:
+    sin nulos ni strings vacios y con tipos nativos de Python
+
+    params
+    ------
+      * serie: pd.Series
+        - columna del dataframe de origen
+
+    returns:
+        - lista de valores unicos
+    """
+    values = []
+    for value in serie.dropna().unique():
+        # Skip empty strings
+        if isinstance(value, str) and value.strip() == '':
+            continue
+        # Enteros de numpy a enteros de Python
+        values.append(value.item() if hasattr(value, "item") else value)
+    return values
+
+
+def _key(value):
+    """Clave de comparacion: MySQL compara los VARCHAR sin distinguir mayusculas"""
+    return value.casefold() if isinstance(value, str) else value
+
+
+class DimensionCache:
+    """
+    Cache de {valor: id} por tabla de dimension
+
+    params
+    ------
+      * dimensions: dict
+        - {tabla: (columna id, columna valor)}, por defecto todas las del schema
+    """
+
+    def __init__(self, dimensions: dict = None):
+        self.dimensions = dimensions or DIMENSIONS
+        self.mappings = {}
+        self._keys = {}
+
+    def is_loaded(self, table: str) -> bool:
+        """Indica si la dimension ya se leyo de la base de datos"""
+        return table in self.mappings
+
+    def _store(self, table: str, rows) -> None:
+        """Guarda pares (id, valor) en el cache"""
+        mapping = self.mappings.setdefault(table, {})
+        keys = self._keys.setdefault(table, {})
+        for id_, value in rows:
+            mapping[value] = id_
+            keys[_key(value)] = id_
+
+    def preload(self, cursor, tables: list = None) -> None:
+        """
+        Lee cada dimension una sola vez (las que ya estan en cache se saltean)
+
+        params
+        ------
+          * cursor:
+            - cursor de la db
+          * tables: list
+            - tablas a leer, por defecto todas
+
+        returns:
+            - None
+        """
+        for table in tables or self.dimensions:
+            if self.is_loaded(table):
+                continue
+            cursor.execute(self.select_query(table))
+            self._store(table, cursor.fetchall())
+            print(f"Fetch fkeys from {table}")
+
+    def select_query(self, table: str, n_values: int = 0) -> str:
+        """SELECT de (id, valor) de la dimension, filtrado por `n_values` placeholders si se indica"""
+        id_col, col = self.dimensions[table]
+        query = f"SELECT `{id_col}`, `{col}` FROM `{table}`"
+        if n_values:
+            query += f" WHERE `{col}` IN ({', '.join(['%s'] * n_values)})"
+        return query
+
+    def upsert_query(self, table: str) -> str:
+        """INSERT de un valor de la dimension que no falla si el valor ya existe"""
+        _, col = self.dimensions[table]
+        return f"""
+        INSERT INTO `{table}` (`{col}`) VALUES (%s)
+        ON DUPLICATE KEY UPDATE `{col}`=VALUES(`{col}`);
+        """
+
+    def mapping(self, table: str) -> dict:
+        """Devuelve el diccionario {valor: id} de la dimension"""
+        return self.mappings.get(table, {})
+
+    def get(self, table: str, value):
+        """Devuelve el id de un valor o None si no esta en el cache"""
+        id_ = self.mappings.get(table, {}).get(value)
+        if id_ is None:
+            id_ = self._keys.get(table, {}).get(_key(value))
+        return id_
+
+    def missing(self, table: str, values) -> list:
+        """
+        Devuelve los valores que el cache no conoce, sin repetir. Los valores que
+        la db considera iguales a uno conocido se agregan como alias
+
+        params
+        ------
+          * table: str
+            - tabla de dimension
+          * values: iterable
+            - valores unicos ya convertidos a tipos nativos
+
+        returns:
+            - lista de valores nuevos
+        """
+        nuevos = []
+        vistos = set()
+        for value in values:
+            id_ = self.get(table, value)
+            if id_ is not None:
+                # Alias para valores que la db considera iguales a uno existente (mayusculas/minusculas)
+                self.mappings.setdefault(table, {})[value] = id_
+            elif _key(value) not in vistos:
+                nuevos.append(value)
+                vistos.add(_key(value))
+        return nuevos
+
+    def add(self, table: str, values: list, rows) -> None:
+        """Guarda los pares (id, valor) leidos de la db y los alias de `values`"""
+        self._store(table, rows)
+        # Valores que la db igualo a uno existente o que difieren de otro solo en mayusculas
+        for value in values:
+            id_ = self.get(table, value)
+            if id_ is not None:
+                self.mappings[table][value] = id_
+
+    def ensure(self, conn, cursor, table: str, values, policy=None) -> int:
+        """
+        Inserta los valores que el cache no conoce y agrega sus ids al cache
+
+        params
+        ------
+          * conn:
+            - conexion a la db
+          * cursor:
+            - cursor de la db
+          * table: str
+            - tabla de dimension
+          * values: iterable
+            - valores unicos ya convertidos a tipos nativos
+          * policy: CommitPolicy
+            - politica de commit, sin politica se hace commit al final
+
+        returns:
+            - cantidad de valores nuevos
+        """
+        self.preload(cursor, [table])
+        values = list(values)
+        nuevos = self.missing(table, values)
+        if not nuevos:
+            return 0
+
+        cursor.executemany(self.upsert_query(table), [(value,) for value in nuevos])
+        if policy is None:
+            conn.commit()
+        else:
+            policy.after_write(conn, len(nuevos))
+
+        # lastrowid solo es confiable para un unico valor realmente insertado
+        if len(nuevos) == 1 and cursor.lastrowid:
+            rows = [(cursor.lastrowid, nuevos[0])]
+        else:
+            cursor.execute(self.select_query(table, len(nuevos)), tuple(nuevos))
+            rows = cursor.fetchall()
+        self.add(table, values, rows)
+        return len(nuevos)
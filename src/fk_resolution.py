@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Resolucion vectorizada de foreign keys.
+
+Las foreign keys se resuelven por columna: los valores de la columna se
+convierten en codigos contra el indice de la dimension (`Index.get_indexer`)
+y los ids se toman con un solo `take`, sin recorrer las filas en Python.
+No depende de la base de datos: los mapeos son diccionarios {valor: id}.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def map_keys(values: pd.Series, mapping: dict) -> pd.Series:
+    """
+    Resuelve una columna completa contra un mapeo {valor: id}
+
+    params
+    ------
+      * values: pd.Series
+        - columna con los valores de la dimension (si es categorica se resuelve por codigo)
+      * mapping: dict
+        - diccionario {valor: id} de la dimension
+
+    returns:
+        - serie Int64 con los ids (<NA> si el valor no esta en el mapeo)
+    """
+    if not mapping:
+        return pd.Series(pd.array([pd.NA] * len(values), dtype="Int64"), index=values.index)
+    categorias = pd.Index(list(mapping.keys()))
+    ids = np.fromiter(mapping.values(), dtype="int64", count=len(mapping))
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Solo se buscan las categorias; cada fila toma la posicion de su categoria por codigo
+        # (el -1 del final traduce los nulos, codigo -1)
+        por_categoria = np.append(categorias.get_indexer(values.cat.categories), -1)
+        codes = por_categoria[values.cat.codes.to_numpy()]
+    else:
+        codes = categorias.get_indexer(values)
+    faltantes = codes < 0
+    resueltos = ids[np.where(faltantes, 0, codes)]
+    return pd.Series(pd.arrays.IntegerArray(resueltos, faltantes), index=values.index)
+
+
+def resolve_foreign_keys(df: pd.DataFrame, specs: dict) -> tuple:
+    """
+    Resuelve todas las foreign keys de una tabla y descarta las filas incompletas
+
+    params
+    ------
+      * df: pd.DataFrame
+        - datos de origen
+      * specs: dict
+        - {columna fk: (columna de origen, mapeo {valor: id})}
+
+    returns:
+        - tupla con (dataframe con las fk como int64 solo para las filas resueltas,
+          diccionario {columna fk: cantidad de filas sin resolver})
+    """
+    df_fk = df.copy()
+    resueltas = np.ones(len(df), dtype=bool)
+    faltantes = {}
+    for fk_col, (source_col, mapping) in specs.items():
+        ids = map_keys(df[source_col], mapping)
+        df_fk[fk_col] = ids
+        sin_resolver = ids.isna().to_numpy()
+        faltantes[fk_col] = int(sin_resolver.sum())
+        resueltas &= ~sin_resolver
+
+    df_fk = df_fk[resueltas].astype({fk_col: "int64" for fk_col in specs})
+    return df_fk, faltantes
+
+
+def build_params(df: pd.DataFrame, cols: list) -> list:
+    """
+    Arma las tuplas de parametros para `executemany` columna por columna,
+    convirtiendo los tipos de numpy a tipos nativos de Python y NaN a None
+
+    params
+    ------
+      * df: pd.DataFrame
+        - datos a insertar
+      * cols: list
+        - columnas en el orden de los placeholders de la query
+
+    returns:
+        - lista de tuplas, una por fila
+    """
+    columnas = []
+    for col in cols:
+        serie = df[col]
+        columnas.append(serie.astype(object).where(serie.notna(), None).tolist())
+    return list(zip(*columnas))
+
+
+def fill_missing(serie: pd.Series, value) -> pd.Series:
+    """
+    Rellena los nulos de una columna con un valor por defecto. En las columnas
+    categoricas el valor se agrega antes como categoria
+
+    params
+    ------
+      * serie: pd.Series
+        - columna a rellenar
+      * value:
+        - valor para los nulos
+
+    returns:
+        - serie sin nulos
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype) and value not in serie.cat.categories:
+        serie = serie.cat.add_categories([value])
+    return serie.fillna(value)
+
+
+def format_missing(faltantes: dict) -> str:
+    """Resumen de las foreign keys sin resolver, solo las columnas con faltantes"""
+    return ", ".join([f"{key}: {value}" for key, value in faltantes.items() if value > 0])
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Ingestion incremental de gastos e ingresos.
+
+Las tablas de hechos no tienen clave natural, asi que cada transaccion se
+identifica con un hash de su contenido (numero, nro_cuenta, fecha, importe)
+guardado bajo un indice UNIQUE. Las transacciones identicas dentro de un mismo
+archivo se distinguen por su numero de ocurrencia, asi no se pierden.
+La tabla `cargas_incrementales` guarda la huella de cada archivo de origen
+cargado: si el archivo no cambio desde la ultima corrida no se vuelve a leer
+en la base de datos.
+"""
+
+import hashlib
+from datetime import date
+from pathlib import Path
+
+WATERMARK_TABLE = "cargas_incrementales"
+
+HASHES_QUERY = "SELECT `hash` FROM `{table}`"
+WATERMARK_SELECT = f"SELECT hash_archivo FROM `{WATERMARK_TABLE}` WHERE archivo = %s"
+WATERMARK_UPSERT = f"""
+INSERT INTO `{WATERMARK_TABLE}` (archivo, hash_archivo, filas, cargado)
+VALUES (%s, %s, %s, NOW())
+ON DUPLICATE KEY UPDATE
+    hash_archivo = VALUES(hash_archivo),
+    filas = VALUES(filas),
+    cargado = VALUES(cargado);
+"""
+
+
+def transaction_hashes(df, ocurrencias: dict = None):
+    """
+    Calcula el hash SHA-256 de cada transaccion
+
+    El texto hasheado es `numero|nro_cuenta|fecha|importe|ocurrencia`, con la
+    fecha como YYYY-MM-DD y el importe con dos decimales (igual que DECIMAL(10, 2)),
+    asi el mismo hash se puede recalcular en SQL (ver _DATABASE/incremental.sql)
+
+    params
+    ------
+      * df: pd.DataFrame
+        - transacciones con las columnas numero, nro_cuenta, fecha e importe
+      * ocurrencias: dict
+        - conteo de ocurrencias de los chunks anteriores cuando el archivo se
+          lee por partes (se actualiza con las filas de `df`)
+
+    returns:
+        - serie con el hash hexadecimal de cada fila
+    """
+    # pandas se importa recien aca: ingestion_lite.py usa este modulo sin pandas
+    import pandas as pd
+
+    numero = df["numero"].astype(str).str.strip()
+    cuenta = pd.to_numeric(df["nro_cuenta"], errors="coerce").astype("Int64").astype(str)
+    fecha = pd.to_datetime(df["fecha"], errors="coerce").dt.strftime("%Y-%m-%d").fillna("")
+    importe = pd.to_numeric(df["importe"], errors="coerce").round(2).map("{:.2f}".format)
+
+    contenido = numero + "|" + cuenta + "|" + fecha + "|" + importe
+    ocurrencia = contenido.groupby(contenido).cumcount()
+    if ocurrencias is not None:
+        # Las ocurrencias siguen la numeracion de los chunks anteriores
+        claves = pd.Series(pd.util.hash_array(contenido.to_numpy(dtype=object)), index=contenido.index)
+        ocurrencia += claves.map(ocurrencias).fillna(0).astype("int64")
+        for clave, n in claves.value_counts().items():
+            ocurrencias[clave] = ocurrencias.get(clave, 0) + n
+    ocurrencia = ocurrencia.astype(str)
+    return (contenido + "|" + ocurrencia).map(lambda texto: hashlib.sha256(texto.encode("utf-8")).hexdigest())
+
+
+def row_hashes(rows) -> list:
+    """
+    Version sin pandas de `transaction_hashes` para filas ya tipadas
+    (mismo texto hasheado, asi ambos motores generan los mismos hashes)
+
+    params
+    ------
+      * rows: iterable
+        - tuplas (numero, nro_cuenta, fecha, importe) con fecha como date/datetime
+          e importe como float; los faltantes como None
+
+    returns:
+        - lista con el hash hexadecimal de cada fila
+    """
+    hashes = []
+    ocurrencias = {}
+    for numero, nro_cuenta, fecha, importe in rows:
+        cuenta = "<NA>" if nro_cuenta is None else str(int(nro_cuenta))
+        fecha = fecha.strftime("%Y-%m-%d") if isinstance(fecha, date) else ""
+        # Igual que Series.round(2): redondeo al par sobre importe * 100
+        importe = float("nan") if importe is None else round(importe * 100) / 100
+        contenido = f"{str(numero).strip()}|{cuenta}|{fecha}|{importe:.2f}"
+        ocurrencia = ocurrencias.get(contenido, 0)
+        ocurrencias[contenido] = ocurrencia + 1
+        hashes.append(hashlib.sha256(f"{contenido}|{ocurrencia}".encode("utf-8")).hexdigest())
+    return hashes
+
+
+def hash_lookups(table: str, hashes, batch_size: int = 1000):
+    """
+    Consultas que buscan los hashes en una tabla de hechos por lotes de `IN (...)`
+
+    returns:
+        - generador de tuplas (sentencia, parametros)
+    """
+    hashes = list(hashes)
+    for start in range(0, len(hashes), batch_size):
+        lote = tuple(hashes[start:start + batch_size])
+        placeholders = ", ".join(["%s"] * len(lote))
+        yield f"{HASHES_QUERY.format(table=table)} WHERE `hash` IN ({placeholders})", lote
+
+
+def fetch_existing_hashes(cursor, table: str, hashes, batch_size: int = 1000) -> set:
+    """
+    Devuelve cuales de los hashes ya estan cargados en una tabla de hechos.
+    Se consulta por lotes para no traer la tabla entera a memoria
+
+    params
+    ------
+      * cursor:
+        - cursor de la db
+      * table: str
+        - tabla de hechos (gastos, ingresos)
+      * hashes: iterable
+        - hashes a buscar
+      * batch_size: int
+        - hashes por consulta
+
+    returns:
+        - set con los hashes que ya existen
+    """
+    existentes = set()
+    for query, params in hash_lookups(table, hashes, batch_size):
+        cursor.execute(query, params)
+        existentes.update(row[0] for row in cursor.fetchall())
+    return existentes
+
+
+def file_fingerprint(path: Path) -> str:
+    """SHA-256 del contenido de un archivo, leido en bloques de 1 MB"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def get_watermark(cursor, archivo: str):
+    """
+    Devuelve la huella de la ultima carga de un archivo
+
+    params
+    ------
+      * cursor:
+        - cursor de la db
+      * archivo: str
+        - nombre del archivo de origen
+
+    returns:
+        - hash del archivo en la ultima carga o None si nunca se cargo
+    """
+    cursor.execute(WATERMARK_SELECT, (archivo,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def update_watermark(conn, cursor, archivo: str, hash_archivo: str, filas: int) -> None:
+    """
+    Registra la carga de un archivo de origen
+
+    params
+    ------
+      * conn:
+        - conexion a la db
+      * cursor:
+        - cursor de la db
+      * archivo: str
+        - nombre del archivo de origen
+      * hash_archivo: str
+        - huella del contenido del archivo
+      * filas: int
+        - filas del archivo
+
+    returns:
+        - None
+    """
+    cursor.execute(WATERMARK_UPSERT, (archivo, hash_archivo, filas))
+    conn.commit()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Ingestion liviana de los archivos limpios, sin pandas ni numpy.
+
+Los archivos de data/cleaned ya vienen tipados (parquet guarda el schema y el
+csv limpio tiene un formato fijo), asi que para cargarlos alcanza con leer
+filas de Python: parquet/feather con pyarrow y csv con el modulo `csv`.
+Importar pandas cuesta mas que cargar los lotes chicos o frecuentes, por eso
+este modulo es el punto de entrada para esas cargas.
+
+Usa las mismas dimensiones (`DimensionCache`), consultas y hashes de
+transaccion (`row_hashes`) que db-ingestion.py, asi las dos cargas se pueden
+alternar sobre la misma base, incluso en modo incremental.
+
+Usage:
+  python src/ingestion_lite.py [--batch-size 1000] [--incremental]
+"""
+
+import argparse
+import csv
+import math
+from datetime import datetime
+from pathlib import Path
+from mysql.connector import connect, Error, IntegrityError
+from dimension_cache import DimensionCache
+from db_pool import RETRIES, is_transient, load_db_config, retry_call
+from incremental import fetch_existing_hashes, row_hashes
+from queries import DONANTE_DIMENSIONS, DONANTES_INSERT, FACT_INSERT, PROVEEDOR_DIMENSIONS, PROVEEDORES_INSERT
+
+# Cantidad de filas por lote (INSERT multi-fila)
+BATCH_SIZE = 1000
+# Extensiones de las tablas limpias, en orden de preferencia
+EXTENSIONES = (".parquet", ".feather", ".csv")
+
+
+def _bool(texto: str) -> bool:
+    return texto.strip().lower() in ("true", "1", "si", "sí")
+
+
+def _int(texto: str) -> int:
+    # nro_cuenta puede quedar como "402101.0" si la columna tuvo nulos
+    return int(float(texto))
+
+
+# Columnas del csv limpio que no son texto: columna -> conversion
+TIPOS_CSV = {
+    "importe": float,
+    "nro_cuenta": _int,
+    "fecha": datetime.fromisoformat,
+    "activo": _bool,
+}
+
+
+def find_clean_file(directorio: Path, nombre: str) -> Path:
+    """Ruta de una tabla limpia en el primer formato que exista (parquet, feather, csv)"""
+    for extension in EXTENSIONES:
+        path = Path(directorio) / f"{nombre}{extension}"
+        if path.exists():
+            return path
+    raise FileNotFoundError(f"No se encontro {nombre} en {directorio}")
+
+
+def _native(value):
+    """NaN de las columnas float a None, como `pd.isna` en db-ingestion.py"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def read_rows(path: Path) -> list:
+    """
+    Lee una tabla limpia como lista de diccionarios con tipos nativos de Python
+
+    params
+    ------
+      * path: Path
+        - ruta al archivo (parquet, feather o csv)
+
+    returns:
+        - lista de filas {columna: valor}, los faltantes como None
+    """
+    path = Path(path)
+    if path.suffix in (".parquet", ".feather"):
+        # pyarrow solo hace falta para estos formatos
+        if path.suffix == ".parquet":
+            import pyarrow.parquet as pq
+            # ParquetFile.read no lee la metadata de pandas (read_table importa pandas)
+            tabla = pq.ParquetFile(path).read()
+        else:
+            import pyarrow.feather as feather
+            tabla = feather.read_table(path)
+        import pyarrow as pa
+        # pyarrow convierte los timestamp[ns] a pd.Timestamp (e importa pandas): se pasan a datetime
+        schema = pa.schema([
+            field.with_type(pa.timestamp("us", field.type.tz)) if pa.types.is_timestamp(field.type) else field
+            for field in tabla.schema
+        ])
+        tabla = tabla.cast(schema)
+        return [{col: _native(value) for col, value in row.items()} for row in tabla.to_pylist()]
+
+    rows = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            for col, value in row.items():
+                if value == "":
+                    row[col] = None
+                elif col in TIPOS_CSV:
+                    row[col] = TIPOS_CSV[col](value)
+            rows.append(row)
+    return rows
+
+
+def unique_values(rows: list, col: str) -> list:
+    """Valores unicos de una columna para una dimension, sin nulos ni strings vacios"""
+    values = {}
+    for row in rows:
+        value = row.get(col)
+        if value is None or (isinstance(value, str) and value.strip() == ""):
+            continue
+        values.setdefault(value, None)
+    return list(values)
+
+
+def first_by_numero(rows: list) -> list:
+    """Primera fila de cada entidad (como `drop_duplicates(subset='numero')`)"""
+    vistos = set()
+    entidades = []
+    for row in rows:
+        if row["numero"] not in vistos:
+            vistos.add(row["numero"])
+            entidades.append(row)
+    return entidades
+
+
+def insert_batches(conn, cursor, query: str, rows: list, batch_size: int = BATCH_SIZE) -> tuple:
+    """
+    Inserta las filas en lotes con `executemany` y un commit por lote. Si un lote
+    falla por un error de integridad se reintenta fila por fila
+
+    params
+    ------
+      * conn: - conexion con la base de datos
+      * cursor: - cursor de la base de datos
+      * query: str
+        - Sentencia INSERT de SQL con placeholders (%s)
+      * rows: list
+        - lista de tuplas con los valores a insertar
+      * batch_size: int
+        - filas por lote
+
+    returns:
+        - tupla con (filas insertadas, filas omitidas)
+    """
+    count = 0
+    skipped = 0
+    for start in range(0, len(rows), batch_size):
+        lote = rows[start:start + batch_size]
+        try:
+            retry_call(lambda: cursor.executemany(query, lote), conn=conn)
+            conn.commit()
+            count += len(lote)
+        except IntegrityError:
+            for row in lote:
+                try:
+                    cursor.execute(query, row)
+                    conn.commit()
+                    count += 1
+                except IntegrityError:
+                    skipped += 1
+        except Error as e:
+            if is_transient(e):
+                raise
+            print(f"Error inesperado: {e}")
+            skipped += len(lote)
+    return count, skipped
+
+
+def load_dimensions(conn, cursor, rows: list, dimensiones: dict, cache: DimensionCache) -> None:
+    """Inserta en cada dimension los valores que el cache todavia no conoce"""
+    for table, col in dimensiones.items():
+        count = cache.ensure(conn, cursor, table, unique_values(rows, col))
+        print(f"Cantidad de filas insertadas en {table}: {count}")
+
+
+def resolve_rows(rows: list, cols: list, fks: dict, cache: DimensionCache) -> tuple:
+    """
+    Arma las tuplas a insertar resolviendo las foreign keys contra el cache
+
+    params
+    ------
+      * rows: list
+        - filas {columna: valor}
+      * cols: list
+        - columnas de la fila que van antes de las foreign keys
+      * fks: dict
+        - {columna de origen: tabla de dimension}
+      * cache: DimensionCache
+        - cache de surrogate keys de las dimensiones
+
+    returns:
+        - tupla con (filas a insertar, filas omitidas por claves foraneas faltantes)
+    """
+    mappings = [(col, cache.mapping(table)) for col, table in fks.items()]
+    params = []
+    for row in rows:
+        ids = [mapping.get(row.get(col)) for col, mapping in mappings]
+        if None in ids:
+            continue
+        params.append(tuple(row.get(col) for col in cols) + tuple(ids))
+    return params, len(rows) - len(params)
+
+
+def ingest_entities(conn, cursor, rows: list, query: str, cols: list, fks: dict, cache: DimensionCache,
+                    batch_size: int = BATCH_SIZE) -> None:
+    """Inserta la primera fila de cada entidad (proveedor o donante) con sus foreign keys"""
+    params, sin_fk = resolve_rows(first_by_numero(rows), cols, fks, cache)
+    count, skipped = insert_batches(conn, cursor, query, params, batch_size)
+    print(f"Cantidad de filas insertadas: {count}")
+    if skipped > 0:
+        print(f"Filas omitidas por errores de integridad: {skipped}")
+    if sin_fk > 0:
+        print(f"Filas omitidas por claves foraneas faltantes: {sin_fk}")
+
+
+def ingest_facts(conn, cursor, rows: list, table: str, id_col: str, entidad: str, cache: DimensionCache,
+                 batch_size: int = BATCH_SIZE, incremental: bool = False) -> None:
+    """
+    Inserta las transacciones de una tabla de hechos (gastos o ingresos) con su hash
+
+    params
+    ------
+      * conn:
+        - conexion a la db
+      * cursor:
+        - cursor de la db
+      * rows: list
+        - filas {columna: valor} con numero, nro_cuenta, importe y fecha
+      * table: str
+        - tabla de hechos (gastos, ingresos)
+      * id_col: str
+        - columna de la foreign key a la entidad (id_proveedor, id_donante)
+      * entidad: str
+        - tabla de la entidad (proveedores, donantes)
+      * cache: DimensionCache
+        - cache de surrogate keys de las dimensiones (para cuentas)
+      * batch_size: int
+        - filas por lote
+      * incremental: bool
+        - omitir las transacciones cuyo hash ya esta en la tabla
+
+    returns:
+        - None
+    """
+    cursor.execute(f"SELECT `id`, `numero` FROM `{entidad}`")
+    entidad_mapping = {numero: id_ for id_, numero in cursor.fetchall()}
+    cuenta_mapping = cache.mapping("cuentas")
+
+    # El hash se calcula sobre el archivo completo para que la ocurrencia de las filas repetidas sea estable
+    hashes = row_hashes((row["numero"], row["nro_cuenta"], row["fecha"], row["importe"]) for row in rows)
+    params = []
+    for row, hash_ in zip(rows, hashes):
+        id_entidad = entidad_mapping.get(row["numero"])
+        id_cuenta = cuenta_mapping.get(row["nro_cuenta"])
+        if id_entidad is not None and id_cuenta is not None:
+            params.append((row["importe"], row["fecha"], id_entidad, id_cuenta, hash_))
+    sin_fk = len(rows) - len(params)
+    if incremental:
+        existentes = fetch_existing_hashes(cursor, table, [row[-1] for row in params])
+        nuevas = [row for row in params if row[-1] not in existentes]
+        print(f"Filas ya cargadas: {len(params) - len(nuevas)}")
+        params = nuevas
+
+    count, skipped = insert_batches(conn, cursor, FACT_INSERT.format(table=table, id_col=id_col), params, batch_size)
+    print(f"Cantidad de filas insertadas: {count}")
+    print(f"Filas omitidas: {skipped + sin_fk}")
+
+
+def ingest_proveedores(conn, cursor, rows: list, cache: DimensionCache, batch_size: int = BATCH_SIZE,
+                       incremental: bool = False) -> None:
+    """Carga dimensiones, proveedores y gastos"""
+    load_dimensions(conn, cursor, rows, PROVEEDOR_DIMENSIONS, cache)
+    ingest_entities(conn, cursor, rows, PROVEEDORES_INSERT,
+                    ["numero", "nombre", "cuit", "contacto", "mail", "telefono"],
+                    {"categoria": "categoria_proveedores", "contribuyente": "tipo_contribuyentes",
+                     "razon": "razones_sociales", "ciudad": "ciudades"},
+                    cache, batch_size)
+    ingest_facts(conn, cursor, rows, "gastos", "id_proveedor", "proveedores", cache, batch_size, incremental)
+
+
+def ingest_donantes(conn, cursor, rows: list, cache: DimensionCache, batch_size: int = BATCH_SIZE,
+                    incremental: bool = False) -> None:
+    """Carga dimensiones, donantes e ingresos"""
+    # Manejar valores nulos en razon - asignar valor predeterminado
+    for row in rows:
+        if row.get("razon") is None:
+            row["razon"] = "Sin Razón Social"
+    load_dimensions(conn, cursor, rows, DONANTE_DIMENSIONS, cache)
+    ingest_entities(conn, cursor, rows, DONANTES_INSERT,
+                    ["numero", "nombre", "cuit", "contacto", "mail", "telefono", "activo"],
+                    {"frecuencia": "frecuencias", "contribuyente": "tipo_contribuyentes",
+                     "razon": "razones_sociales", "tipo": "tipo_donantes", "pais": "paises"},
+                    cache, batch_size)
+    ingest_facts(conn, cursor, rows, "ingresos", "id_donante", "donantes", cache, batch_size, incremental)
+
+
+def main(args=None) -> None:
+    """
+    Carga proveedores -> gastos y donantes -> ingresos desde data/cleaned
+
+    params
+    ------
+      * args: argparse.Namespace
+        - opciones de la linea de comandos (batch_size, incremental, reintentos)
+
+    returns:
+        - None
+    """
+    batch_size = getattr(args, "batch_size", BATCH_SIZE)
+    incremental = getattr(args, "incremental", False)
+    retries = getattr(args, "reintentos", RETRIES)
+
+    directorio = Path(__file__).resolve().parent.parent / "data" / "cleaned"
+    rows_proveedores = read_rows(find_clean_file(directorio, "proveedores-clean"))
+    rows_donantes = read_rows(find_clean_file(directorio, "donantes-clean"))
+    print(f"Proveedores: {len(rows_proveedores)} filas, donantes: {len(rows_donantes)} filas")
+
+    db_config = load_db_config()
+    conn = retry_call(lambda: connect(**db_config), retries=retries)
+    cursor = conn.cursor()
+    try:
+        cache = DimensionCache()
+        print("\n--- Proveedores ---")
+        ingest_proveedores(conn, cursor, rows_proveedores, cache, batch_size, incremental)
+        print("\n--- Donantes ---")
+        ingest_donantes(conn, cursor, rows_donantes, cache, batch_size, incremental)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingestion liviana de los archivos limpios (sin pandas)")
+    parser.add_argument("-b", "--batch-size", type=int, default=BATCH_SIZE,
+                        help="Filas por lote (default: %(default)s)")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="Cargar solo las transacciones cuyo hash no esta en la base")
+    parser.add_argument("--reintentos", type=int, default=RETRIES,
+                        help="Reintentos ante errores transitorios (default: %(default)s)")
+    main(parser.parse_args())
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """
 Main orchestration script for running the full ETL pipeline.
-This script runs all the necessary scripts in the correct order to process data and load it into the database.
+This script runs all the necessary stages in the correct order to process data and load it into the database.
+By default the stages run in this process as a DAG and hand DataFrames to each other in memory;
+--subprocess runs each script in its own interpreter, communicating through files as before.
 
 Order of execution:
 1. merge_data.py - Combina los datos crudos de distintos periodos
@@ -10,23 +12,64 @@ Order of execution:
 4. db-ingestion.py - Carga los datos limpios acorde al schema de la db previamente creada (_DATABASE/ddl.sql)
 
 Usage:
-  python main.py [--prod]
+  python main.py [--prod] [--format {parquet,feather,csv}] [--save] [--subprocess] [--workers 2]
+                 [--force] [--no-cache] [--cache-ingestion] [--cache-size 512] [--seed 42]
+                 [--politica-cuit {descartar,error}]
 
 Options:
   --prod: Use production environment (otherwise uses local environment)
+  --format: Intermediate storage format between stages (default: parquet)
+  --save: Also write the intermediate tables to data/merged and data/cleaned (in-process runner)
+  --subprocess: Run each stage script as a subprocess (the intermediate tables are always written)
+  --workers: Worker processes for stages that can run in parallel (default: 2)
+  --force: Ignore the stage cache and run every stage (the cache is still updated)
+  --no-cache: Do not use the stage cache at all
+  --cache-ingestion: Also skip the database load when its inputs did not change (off by default:
+                     a recreated or different database would be left empty)
+  --cache-size: Size limit of the stage cache in MB (default: 512)
+  --seed: Seed of the synthetic data generated by merge_data (default: 42)
+  --politica-cuit: What clean_donantes does with donors that share a CUIT with another one
+                   (default: PIPELINE_CUIT_POLITICA, or the default of pipeline/cuit.py)
 """
 
 import argparse
+import contextlib
+import graphlib
+import importlib.util
+import io
+import multiprocessing
 import os
+import queue
 import subprocess
 import sys
 import time
 from pathlib import Path
+from typing import Callable, NamedTuple
+from stage_cache import MAX_BYTES, StageCache
 
 def parse_arguments():
     """Parse command line arguments for the ETL pipeline."""
     parser = argparse.ArgumentParser(description="Run the ETL pipeline")
     parser.add_argument("--prod", action="store_true", help="Use production environment (otherwise uses local environment)")
+    parser.add_argument("--format", choices=("parquet", "feather", "csv"), default="parquet",
+                        help="Intermediate storage format between stages (parquet and feather keep dtypes)")
+    parser.add_argument("--save", action="store_true",
+                        help="Write the intermediate tables to disk when running in-process")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="Run each stage script in its own interpreter instead of in-process")
+    parser.add_argument("-w", "--workers", type=int, default=2,
+                        help="Worker processes for independent stages (1 runs them one after another)")
+    parser.add_argument("--force", action="store_true",
+                        help="Run every stage even if its inputs, code and parameters did not change")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the stage cache")
+    parser.add_argument("--cache-ingestion", action="store_true",
+                        help="Also reuse the cached database load (only if the database was not recreated since)")
+    parser.add_argument("--cache-size", type=int, default=MAX_BYTES // (1024 * 1024),
+                        help="Size limit of the stage cache in MB (least recently used entries are evicted)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Seed of the synthetic data generated by merge_data (same seed, same output)")
+    parser.add_argument("--politica-cuit", choices=("descartar", "error"),
+                        help="What to do with donors that share a CUIT with another one (the lowest number keeps it)")
     return parser.parse_args()
 
 def setup_environment(use_prod):
@@ -115,8 +158,253 @@ def run_script(script_path):
             print(f"Error output:\n{e.stderr}")
         return e.returncode
 
+def load_stage_module(script_path):
+    """Import a stage script as a module.
+
+    db-ingestion.py has a hyphen in its name, so it can't be imported with a plain import.
+    """
+    name = Path(script_path).stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class Stage(NamedTuple):
+    """A pipeline stage.
+    
+    func receives a dict with the results of its dependencies and returns its own result.
+    files and params are what its output depends on besides its dependencies (cache key).
+    A per_input stage is only re-run for the dependencies that changed: the names of the
+    ones it already processed arrive in inputs["unchanged"].
+    A stage that is not cached always runs (its key is still computed for its dependents).
+    """
+    deps: list
+    func: Callable
+    files: list = []
+    params: list = []
+    per_input: bool = False
+    cached: bool = True
+
+def build_stages(src_dir, save, cache_ingestion=False):
+    """Declare the pipeline stages as a DAG.
+    
+    Args:
+        src_dir: Path to the src directory
+        save: Boolean indicating whether to write the intermediate tables to disk
+        cache_ingestion: Boolean indicating whether the database load can be skipped from the cache
+    
+    Returns:
+        Dict of stage name -> Stage
+    """
+    pipeline_dir = src_dir / "pipeline"
+    data_dir = src_dir.parent / "data"
+    # The stage scripts import their sibling modules by name
+    sys.path.insert(0, str(pipeline_dir))
+    from storage import table_path, write_table
+    import fuentes
+    
+    merge_data = load_stage_module(pipeline_dir / "merge_data.py")
+    clean_donantes = load_stage_module(pipeline_dir / "clean_donantes.py")
+    clean_proveedores = load_stage_module(pipeline_dir / "clean_proveedores.py")
+    ingestion = load_stage_module(src_dir / "db-ingestion.py")
+    from db_pool import db_identity
+    
+    def merge_d(inputs):
+        df = merge_data.merge_donantes(data_dir / "raw")
+        if save:
+            write_table(df, table_path(data_dir / "merged", "donantes_final-merged"))
+        return df
+    
+    def merge_p(inputs):
+        df = merge_data.merge_proveedores(data_dir / "raw")
+        if save:
+            write_table(df, table_path(data_dir / "merged", "proveedores_final-merged"))
+        return df
+    
+    def clean_d(inputs):
+        reportes = {}
+        df = clean_donantes.clean_data(inputs["merge_donantes"], os.environ.get("PIPELINE_CUIT_POLITICA"), reportes)
+        if save:
+            clean_donantes.export_data(df, table_path(data_dir / "cleaned", "donantes-clean"))
+            clean_donantes.export_data(reportes["cuit"], table_path(data_dir / "cleaned", "donantes-cuit-reporte"))
+        return df
+    
+    def clean_p(inputs):
+        df = clean_proveedores.clean_data(inputs["merge_proveedores"])
+        if save:
+            clean_proveedores.export_data(df, table_path(data_dir / "cleaned", "proveedores-clean"))
+        return df
+    
+    def ingest(inputs):
+        # A branch that was already loaded goes in empty: only its dimensions are checked
+        unchanged = inputs.get("unchanged", set())
+        df_proveedores, df_donantes = inputs["clean_proveedores"], inputs["clean_donantes"]
+        if "clean_proveedores" in unchanged:
+            df_proveedores = df_proveedores.iloc[:0]
+        if "clean_donantes" in unchanged:
+            df_donantes = df_donantes.iloc[:0]
+        ingestion.main(datasets=(df_proveedores, df_donantes))
+    
+    merge_code = [pipeline_dir / name for name in ("merge_data.py", "importe.py", "fechas.py", "raw_sources.py", "categorias.py",
+                                                     "normalizacion.py", "normalizacion.json", "sintesis.py", "reconciliacion.py",
+                                                     "fuentes.py")]
+    ingestion_code = [src_dir / name for name in ("db-ingestion.py", "bulk_load.py", "dimension_cache.py",
+                                                  "fk_resolution.py", "db_pool.py", "incremental.py", "queries.py")]
+    params = [os.environ.get("PIPELINE_FORMATO"), os.environ.get("PIPELINE_SEMILLA"), save]
+    return {
+        "merge_donantes": Stage([], merge_d, merge_code + fuentes.discover("donantes", data_dir / "raw"), params),
+        "merge_proveedores": Stage([], merge_p, merge_code + fuentes.discover("proveedores", data_dir / "raw"), params),
+        "clean_donantes": Stage(["merge_donantes"], clean_d, [pipeline_dir / name for name in ("clean_donantes.py", "fechas.py", "categorias.py", "normalizacion.py", "normalizacion.json", "cuit.py")],
+                                params + [os.environ.get("PIPELINE_CUIT_POLITICA")]),
+        "clean_proveedores": Stage(["merge_proveedores"], clean_p, [pipeline_dir / name for name in ("clean_proveedores.py", "fechas.py", "categorias.py", "normalizacion.py", "normalizacion.json")], params),
+        # The cache only knows what this pipeline loaded, not what the database holds now:
+        # the load is skipped only on request, and the target database is part of the key
+        "ingestion": Stage(["clean_donantes", "clean_proveedores"], ingest, ingestion_code,
+                           [os.environ.get("USE_ENV_EXAMPLE"), *db_identity()], per_input=True, cached=cache_ingestion),
+    }
+
+# Stages built by build_stages, in this process and in every worker of the pool
+STAGES = {}
+
+def init_worker(src_dir, save):
+    """Build the stages once in each worker process of the pool."""
+    STAGES.update(build_stages(src_dir, save))
+
+def execute_stage(name, inputs, capture):
+    """Run one stage and turn how it ended into a return code.
+    
+    Args:
+        name: Name of the stage in STAGES
+        inputs: Dict with the results of its dependencies
+        capture: Boolean indicating whether to buffer the stage output instead of printing it
+    
+    Returns:
+        Tuple (return code, result, captured output, seconds)
+    """
+    func = STAGES[name].func
+    output = io.StringIO()
+    start_time = time.time()
+    code, result = 0, None
+    with contextlib.redirect_stdout(output) if capture else contextlib.nullcontext():
+        try:
+            result = func(inputs)
+        except SystemExit as e:
+            # Stages still exit with sys.exit on fatal errors
+            code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"\n❌ Error running {name}: {type(e).__name__}: {e}")
+            code = 1
+    return code, result, output.getvalue(), time.time() - start_time
+
+def print_header(name):
+    print(f"\n{'=' * 80}")
+    print(f"Running {name}...")
+    print(f"{'=' * 80}")
+
+def run_stages(stages, src_dir, save, workers=1, cache=None, force=False):
+    """Run the stages in dependency order, independent ones in parallel.
+    
+    Stages that become ready together (the donantes and proveedores branches) run in a
+    process pool and their output is printed grouped per stage when each one finishes.
+    A stage that runs alone runs in this process with live output. If a stage fails the
+    pool is terminated, so the other branch stops too.
+    
+    With a cache, a stage whose key is already stored is skipped and its previous
+    output is reused (only loaded from disk if a stage that needs it has to run).
+    
+    Args:
+        stages: Dict of stage name -> Stage, see build_stages
+        src_dir: Path to the src directory (to build the stages in the workers)
+        save: Boolean indicating whether to write the intermediate tables to disk
+        workers: Number of worker processes (1 runs every stage in this process)
+        cache: StageCache, or None to always run every stage
+        force: Boolean indicating whether to ignore the stored results (they are still updated)
+    
+    Returns:
+        The return code of the pipeline (0 for success)
+    """
+    STAGES.update(stages)
+    sorter = graphlib.TopologicalSorter({name: stage.deps for name, stage in stages.items()})
+    sorter.prepare()
+    results = {}
+    keys = {}
+    # Cached results not loaded yet: name -> key
+    lazy = {}
+    finished = queue.Queue()
+    pool = multiprocessing.Pool(workers, initializer=init_worker, initargs=(src_dir, save)) if workers > 1 else None
+    running = 0
+    
+    def inputs_of(name):
+        for dep in stages[name].deps:
+            if dep in lazy:
+                results[dep] = cache.load(lazy.pop(dep))
+        return {dep: results[dep] for dep in stages[name].deps}
+    
+    def input_key(name, dep):
+        return cache.key(f"{name}:{dep}", stages[name].files, stages[name].params, [keys[dep]])
+    
+    try:
+        while sorter.is_active():
+            ready = sorter.get_ready()
+            for name in ready:
+                stage = stages[name]
+                if cache is not None:
+                    keys[name] = cache.key(name, stage.files, stage.params, [keys[dep] for dep in stage.deps])
+                    if not force and stage.cached and cache.contains(keys[name]):
+                        cache.touch(keys[name])
+                        lazy[name] = keys[name]
+                        finished.put((name, 0, None, None, 0.0))
+                        running += 1
+                        continue
+                inputs = inputs_of(name)
+                if cache is not None and stage.per_input and stage.cached and not force:
+                    inputs["unchanged"] = {dep for dep in stage.deps if cache.contains(input_key(name, dep))}
+                if pool is None or (len(ready) == 1 and running == 0):
+                    # Nothing to overlap with: run here with live output
+                    print_header(name)
+                    finished.put((name, *execute_stage(name, inputs, capture=False)))
+                else:
+                    pool.apply_async(execute_stage, (name, inputs, True),
+                                     callback=lambda r, name=name: finished.put((name, *r)),
+                                     error_callback=lambda e, name=name: finished.put((name, 1, None, f"{e}\n", 0.0)))
+                running += 1
+            
+            name, code, result, output, execution_time = finished.get()
+            running -= 1
+            if output:
+                print_header(name)
+                print(output, end="")
+            if code != 0:
+                print(f"\n❌ {name} exited with code {code}")
+                return code
+            sorter.done(name)
+            
+            if name in lazy:
+                results[name] = None
+                print(f"\n⏭️  {name} unchanged, reusing cached output ({keys[name][:12]})")
+                continue
+            results[name] = result
+            if cache is not None and stages[name].cached:
+                cache.store(keys[name], name, result)
+                if stages[name].per_input:
+                    for dep in stages[name].deps:
+                        cache.store(input_key(name, dep), name, None)
+            
+            # Drop the DataFrames once every stage that needs them has run
+            for dep in stages[name].deps:
+                if all(other in results for other, stage in stages.items() if dep in stage.deps):
+                    results[dep] = None
+            
+            print(f"\n✅ {name} completed successfully in {execution_time:.2f} seconds")
+        return 0
+    finally:
+        if pool is not None:
+            # terminate also stops a branch still running after the other one failed
+            pool.terminate()
+            pool.join()
+
 def main():
-    """Main function to run all scripts in the correct order."""
+    """Main function to run all stages in the correct order."""
     # Parse command line arguments
     args = parse_arguments()
     
@@ -124,10 +412,29 @@ def main():
     use_prod = args.prod
     setup_environment(use_prod)
     
+    # Every stage reads and writes its intermediate tables in this format
+    os.environ["PIPELINE_FORMATO"] = args.format
+    os.environ["PIPELINE_SEMILLA"] = str(args.seed)
+    # clean_donantes reads the CUIT policy from the environment, in-process and as a subprocess
+    if args.politica_cuit:
+        os.environ["PIPELINE_CUIT_POLITICA"] = args.politica_cuit
+    
     # Get the current directory (src)
     src_dir = Path(__file__).parent.absolute()
     pipeline_dir = src_dir / "pipeline"
     
+    if not args.subprocess:
+        print("\n🚀 Starting ETL pipeline (in-process)")
+        start_time = time.time()
+        cache = None if args.no_cache else StageCache(src_dir.parent / ".cache" / "stages", args.cache_size * 1024 * 1024)
+        result = run_stages(build_stages(src_dir, args.save, args.cache_ingestion), src_dir, args.save, args.workers, cache, args.force)
+        if result != 0:
+            print("\n❌ ETL pipeline failed")
+            sys.exit(result)
+        total_time = time.time() - start_time
+        print(f"\n✨ ETL pipeline completed successfully in {total_time:.2f} seconds")
+        return
+    
     # Prepare script paths
     scripts = [
         pipeline_dir / "merge_data.py",
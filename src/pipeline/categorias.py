@@ -0,0 +1,34 @@
+"""Columnas de baja cardinalidad como categoricas: las correcciones de texto se aplican una vez por valor distinto."""
+import numpy as np
+import pandas as pd
+
+# Columnas categoricas, con los nombres crudos y los finales de cada etapa
+CATEGORICAS = [
+    "Tipo", "Frecuencia", "Tipo de Contribuyente", "Categoria Proveedor", "Ciudad",
+    "Pais", "País", "Razon Social", "Razón Social",
+    "tipo", "frecuencia", "contribuyente", "categoria", "ciudad", "pais", "razon",
+]
+
+
+def to_categorical(df: pd.DataFrame, cols: list = None) -> pd.DataFrame:
+    """Convierte a categoricas las columnas de cols (por defecto CATEGORICAS) que esten en df y no lo sean"""
+    for col in cols or CATEGORICAS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
+
+
+def map_categories(serie: pd.Series, func) -> pd.Series:
+    """
+    Aplica func (operaciones vectorizadas de Series, como .str) a las categorias
+    en lugar de a cada fila. Las categorias que quedan iguales se unen y las
+    que func convierte en NaN pasan a ser nulos
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype("category")
+    nuevas = func(pd.Series(serie.cat.categories, dtype=object))
+    codigos, categorias = pd.factorize(nuevas)
+    # Codigo viejo -> codigo nuevo; el -1 del final traduce los nulos (codigo -1)
+    traduccion = np.append(codigos, -1)
+    return pd.Series(pd.Categorical.from_codes(traduccion[serie.cat.codes.to_numpy()], categories=categorias),
+                     index=serie.index, name=serie.name)
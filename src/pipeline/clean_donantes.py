@@ -5,10 +5,15 @@ import argparse
 from pathlib import Path
 import pandas as pd
 import numpy as np
+from fechas import parse_fechas
+from categorias import to_categorical
+from cuit import POLITICA, POLITICAS, format_report, resolve_duplicates
+from normalizacion import normalize
+from storage import find_table, read_table, table_path, write_table
 
 def load_data(ruta_datos):
-    """Carga los datos de donantes desde un archivo CSV."""
-    df = pd.read_csv(ruta_datos)
+    """Carga los datos de donantes desde el archivo intermedio (parquet, feather o csv)."""
+    df = read_table(ruta_datos)
     print(f"Datos cargados con forma: {df.shape}")
     return df
 
@@ -31,18 +36,8 @@ def format_razon_social(df):
     # This approach fills nulls with real company names instead of a generic placeholder
     df['Razon Social'] = df['Razon Social'].ffill().bfill()
     
-    # Handle suffix standardization with regex pattern matching
-    # This will replace the suffixes when they appear at the end of company names
-    patterns = {
-        r'\bSRL\b': 'S.R.L',
-        r'\bSA\b': 'S.A',
-        r'\bSAS\b': 'S.A.S'
-    }
-    
-    for pattern, replacement in patterns.items():
-        df['Razon Social'] = df['Razon Social'].str.replace(pattern, replacement, regex=True)
-    
-    return df
+    # Sufijos SRL/SA/SAS -> S.R.L/S.A/S.A.S (reglas regex en normalizacion.json)
+    return normalize(df, "clean_donantes", ["Razon Social"])
 
 def fill_tipo(df):
     """Rellena valores nulos en la columna Tipo utilizando forward fill."""
@@ -52,27 +47,14 @@ def fill_tipo(df):
 
 def estandarizar_contribuyente(df):
     """Estandariza los valores en la columna Tipo de Contribuyente."""
-    tipoc = "Tipo de Contribuyente"
-    df_uc = unique_col(df, [tipoc])
-    cur = df_uc[tipoc][3]  # "IVA Responsable Inscripto"
-    rep = df_uc[tipoc][0]  # "Responsable Inscripto"
-    df[tipoc] = df[tipoc].str.replace(cur, rep)
-    return df
+    # "IVA Responsable Inscripto" -> "Responsable Inscripto", sin depender del orden de unique()
+    return normalize(df, "clean_donantes", ["Tipo de Contribuyente"])
 
-def handle_duplicates_cuit(df):
-    """Maneja duplicados en la columna CUIT modificando un valor específico."""
-    df2 = df.drop_duplicates(subset="Numero")
-    dup = df2[df2["CUIT"].duplicated()]
-    
-    if not dup.empty:
-        cui = dup["CUIT"].iloc[0]
-        # Reemplazar un 8 por un 0 en el CUIT en el índice 499
-        replaced_str = df.loc[499, "CUIT"].replace('8', '0')
-        # Verificar que no exista ya
-        if (df['CUIT'] == replaced_str).sum() == 0:
-            df.loc[499, "CUIT"] = replaced_str
-    
-    return df
+def handle_duplicates_cuit(df, politica=None):
+    """Deja un CUIT por donante (cuit es UNIQUE en la base) segun la politica y valida los digitos verificadores."""
+    df, reporte = resolve_duplicates(df, politica or POLITICA)
+    print(format_report(reporte))
+    return df, reporte
 
 def convert_data_types(df):
     """Convierte las columnas Fecha y Activo a los tipos de datos correctos."""
@@ -80,7 +62,7 @@ def convert_data_types(df):
     df.rename(columns={"Alta": "Fecha"}, inplace=True)
     
     # Convertir a datetime
-    df["Fecha"] = pd.to_datetime(df["Fecha"])
+    df["Fecha"] = parse_fechas(df["Fecha"])
     
     # Convertir Activo a booleano
     df["Activo"] = df["Activo"].str.upper().map({"SI": True, "NO": False})
@@ -120,11 +102,11 @@ def rename_final_columns(df):
     return df
 
 def export_data(df, ruta_salida):
-    """Exporta los datos limpios a un archivo CSV."""
+    """Exporta los datos limpios en el formato intermedio configurado."""
     # Asegurar que el directorio exista
     ruta_salida.parent.mkdir(parents=True, exist_ok=True)
     
-    df.to_csv(ruta_salida, index=False)
+    write_table(df, ruta_salida)
     print(f"Datos exportados a {ruta_salida}")
     return df
 
@@ -151,22 +133,13 @@ def verify_data(df):
     print("\nConteo de valores únicos por columna:")
     print(nunique_col(df))
 
-def main(args=None) -> None:
-    """Función principal que ejecuta la limpieza de datos de donantes."""
+def clean_data(df, politica_cuit=None, reportes=None):
+    """Aplica todos los pasos de limpieza a los datos de donantes en memoria (reportes recibe el reporte de CUITs)."""
     # Configurar semilla para reproducibilidad
     np.random.seed(42)
-    
-    # Configurar rutas
-    repo_root = Path(__file__).resolve().parent.parent.parent
-    
-    data_dir = repo_root / "data" / "merged"
-    
-    data_path = data_dir / "donantes_final-merged.csv"
-    
-    
-    # Cargar datos
-    print(f"Cargando datos desde {data_path}")
-    df = load_data(data_path)
+
+    # Columnas de baja cardinalidad como categoricas (el csv intermedio no las conserva)
+    df = to_categorical(df)
     
     # Limpiar datos
     print("Limpiando e imputando valores en Contacto...")
@@ -182,7 +155,9 @@ def main(args=None) -> None:
     df = estandarizar_contribuyente(df)
     
     print("Manejando duplicados en CUIT...")
-    df = handle_duplicates_cuit(df)
+    df, reporte_cuit = handle_duplicates_cuit(df, politica_cuit)
+    if reportes is not None:
+        reportes["cuit"] = reporte_cuit
     
     print("Convirtiendo tipos de datos...")
     df = convert_data_types(df)
@@ -192,23 +167,44 @@ def main(args=None) -> None:
     
     print("Renombrando columnas al formato final...")
     df_final = rename_final_columns(df_final)
+    return df_final
+
+def main(args=None) -> None:
+    """Función principal que ejecuta la limpieza de datos de donantes."""
+    # Configurar rutas
+    repo_root = Path(__file__).resolve().parent.parent.parent
+    
+    data_dir = repo_root / "data" / "merged"
+    
+    data_path = find_table(data_dir, "donantes_final-merged")
+    
+    
+    # Cargar datos
+    print(f"Cargando datos desde {data_path}")
+    df = load_data(data_path)
+    
+    reportes = {}
+    df_final = clean_data(df, args.politica_cuit if args else None, reportes)
     
     # Ruta de salida
     data_dir_out = repo_root / "data" / "cleaned"
-    data_clean_out = data_dir_out / "donantes-clean.csv"
+    data_clean_out = table_path(data_dir_out, "donantes-clean")
 
     # Exportar datos
     print("Exportando datos limpios...")
     df_exportado = export_data(df_final, data_clean_out)
+    export_data(reportes["cuit"], table_path(data_dir_out, "donantes-cuit-reporte"))
     
     # Verificar si se solicita
     if args and args.verificar:
         print("Verificando datos exportados...")
-        df_verificacion = pd.read_csv(data_clean_out)
+        df_verificacion = read_table(data_clean_out)
         verify_data(df_verificacion)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Limpieza de datos de donantes")
     parser.add_argument("-v", "--verificar", action="store_true", help="Verificar datos después de exportar")
+    parser.add_argument("--politica-cuit", choices=POLITICAS, default=POLITICA,
+                        help="Qué hacer con los donantes que comparten CUIT con otro (el de menor número lo conserva)")
     args = parser.parse_args()
     main(args)
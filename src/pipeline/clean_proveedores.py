@@ -4,19 +4,21 @@
 import argparse
 import os
 from pathlib import Path
-import pandas as pd
 import numpy as np
+from fechas import parse_fechas
+from categorias import to_categorical
+from normalizacion import normalize
+from storage import find_table, read_table, table_path, write_table
 
 def load_data(ruta_datos):
-    """Carga los datos de proveedores desde un archivo CSV."""
-    df = pd.read_csv(ruta_datos)
+    """Carga los datos de proveedores desde el archivo intermedio (parquet, feather o csv)."""
+    df = read_table(ruta_datos)
     print(f"Datos cargados con forma: {df.shape}")
     return df
 
 def clean_categorias(df):
     """Corrige errores en la columna Categoria Proveedor."""
-    df["Categoria Proveedor"] = df["Categoria Proveedor"].str.replace("Servicos", "Servicios")
-    return df
+    return normalize(df, "clean_proveedores", ["Categoria Proveedor"])
 
 def fix_provider_numbers(df):
     """Estandariza los números de proveedor reemplazando 'D' por 'P'."""
@@ -27,8 +29,7 @@ def fix_provider_numbers(df):
 def format_dates(df):
     """Convierte la columna Fecha a formato datetime estandarizado."""
     fc = "Fecha"
-    df[fc] = pd.to_datetime(df[fc], format='mixed', dayfirst=True).dt.strftime('%Y/%m/%d')
-    df[fc] = pd.to_datetime(df[fc])
+    df[fc] = parse_fechas(df[fc], dayfirst=True)
     return df
 
 def drop_unnecessary_columns(df):
@@ -51,8 +52,7 @@ def drop_unnecessary_columns(df):
 
 def standardize_razon_social(df):
     """Estandariza los nombres de razón social."""
-    df["Razon Social"] = df["Razon Social"].str.rstrip(".").str.replace("Sociedad Anónima", "S.A")
-    return df
+    return normalize(df, "clean_proveedores", ["Razon Social"])
 
 def rename_final_columns(df):
     """Renombra las columnas al formato final deseado."""
@@ -74,34 +74,21 @@ def rename_final_columns(df):
     return df
 
 def export_data(df, ruta_salida):
-    """Exporta los datos limpios a un archivo CSV."""
+    """Exporta los datos limpios en el formato intermedio configurado."""
     # Asegurar que el directorio exista
     ruta_salida.parent.mkdir(parents=True, exist_ok=True)
     
-    df.to_csv(ruta_salida, index=False)
+    write_table(df, ruta_salida)
     print(f"Datos exportados a {ruta_salida}")
     return df
 
-def main(args=None):
-    """Función principal que ejecuta la limpieza de datos de proveedores."""
+def clean_data(df):
+    """Aplica todos los pasos de limpieza a los datos de proveedores en memoria."""
     # Configurar semilla para reproducibilidad
     np.random.seed(42)
-    
-    # Configurar rutas
-    repo_root = Path(__file__).resolve().parent.parent.parent
-    
-    # Determinar rutas según argumentos
-    if args and args.test:
-        data_dir = repo_root / "data" / "test"
-    else:
-        data_dir = repo_root / "data" / "merged"
-    
-    data_path = data_dir / "proveedores_final-merged.csv"
-    
-    
-    # Cargar datos
-    print(f"Cargando datos desde {data_path}")
-    df = load_data(data_path)
+
+    # Columnas de baja cardinalidad como categoricas (el csv intermedio no las conserva)
+    df = to_categorical(df)
     
     # Limpiar datos
     print("Limpiando categorías de proveedores...")
@@ -121,10 +108,31 @@ def main(args=None):
     
     print("Renombrando columnas al formato final...")
     df = rename_final_columns(df)
+    return df
+
+def main(args=None):
+    """Función principal que ejecuta la limpieza de datos de proveedores."""
+    # Configurar rutas
+    repo_root = Path(__file__).resolve().parent.parent.parent
+    
+    # Determinar rutas según argumentos
+    if args and args.test:
+        data_dir = repo_root / "data" / "test"
+    else:
+        data_dir = repo_root / "data" / "merged"
+    
+    data_path = find_table(data_dir, "proveedores_final-merged")
+    
+    
+    # Cargar datos
+    print(f"Cargando datos desde {data_path}")
+    df = load_data(data_path)
+    
+    df = clean_data(df)
     
     # Ruta de salida
     data_dir_out = repo_root / "data" / "cleaned"
-    data_clean_out = data_dir_out / "proveedores-clean.csv"
+    data_clean_out = table_path(data_dir_out, "proveedores-clean")
 
     # Exportar datos
     print("Exportando datos limpios...")
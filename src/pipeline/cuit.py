@@ -0,0 +1,98 @@
+"""Validacion del digito verificador de CUIT y resolucion de CUITs compartidos entre entidades, vectorizadas sobre la columna."""
+import os
+import numpy as np
+import pandas as pd
+
+# Pesos del digito verificador (modulo 11) sobre los 10 primeros digitos
+PESOS = np.array([5, 4, 3, 2, 7, 6, 5, 4, 3, 2])
+# Que hacer con las entidades que comparten un CUIT con otra (la de menor numero lo conserva):
+#   descartar: sus filas se eliminan (quedan en el reporte para corregirlas en el origen)
+#   error: ValueError con el reporte
+# El CUIT nunca se reescribe: cualquier otro valor no seria un CUIT valido
+POLITICAS = ("descartar", "error")
+POLITICA = os.environ.get("PIPELINE_CUIT_POLITICA", "descartar")
+
+
+def cuit_digits(unicos: pd.Series) -> tuple:
+    """
+    Digitos de cada CUIT como matriz (n, 11) de enteros, sin guiones ni espacios
+
+    Devuelve (matriz, formato) donde formato indica los valores con exactamente 11 digitos
+    (las filas sin formato quedan en 0)
+    """
+    texto = unicos.astype(str).str.replace(r"[-\s]", "", regex=True)
+    formato = texto.str.fullmatch(r"\d{11}").to_numpy(dtype=bool)
+    digitos = np.zeros((len(texto), 11), dtype=np.int64)
+    if formato.any():
+        # Todos los CUITs con formato en un solo buffer ascii: digito = byte - "0"
+        bloque = "".join(texto[formato]).encode("ascii")
+        digitos[formato] = np.frombuffer(bloque, dtype=np.uint8).reshape(-1, 11) - ord("0")
+    return digitos, formato
+
+
+def valid_cuits(cuits: pd.Series) -> np.ndarray:
+    """Indica por fila si el CUIT tiene formato y digito verificador validos (se calcula una vez por valor distinto)"""
+    codes, unicos = pd.factorize(cuits)
+    digitos, formato = cuit_digits(pd.Series(unicos, dtype=object))
+    resto = digitos[:, :10] @ PESOS % 11
+    # Resto 0 -> digito 0; resto 1 daria 10, que no es un digito: el CUIT es invalido
+    verificador = np.where(resto == 0, 0, 11 - resto)
+    valido = formato & (resto != 1) & (verificador == digitos[:, 10])
+    return np.where(codes >= 0, valido[np.maximum(codes, 0)], False)
+
+
+def find_duplicates(df: pd.DataFrame, col: str = "CUIT", clave: str = "Numero") -> pd.DataFrame:
+    """
+    Pares (CUIT, entidad) de los CUITs que usa mas de una entidad
+
+    Las filas de df son transacciones: se deduplican los pares y se buscan los CUITs
+    repetidos con un group-by por hash. La entidad de menor numero conserva el CUIT
+    """
+    pares = df[[col, clave]].dropna().drop_duplicates()
+    compartidos = pares[pares.duplicated(subset=col, keep=False)].sort_values([col, clave])
+    compartidos["conserva"] = ~compartidos.duplicated(subset=col, keep="first")
+    return compartidos.reset_index(drop=True)
+
+
+def resolve_duplicates(df: pd.DataFrame, politica: str = None, col: str = "CUIT", clave: str = "Numero") -> tuple:
+    """
+    Deja un CUIT por entidad aplicando la politica (POLITICAS) y valida el digito verificador
+
+    Los CUITs invalidos se informan pero no se modifican (no hay forma de saber el correcto)
+    Devuelve (df, reporte) con una fila por par (CUIT, entidad) con problemas:
+    cuit, numero, motivo ("duplicado" o "invalido"), accion y cuit_final
+    """
+    politica = politica or POLITICA
+    if politica not in POLITICAS:
+        raise ValueError(f"Politica de CUIT invalida: {politica}. Opciones: {POLITICAS}")
+
+    invalidos = df.loc[~valid_cuits(df[col]), [col, clave]].drop_duplicates()
+    invalidos = invalidos.assign(motivo="invalido", accion="ninguna", cuit_final=invalidos[col])
+
+    duplicados = find_duplicates(df, col, clave)
+    otros = duplicados[~duplicados.pop("conserva")]
+    if politica == "error" and len(otros):
+        raise ValueError(f"{len(otros)} entidades comparten CUIT con otra: {otros[clave].tolist()}")
+
+    # Filas de las entidades que se descartan (join por el par CUIT, entidad)
+    filas = pd.MultiIndex.from_frame(df[[col, clave]].astype(object)).isin(
+        pd.MultiIndex.from_frame(otros[[col, clave]].astype(object)))
+    df = df[~filas].copy()
+    duplicados["cuit_final"] = duplicados[col].where(~duplicados.index.isin(otros.index))
+    duplicados["accion"] = np.where(duplicados.index.isin(otros.index), "descartado", "conserva")
+    duplicados["motivo"] = "duplicado"
+
+    columnas = [col, clave, "motivo", "accion", "cuit_final"]
+    reporte = pd.concat([duplicados[columnas], invalidos[columnas]], ignore_index=True)
+    reporte.columns = ["cuit", "numero", "motivo", "accion", "cuit_final"]
+    return df, reporte
+
+
+def format_report(reporte: pd.DataFrame) -> str:
+    """Resumen del reporte de CUITs para imprimir"""
+    duplicados = reporte[reporte["motivo"] == "duplicado"]
+    cambiados = duplicados[duplicados["accion"] != "conserva"]
+    invalidos = reporte[reporte["motivo"] == "invalido"]
+    return (f"CUITs compartidos: {duplicados['cuit'].nunique()} ({len(cambiados)} entidades resueltas: "
+            f"{', '.join(f'{n} -> {a}' for n, a in zip(cambiados['numero'], cambiados['accion'])) or 'ninguna'})\n"
+            f"Entidades con CUIT de formato o digito verificador invalido: {len(invalidos)} (no se modifican)")
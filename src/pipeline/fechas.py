@@ -0,0 +1,60 @@
+"""Parseo de fechas por formato detectado ("18/03/2024", "2/6/24/", "2024-03-18")."""
+import pandas as pd
+
+# Formatos presentes en los datos crudos: (patron del texto normalizado, formato dia primero, formato mes primero)
+FORMATOS = [
+    (r"\d{4}-\d{1,2}-\d{1,2}", "%Y-%m-%d", "%Y-%m-%d"),
+    (r"\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{2}:\d{2}", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S"),
+    (r"\d{4}/\d{1,2}/\d{1,2}", "%Y/%m/%d", "%Y/%m/%d"),
+    (r"\d{1,2}/\d{1,2}/\d{4}", "%d/%m/%Y", "%m/%d/%Y"),
+    (r"\d{1,2}/\d{1,2}/\d{2}", "%d/%m/%y", "%m/%d/%y"),
+]
+
+
+def normalize(texto: pd.Series) -> pd.Series:
+    """Saca espacios y la barra final de las fechas viejas de proveedores ("2/6/24/" -> "2/6/24")"""
+    return texto.str.strip().str.rstrip("/")
+
+
+def parse_fechas(serie: pd.Series, dayfirst: bool = True, errors: str = "coerce") -> pd.Series:
+    """Convierte una columna de fechas a datetime64 parseando cada valor unico una sola vez.
+
+    Los valores se agrupan por formato y cada grupo se parsea con un formato fijo
+    (sin el fallback por elemento de format='mixed'). Los valores que no coinciden
+    con ningun formato se informan y quedan en NaT con errors="coerce" o levantan
+    ValueError con errors="raise".
+    """
+    if errors not in ("coerce", "raise"):
+        raise ValueError(f"errors invalido: {errors}. Opciones: ('coerce', 'raise')")
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+
+    codes, uniques = pd.factorize(serie)
+    unicos = pd.Series(uniques, dtype=object)
+    fechas = pd.Series(pd.NaT, index=unicos.index, dtype="datetime64[ns]")
+
+    # Fechas que ya vienen como datetime (columnas de excel con algun texto mezclado)
+    es_texto = unicos.map(lambda x: isinstance(x, str))
+    if (~es_texto).any():
+        fechas[~es_texto] = pd.to_datetime(unicos[~es_texto], errors="coerce")
+
+    texto = normalize(unicos[es_texto].astype(str))
+    pendientes = pd.Series(True, index=texto.index)
+    for patron, formato_dia, formato_mes in FORMATOS:
+        grupo = pendientes & texto.str.fullmatch(patron)
+        if grupo.any():
+            formato = formato_dia if dayfirst else formato_mes
+            fechas[grupo[grupo].index] = pd.to_datetime(texto[grupo], format=formato, errors="coerce")
+            pendientes &= ~grupo
+
+    invalidos = unicos[es_texto][fechas[es_texto].isna()]
+    if len(invalidos):
+        n_filas = int(pd.Series(codes).isin(invalidos.index).sum())
+        ejemplos = invalidos.head(5).tolist()
+        if errors == "raise":
+            raise ValueError(f"Fechas con formato invalido: {ejemplos}")
+        print(f"Fechas no reconocidas convertidas a NaT: {n_filas} filas (ej: {ejemplos})")
+
+    # codes == -1 son los nulos, toman el NaT agregado al final
+    valores = pd.concat([fechas, pd.Series([pd.NaT], dtype="datetime64[ns]")], ignore_index=True)
+    return pd.Series(valores.to_numpy()[codes], index=serie.index, name=serie.name)
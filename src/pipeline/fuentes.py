@@ -0,0 +1,106 @@
+"""Registro de fuentes crudas: descubre los extractos por patron, unifica sus variantes de columnas y los parsea en paralelo."""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+import pandas as pd
+from raw_sources import read_csv, read_excel
+
+# Con menos bytes crudos que esto se parsea en serie: levantar el pool (pandas en cada worker) cuesta mas
+PARALELO_MIN_BYTES = int(os.environ.get("PIPELINE_PARALELO_MIN_BYTES", 8 << 20))
+
+
+class Fuente(NamedTuple):
+    patrones: tuple
+    # Variante de columna -> nombre que espera merge_data
+    alias: dict
+    # Variante del extracto -> columnas que la identifican (la primera que coincide gana)
+    variantes: dict
+    # Hoja de los xlsx
+    hoja: str
+
+
+FUENTES = {
+    "proveedores": Fuente(
+        patrones=("proveedores*.csv", "proveedores*.xlsx"),
+        alias={"Categor/a Proveedor": "Categoria Proveedor",
+               "Categoría Proveedor": "Categoria Proveedor",
+               "Numero Proveedor": "Número Proveedor",
+               "Correo Electronico": "Correo Electrónico",
+               "Telefono": "Teléfono",
+               "Razon Social": "Razón Social"},
+        variantes={"nuevo": ["Ciudad", "Pais"], "viejo": []},
+        hoja="Proveedores",
+    ),
+    "donantes": Fuente(
+        patrones=("donantes*.csv", "donantes*.xlsx"),
+        alias={"Número": "Numero",
+               "Correo Electronico": "Correo Electrónico",
+               "Teléfono": "Telefono",
+               "Pais": "País",
+               "Fecha_Donacion": "Fecha_Donación"},
+        variantes={"nuevo": ["Fecha_Donación"], "viejo": ["Mes"]},
+        hoja="Donantes",
+    ),
+}
+
+
+def discover(entidad: str, data_path: Path) -> list:
+    """Extractos crudos de la entidad en data_path, ordenados por nombre"""
+    archivos = {path for patron in FUENTES[entidad].patrones for path in Path(data_path).glob(patron)}
+    return sorted(archivos)
+
+
+def parse_source(path: Path, entidad: str) -> pd.DataFrame:
+    """Parsea un extracto y renombra sus variantes de columnas a los nombres de merge_data"""
+    fuente = FUENTES[entidad]
+    path = Path(path)
+    df = read_excel(path, sheet_name=fuente.hoja) if path.suffix == ".xlsx" else read_csv(path)
+    return df.rename(columns=fuente.alias)
+
+
+def sniff_variant(df: pd.DataFrame, entidad: str, nombre: str = "") -> str:
+    """Variante del extracto segun sus columnas (ya renombradas)"""
+    for variante, columnas in FUENTES[entidad].variantes.items():
+        if set(columnas) <= set(df.columns):
+            return variante
+    raise ValueError(f"{nombre}: columnas que no corresponden a ninguna variante de {entidad}")
+
+
+def _workers(archivos: list, workers: int = None) -> int:
+    """Procesos para parsear: 1 si son pocos bytes o si ya estamos en un worker de main.py (daemon, sin hijos)"""
+    if multiprocessing.current_process().daemon:
+        return 1
+    if workers is None:
+        if sum(path.stat().st_size for path in archivos) < PARALELO_MIN_BYTES:
+            return 1
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, len(archivos)))
+
+
+def load_entity(entidad: str, data_path: Path, workers: int = None) -> dict:
+    """
+    Descubre, parsea y concatena los extractos de una entidad
+
+    Devuelve {variante: DataFrame}, con los extractos de cada variante concatenados en orden de nombre
+    """
+    archivos = discover(entidad, data_path)
+    if not archivos:
+        raise FileNotFoundError(f"No hay extractos de {entidad} en {data_path} ({', '.join(FUENTES[entidad].patrones)})")
+
+    procesos = _workers(archivos, workers)
+    if procesos > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            frames = list(executor.map(parse_source, archivos, [entidad] * len(archivos)))
+    else:
+        frames = [parse_source(path, entidad) for path in archivos]
+
+    por_variante = {variante: [] for variante in FUENTES[entidad].variantes}
+    for path, df in zip(archivos, frames):
+        por_variante[sniff_variant(df, entidad, path.name)].append(df)
+    for variante, dfs in por_variante.items():
+        if not dfs:
+            raise FileNotFoundError(f"No hay extractos {variante}s de {entidad} en {data_path}")
+    return {variante: dfs[0] if len(dfs) == 1 else pd.concat(dfs, ignore_index=True)
+            for variante, dfs in por_variante.items()}
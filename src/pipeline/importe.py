@@ -0,0 +1,147 @@
+"""Parseo vectorizado de importes en formato argentino ("$10.164,00", "66.227,00")."""
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+
+# Filas por bloque: los arrays de estado de un bloque entran en cache
+BLOQUE = 65_536
+# Largo maximo de un importe en texto, los mas largos se consideran invalidos
+MAX_ANCHO = 32
+# Digitos significativos que entran sin perder precision en un float64
+MAX_DIGITOS = 15
+
+DIGITO_0, DIGITO_9 = ord("0"), ord("9")
+PUNTO, COMA, PESOS, MENOS, ESPACIO = ord("."), ord(","), ord("$"), ord("-"), ord(" ")
+# Estados del automata de _parse_bloque
+PREFIJO, ENTERO, DECIMAL, SUFIJO = 0, 1, 2, 3
+
+
+def _to_bytes(texto: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Pasa los textos a un array ASCII de ancho fijo. Devuelve (bytes, textos demasiado largos)"""
+    try:
+        b = texto.to_numpy(dtype=object).astype("S")
+    except UnicodeEncodeError:
+        # Espacios duros de excel; cualquier otro caracter no ASCII queda como '?' y la fila es invalida
+        b = texto.str.replace("\xa0", " ").str.encode("ascii", errors="replace").to_numpy(dtype=object).astype("S")
+    largos = np.zeros(len(b), dtype=bool)
+    if b.dtype.itemsize > MAX_ANCHO:
+        largos = np.char.str_len(b) > MAX_ANCHO
+        b = b.astype(f"S{MAX_ANCHO}")
+    return b, largos
+
+
+def _parse_bloque(b: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parsea un bloque de importes ASCII de ancho fijo.
+
+    Recorre los textos caracter por caracter con un automata (prefijo -> entero ->
+    decimales -> sufijo) aplicado a todas las filas a la vez: cada paso trabaja sobre
+    la columna de bytes de una posicion, asi el costo es O(ancho) operaciones de numpy.
+
+    Devuelve (digitos como entero con signo, cantidad de decimales, filas validas).
+    """
+    n, ancho = len(b), b.dtype.itemsize
+    columnas = np.ascontiguousarray(b.view(np.uint8).reshape(n, ancho).T)
+    estado = np.full(n, PREFIJO, dtype=np.int8)
+    grupo = np.zeros(n, dtype=np.int8)  # digitos desde el ultimo separador de miles
+    decimales = np.zeros(n, dtype=np.int8)
+    digitos = np.zeros(n, dtype=np.int8)
+    valor = np.zeros(n, dtype=np.int64)
+    hay_punto = np.zeros(n, dtype=bool)
+    hay_pesos = np.zeros(n, dtype=bool)
+    negativo = np.zeros(n, dtype=bool)
+    invalido = np.zeros(n, dtype=bool)
+
+    for c in columnas:
+        digito = c - DIGITO_0  # uint8: lo que no es digito da la vuelta y queda >= 10
+        es_digito = digito < 10
+        es_punto, es_coma, es_pesos, es_menos = c == PUNTO, c == COMA, c == PESOS, c == MENOS
+        blanco = (c == ESPACIO) | (c == 0)
+        prefijo, entero, decimal = estado == PREFIJO, estado == ENTERO, estado == DECIMAL
+
+        # Prefijo: espacios, un $ y un - antes del primer digito
+        invalido |= prefijo & ~(blanco | es_digito | es_pesos | es_menos)
+        invalido |= prefijo & ((es_pesos & hay_pesos) | (es_menos & negativo))
+        hay_pesos |= prefijo & es_pesos
+        negativo |= prefijo & es_menos
+
+        # Entero: el primer grupo de miles tiene 1 a 3 digitos y los siguientes exactamente 3
+        cierra = entero & ~es_digito
+        invalido |= cierra & ~(es_punto | es_coma | blanco)
+        invalido |= cierra & ((es_punto & ~hay_punto & (grupo > 3)) | (hay_punto & (grupo != 3)))
+        hay_punto |= entero & es_punto
+        grupo[entero & es_punto] = 0
+
+        # Decimales: al menos uno y solo digitos hasta el final
+        invalido |= decimal & ~(es_digito | blanco)
+        invalido |= decimal & blanco & (decimales == 0)
+        # Sufijo: solo espacios
+        invalido |= (estado == SUFIJO) & ~blanco
+
+        suma = es_digito & (estado != SUFIJO)
+        valor = np.where(suma, valor * 10 + digito, valor)
+        digitos += suma
+        grupo += suma & ~decimal
+        decimales += suma & decimal
+
+        estado[prefijo & es_digito] = ENTERO
+        estado[entero & es_coma] = DECIMAL
+        estado[(entero | decimal) & blanco] = SUFIJO
+
+    # Textos que llenan todo el ancho terminan sin pasar al sufijo
+    invalido |= estado == PREFIJO
+    invalido |= (estado == ENTERO) & hay_punto & (grupo != 3)
+    invalido |= (estado == DECIMAL) & (decimales == 0)
+    invalido |= digitos > MAX_DIGITOS
+    valor = np.where(negativo, -valor, valor)
+    return valor, decimales, ~invalido
+
+
+def parse_importe(serie: pd.Series, errors: str = "coerce", decimal: bool = False) -> pd.Series:
+    """Convierte una columna de importes a float64 (o Decimal) sin recorrerla en Python.
+
+    Los valores que ya son numericos se conservan. Los textos que no respetan el formato
+    se informan y quedan en NaN con errors="coerce" o levantan ValueError con errors="raise".
+    """
+    if errors not in ("coerce", "raise"):
+        raise ValueError(f"errors invalido: {errors}. Opciones: ('coerce', 'raise')")
+    if pd.api.types.is_numeric_dtype(serie):
+        if not decimal:
+            return serie.astype("float64")
+        return serie.map(lambda x: Decimal(str(x)), na_action="ignore").astype(object).where(serie.notna(), None)
+
+    # Columna mixta (por ejemplo numeros de excel y textos): los numeros se conservan
+    if pd.api.types.infer_dtype(serie, skipna=True) == "string":
+        es_texto = serie.notna().to_numpy()
+    else:
+        es_texto = serie.map(lambda x: isinstance(x, str)).to_numpy()
+    es_numero = serie.notna().to_numpy() & ~es_texto
+
+    texto = serie[es_texto]
+    b, largos = _to_bytes(texto)
+    valor = np.zeros(len(b), dtype=np.int64)
+    decimales = np.zeros(len(b), dtype=np.int64)
+    validos = np.zeros(len(b), dtype=bool)
+    for start in range(0, len(b), BLOQUE):
+        bloque = slice(start, start + BLOQUE)
+        valor[bloque], decimales[bloque], validos[bloque] = _parse_bloque(b[bloque])
+    validos &= ~largos
+
+    invalidos = texto[~validos]
+    if len(invalidos):
+        ejemplos = invalidos.head(5).tolist()
+        if errors == "raise":
+            raise ValueError(f"Importes con formato invalido: {ejemplos}")
+        print(f"Importes con formato invalido convertidos a NaN: {len(invalidos)} (ej: {ejemplos})")
+
+    if decimal:
+        resultado = pd.Series(None, index=serie.index, name=serie.name, dtype=object)
+        resultado[es_texto] = [Decimal(int(v)).scaleb(-int(d)) if ok else None
+                               for v, d, ok in zip(valor, decimales, validos)]
+        resultado[es_numero] = serie[es_numero].map(lambda x: Decimal(str(x)))
+        return resultado
+
+    resultado = pd.Series(np.nan, index=serie.index, name=serie.name, dtype="float64")
+    # La division de dos enteros exactos da el float mas cercano, igual que parsear el texto
+    resultado[es_texto] = np.where(validos, valor / 10.0 ** decimales, np.nan)
+    resultado[es_numero] = serie[es_numero].astype("float64")
+    return resultado
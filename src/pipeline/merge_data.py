@@ -1,31 +1,48 @@
-import os
-from argparse import ArgumentParser
-import re
+import argparse
 from pathlib import Path
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import random
 import warnings
+from importe import parse_importe
+from fechas import parse_fechas
+from raw_sources import file_fingerprint
+from fuentes import FUENTES, discover, load_entity, parse_source, sniff_variant
+from categorias import to_categorical
+from normalizacion import normalize
+from sintesis import SEMILLA, Synthesizer
+from reconciliacion import format_stats, reconcile
+from particiones import (folded_entry, load_manifest, partition_keys, read_partitions, record_file,
+                         remove_dataset, save_manifest, write_partitions)
+from storage import FORMATOS, resolve_format, table_path, write_table
 warnings.simplefilter(action="ignore", category=FutureWarning)
 
-# Function to load data
-def load_data(data_path):
-    """Load data from CSV and Excel files."""
-    data_prov_old = data_path / "proveedores-old.csv"
-    data_donan_old = data_path / "donantes-old.xlsx"
-    data_prov = data_path / "proveedores-new.csv"
-    data_donan = data_path / "donantes-new.csv"
+# Tabla -> (nombre en data/merged, columna que define la particion, columnas que identifican
+# una transaccion junto con la fecha: numero, importe y cuenta)
+TABLAS = {
+    "proveedores": ("proveedores_final-merged", "Fecha", ["Numero Proveedor", "Importe", "Nro_Cuenta"]),
+    "donantes": ("donantes_final-merged", "Alta", ["Numero", "Importe", "Nro de Cuenta"]),
+}
 
-    # old
-    dfpo = pd.read_csv(data_prov_old)
-    dfdo = pd.read_excel(data_donan_old, sheet_name="Donantes")
-    # new
-    dfpn = pd.read_csv(data_prov)
-    dfdn = pd.read_csv(data_donan)
+MESES = {
+    1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril', 5: 'Mayo', 6: 'Junio',
+    7: 'Julio', 8: 'Agosto', 9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
+}
 
-    print(f"Proveedores\ndfpo: {dfpo.shape}\ndfpn: {dfpn.shape}\n\nDonantes\ndfdo: {dfdo.shape}\ndfdn: {dfdn.shape}")
-    return dfpo, dfdo, dfpn, dfdn
+# Function to load data
+def load_proveedores(data_path, workers=None):
+    """Load every old and new format provider extract in data_path (see fuentes.FUENTES)."""
+    extractos = load_entity("proveedores", data_path, workers)
+    dfpo, dfpn = extractos["viejo"], extractos["nuevo"]
+    print(f"Proveedores\ndfpo: {dfpo.shape}\ndfpn: {dfpn.shape}")
+    return dfpo, dfpn
+
+
+def load_donantes(data_path, workers=None):
+    """Load every old and new format donor extract in data_path (xlsx sheets from the raw cache when unchanged)."""
+    extractos = load_entity("donantes", data_path, workers)
+    dfdo, dfdn = extractos["viejo"], extractos["nuevo"]
+    print(f"Donantes\ndfdo: {dfdo.shape}\ndfdn: {dfdn.shape}")
+    return dfdo, dfdn
 
 
 # Function to clean provider data
@@ -36,13 +53,8 @@ def clean_providers_data(dfpn):
         df = df.drop(["Observaciones"], axis=1)
         df.rename(columns={"Categor/a Proveedor": "Categoria Proveedor"}, inplace=True)
 
-        cols_lower = ["Categoria Proveedor", "Tipo de Contribuyente"]
-        df[cols_lower] = df[cols_lower].apply(lambda x: x.str.capitalize())
-
-        cl = "Categoria Proveedor"
-        df[cl] = df[cl].str.replace("/", "i").str.replace("Materiiales", "Materiales")
-
-        df["Tipo de Contribuyente"] = df["Tipo de Contribuyente"].str.replace("/", "i")
+        # Categoria Proveedor y Tipo de Contribuyente (reglas en normalizacion.json)
+        df = normalize(df, "proveedores_nuevos")
         df["Teléfono"] = df["Teléfono"].str.replace("AR", "")
         return df
 
@@ -54,188 +66,228 @@ def clean_providers_data(dfpn):
 def clean_donors_data(dfdo, dfdn):
     dfdo_bk = dfdo.copy()
     dfdo.drop(["Mes", "Cargo"], axis=1, inplace=True)
-    dfdn.drop("Cargo", axis=1, inplace=True)
 
     col = "Razon Social"
-    dfdo[col] = dfdo[col].replace("-", np.nan)
-    dfdn[col] = dfdn[col].replace("-", np.nan)
+    dfdo = normalize(dfdo, "donantes_merge", [col])
     
     # Fill null values with values from adjacent rows (forward fill then backward fill)
     # This approach fills nulls with real company names instead of a generic placeholder
     dfdo[col] = dfdo[col].ffill().bfill()
-    dfdn[col] = dfdn[col].ffill().bfill()
 
-    dfdo["Importe"] = dfdo["Importe"].apply(lambda x: f"{x:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-    dfdn["Importe"] = dfdn["Importe"].apply(clean_importe)
-    dfdn["Importe"] = dfdn["Importe"].apply(lambda x: f"{x:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+    return dfdo, clean_new_donors(dfdn)
 
-    return dfdo, dfdn
 
+def clean_new_donors(dfdn):
+    """Limpieza de un extracto con el formato de donantes-new.csv (tambien la usa el modo incremental)"""
+    dfdn = dfdn.drop("Cargo", axis=1)
 
-# Function to transform data
-def transform_data(dfpn_clean, dfpo):
-    ciudad_pd = dfpn_clean["Ciudad"].value_counts().reset_index()
-    ciudad_pd["Probabilidad"] = ciudad_pd["count"] / ciudad_pd["count"].sum()
+    col = "Razon Social"
+    dfdn = normalize(dfdn, "donantes_merge", [col])
+    dfdn[col] = dfdn[col].ffill().bfill()
 
-    ciudades = ciudad_pd["Ciudad"]
-    proba = ciudad_pd["Probabilidad"]
-    size = 150
-    ciudad_sample = np.random.choice(ciudades, size=size, p=proba)
+    # Importe queda numerico: el excel ya trae numeros y el csv se parsea directo a float64
+    dfdn["Importe"] = parse_importe(dfdn["Importe"])
+    return dfdn
 
-    ciudad_col = pd.Series(ciudad_sample)
-    columns = ["Pais", "Maps"]
-    cantidad = dfpo.shape[0]
-    new_cols = dfpn_clean[columns][:cantidad]
 
-    dfp_copy = dfpo.copy()
-    dfp_copy["Ciudad"] = ciudad_col
-    dfp_merge = pd.concat([dfp_copy, new_cols], axis=1)
+# Function to transform data
+def transform_data(dfpn_clean, dfpo, synth: Synthesizer):
+    dfpo = normalize(dfpo.copy(), "proveedores_viejos")
 
-    dfp_merge["Categoria Proveedor"] = dfp_merge["Categoria Proveedor"].apply(lambda x: x.capitalize())
-    dfpmerge_final = pd.concat([dfpn_clean, dfp_merge], ignore_index=True)
+    # Join por Numero Proveedor / CUIT con el extracto nuevo (gana el nuevo), sin alinear por posicion
+    dfpmerge_final, stats = reconcile(dfpn_clean, dfpo, synth)
+    print(format_stats(stats))
 
-    return dfpmerge_final
+    # concat de categoricas con distintas categorias da object: se vuelven a convertir
+    return to_categorical(dfpmerge_final)
 
 
 # Function to merge donor data
-def merge_donor_data(dfdo, dfdn):
+def merge_donor_data(dfdo, dfdn, synth: Synthesizer):
     sample_size = dfdo.shape[0]
-    paises = sample_dist(dfdn, "País", sample_size)
+    paises = synth.sample(dfdn, "País", sample_size)
     dfdo["Pais"] = paises
 
-    dfdn["Baja"] = pd.to_datetime(dfdn["Baja"], errors='coerce')
-    dfdn["Alta"] = pd.to_datetime(dfdn["Alta"], errors='coerce', format='mixed')
+    # Las fechas crudas son dia/mes/año ("23/12/2018"), cada formato se parsea una sola vez
+    dfdn["Baja"] = parse_fechas(dfdn["Baja"])
+    dfdn["Alta"] = parse_fechas(dfdn["Alta"])
 
     fecha_min = dfdn["Baja"].min()
     fecha_max = dfdn["Baja"].max()
 
-    n_fechas = dfdo[~dfdo["Baja"].isna()]["Baja"].count()
-
-    def random_fecha(start, end):
-        intervalo_fecha = (end - start).days
-        rand = random.randint(0, intervalo_fecha)
-        fecha = start + pd.to_timedelta(rand, unit='d')
-        return fecha
+    # Las bajas existentes se reemplazan por fechas aleatorias del rango de las nuevas, en un solo sorteo
+    con_baja = dfdo["Baja"].notna().to_numpy()
+    baja = np.full(len(dfdo), np.datetime64("NaT"), dtype="datetime64[ns]")
+    baja[con_baja] = synth.dates(fecha_min, fecha_max, int(con_baja.sum())).to_numpy()
+    dfdo["Baja"] = baja
 
-    fechas_random = [random_fecha(fecha_min, fecha_max) for _ in range(n_fechas)]
-    dfdo.loc[dfdo["Baja"].notna(), "Baja"] = fechas_random
-    dfdo["Baja"] = pd.to_datetime(dfdo["Baja"], errors='coerce')
-
-    donacion_sample = sample_dist(dfdn, "Fecha_Donación", dfdo.shape[0])
+    donacion_sample = synth.sample(dfdn, "Fecha_Donación", dfdo.shape[0])
     sample_dona = pd.DataFrame(donacion_sample, columns=["Fecha_Donación"])
     donaciones_fecha = pd.concat([dfdn["Fecha_Donación"], sample_dona["Fecha_Donación"]], ignore_index=True)
-    donaciones_fecha = pd.to_datetime(donaciones_fecha, format='mixed')
+    donaciones_fecha = parse_fechas(donaciones_fecha)
 
     dfdo.rename(columns={"Número": "Numero",
                           "Teléfono": "Telefono",
                           "Pais": "País"}, inplace=True)
 
     dfdn_trim = dfdn.drop(["Fecha_Donación"], axis=1)
-    dfd_final = pd.concat([dfdo, dfdn_trim], ignore_index=True)
-
-    meses = {
-        1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril', 5: 'Mayo', 6: 'Junio',
-        7: 'Julio', 8: 'Agosto', 9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
-    }
+    dfd_final = to_categorical(pd.concat([dfdo, dfdn_trim], ignore_index=True))
 
-    dfd_final["Mes"] = dfd_final["Alta"].dt.month.map(meses)
+    dfd_final["Mes"] = dfd_final["Alta"].dt.month.map(MESES)
 
     return dfd_final, donaciones_fecha
 
 
 # Function to export data
 def export_data(dfd_final, dfp_final, path):
-    if not os.path.exists(path):
-        os.makedirs(path)
-
-    donantes = "donantes_final-merged.csv"
-    proveedores = "proveedores_final-merged.csv"
-
-    dfd_final.to_csv(os.path.join(path, donantes), index=False)
-    dfp_final.to_csv(os.path.join(path, proveedores), index=False)
-
-
-# Function to clean importe
-def clean_importe(importe):
-    importe_cleaned = re.sub(r'[^\d,]', '', importe)
-    importe_cleaned = importe_cleaned.replace('.', '')
-    importe_cleaned = importe_cleaned.replace(',', '.')
-    return float(importe_cleaned)
-
-
-# Function to sample distribution
-def sample_dist(df: pd.DataFrame,
-                 column: str,
-                   size: int) -> np.array:
-
-    dist = df[column].value_counts().reset_index()
-    dist["Probabilidad"] = dist["count"] / dist["count"].sum()
-    sample = dist[column]
-    proba = dist["Probabilidad"]
-    size = size
-    final_sample = np.random.choice(sample, size=size, p=proba)
-    return final_sample
-
-def final_renaming(dfd: pd.DataFrame, dfp: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Formato intermedio segun PIPELINE_FORMATO (parquet por defecto, conserva los dtypes)
+    write_table(dfd_final, table_path(path, "donantes_final-merged"))
+    write_table(dfp_final, table_path(path, "proveedores_final-merged"))
+    # Los archivos unicos reemplazan al dataset particionado, si habia uno
+    remove_dataset(path, [nombre for nombre, _, _ in TABLAS.values()])
+
+
+def partition_dates(df: pd.DataFrame, tabla: str) -> pd.Series:
+    """Fecha que define la particion de cada fila (Fecha de proveedores sigue cruda en merged)"""
+    return parse_fechas(df[TABLAS[tabla][1]], dayfirst=True)
+
+
+def transaction_keys(df: pd.DataFrame, tabla: str) -> pd.DataFrame:
+    """Clave de cada transaccion: numero, importe, cuenta y fecha, con tipos comparables entre partes"""
+    numero, importe, cuenta = TABLAS[tabla][2]
+    return pd.DataFrame({
+        "numero": df[numero].astype(str).to_numpy(),
+        "importe": pd.to_numeric(df[importe], errors="coerce").round(2).to_numpy(),
+        "cuenta": pd.to_numeric(df[cuenta], errors="coerce").to_numpy(),
+        "fecha": partition_dates(df, tabla).to_numpy(),
+    })
+
+
+def export_partitioned(dfd_final, dfp_final, path, data_path, formato: str = None):
+    """
+    Reconstruye data/merged como datasets particionados por año/mes de la fecha
+    (Fecha de proveedores, Alta de donantes) y registra los crudos en el manifiesto
+    """
+    formato = resolve_format(formato)
+    remove_dataset(path, [nombre for nombre, _, _ in TABLAS.values()])
+    manifiesto = {"formato": formato, "tablas": {}, "archivos": {}}
+    for tabla, df in (("donantes", dfd_final), ("proveedores", dfp_final)):
+        nombre = TABLAS[tabla][0]
+        # Los archivos unicos quedarian antes que el dataset en find_table
+        for extension in FORMATOS.values():
+            (Path(path) / f"{nombre}{extension}").unlink(missing_ok=True)
+        particiones = write_partitions(df, partition_dates(df, tabla), Path(path) / nombre, "base", formato)
+        manifiesto["tablas"][tabla] = {"nombre": nombre, "columnas": df.columns.tolist()}
+        for crudo in discover(tabla, data_path):
+            record_file(manifiesto, crudo.name, file_fingerprint(crudo), tabla, None, particiones)
+        print(f"{nombre}: {len(df)} filas en {len(particiones)} particiones")
+    save_manifest(path, manifiesto)
+
+
+def extract_table(extracto: Path) -> str:
+    """Tabla de un extracto crudo segun su nombre (proveedores-2025-01.csv, donantes-2025-01.csv)"""
+    for tabla, fuente in FUENTES.items():
+        if any(extracto.match(patron) for patron in fuente.patrones):
+            return tabla
+    raise ValueError(f"No se puede inferir la tabla de {extracto.name}; indicarla con --tabla")
+
+
+def load_extract(extracto: Path, tabla: str) -> pd.DataFrame:
+    """Parsea un extracto del modo incremental: tiene que ser de la variante nueva (el viejo no trae los atributos)"""
+    df = parse_source(extracto, tabla)
+    if sniff_variant(df, tabla, extracto.name) != "nuevo":
+        raise ValueError(f"{extracto.name}: el modo incremental solo acepta extractos con el formato nuevo de {tabla}")
+    return df
+
+
+def merge_proveedores_extract(extracto: Path) -> pd.DataFrame:
+    """Combina un extracto con el formato de proveedores-new.csv, sin el historico"""
+    dfp = clean_providers_data(load_extract(extracto, "proveedores"))
+    dfp["Maps"] = None
+    dfp = rename_proveedores(dfp)
+    dfp["Importe"] = parse_importe(dfp["Importe"])
+    return dfp
+
+
+def merge_donantes_extract(extracto: Path) -> pd.DataFrame:
+    """Combina un extracto con el formato de donantes-new.csv, sin el historico"""
+    dfd = clean_new_donors(load_extract(extracto, "donantes"))
+    dfd["Baja"] = parse_fechas(dfd["Baja"])
+    dfd["Alta"] = parse_fechas(dfd["Alta"])
+    dfd = rename_donantes(dfd.drop(["Fecha_Donación"], axis=1))
+    dfd["Mes"] = dfd["Alta"].dt.month.map(MESES)
+    return dfd
+
+
+def merge_extract(extracto: Path, path: Path, tabla: str = None) -> int:
+    """
+    Agrega un extracto crudo nuevo al dataset particionado de path procesando solo ese delta
+
+    - Los extractos que ya estan en el manifiesto (mismo nombre o mismo contenido) se omiten
+    - Las transacciones que ya estan en el dataset se descartan; solo se leen las
+      particiones de los meses que trae el extracto, no el historico
+    - Cada particion tocada recibe un archivo part-<sha256 del extracto>; el manifiesto
+      se escribe al final, asi que un corte a mitad de camino se reintenta sin duplicar
+
+    Devuelve las filas agregadas
+    """
+    manifiesto = load_manifest(path)
+    if not manifiesto:
+        raise FileNotFoundError(f"No hay dataset particionado en {path}; crearlo con merge_data.py --particionado")
+    tabla = tabla or extract_table(extracto)
+    sha256 = file_fingerprint(extracto)
+    if folded_entry(manifiesto, extracto.name, sha256) is not None:
+        print(f"{extracto.name}: ya incorporado, se omite")
+        return 0
+
+    nombre = TABLAS[tabla][0]
+    merge_extracto = merge_proveedores_extract if tabla == "proveedores" else merge_donantes_extract
+    delta = merge_extracto(extracto).reindex(columns=manifiesto["tablas"][tabla]["columnas"])
+    parte = sha256[:12]
+
+    fechas = partition_dates(delta, tabla)
+    existentes = read_partitions(Path(path) / nombre, partition_keys(fechas).unique().tolist(), excluir=parte)
+    repetidas = np.zeros(len(delta), dtype=bool)
+    if len(existentes):
+        claves = transaction_keys(existentes, tabla).drop_duplicates()
+        repetidas = transaction_keys(delta, tabla).merge(claves, how="left", indicator=True)["_merge"].eq("both").to_numpy()
+    delta = to_categorical(delta[~repetidas].copy())
+
+    particiones = write_partitions(delta, fechas[~repetidas], Path(path) / nombre, parte, manifiesto["formato"])
+    record_file(manifiesto, extracto.name, sha256, tabla, len(delta), particiones, descartadas=int(repetidas.sum()))
+    save_manifest(path, manifiesto)
+    print(f"{extracto.name}: {len(delta)} filas agregadas a {nombre} en {len(particiones)} particiones, "
+          f"{int(repetidas.sum())} descartadas por estar en el dataset")
+    return len(delta)
+
+
+def rename_proveedores(dfp: pd.DataFrame) -> pd.DataFrame:
     # Last minute cleaning and casting
-    tipo_c = "Tipo de Contribuyente"
-    categoria = "Categoria Proveedor"
-    dfp[categoria] = dfp[categoria].str.replace("Servicos", "Servicios")
-    dfp[tipo_c] = dfp[tipo_c].str.replace("Responsable inscriito", "Responsable inscripto")
-    dfp[tipo_c] = dfp[tipo_c].str.replace("Iva responsable", "Responsable inscripto")
-    dfp[tipo_c] = dfp[tipo_c].str.replace("Responsabile inscripto", "Responsable inscripto")
-    dfp[tipo_c] = dfp[tipo_c].apply(lambda x: x.capitalize())
+    dfp = normalize(dfp, "proveedores_merge")
 
     dfp.rename(columns={"Número Proveedor": "Numero Proveedor",
                         "Correo Electrónico": "Corre Electronico",
                         "Razón Social": "Razon Social",
                         "Teléfono": "Telefono"},
                inplace=True)
+    return dfp
+
+def rename_donantes(dfd: pd.DataFrame) -> pd.DataFrame:
     dfd.rename(columns={"País": "Pais",
                         "Correo Electrónico": "Correo Electronico"},
                inplace=True)
-    return dfd, dfp
-
-def importe_to_numeric(dfd: pd.DataFrame, dfp: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
-
-    # Convert Importe to numeric
-    def to_numeric_importe(importe):
-        # Remove any non-numeric characters (except for commas)
-        importe_cleaned = importe.replace('.', '')  # Remove thousands separator
-        importe_cleaned = importe_cleaned.replace(',', '.')  # Replace decimal comma with a dot
-        return importe_cleaned
-
-    # Apply the cleaning function
-    dfd['Importe'] = dfd['Importe'].apply(to_numeric_importe)
-    dfp['Importe'] = dfp['Importe'].apply(to_numeric_importe)
-
-    # Convert to numeric
-    dfd['Importe'] = pd.to_numeric(dfd['Importe'], errors='coerce')
-    dfp['Importe'] = pd.to_numeric(dfp['Importe'], errors='coerce')
-
-    return dfd, dfp
-
-def main() -> None:
-
-    # Set the root path
-    # this file/pipeline/src/root
-    root_path = Path(__file__).resolve().parent.parent.parent
-    
-    # for final data
-    final_data_path = root_path / "data" / "merged"
+    return dfd
 
-    # Load data from data/raw
-    data_path = root_path / "data" / "raw"
-    dfpo, dfdo, dfpn, dfdn = load_data(data_path)
+def merge_proveedores(data_path: Path, seed: int = SEMILLA) -> pd.DataFrame:
+    """Combina los proveedores crudos de data_path sin escribirlos (seed fija los datos sintetizados)"""
+    synth = Synthesizer(seed)
+    dfpo, dfpn = load_proveedores(data_path)
 
     # Clean provider data
     dfpn_clean = clean_providers_data(dfpn)
 
-    # Clean donor data
-    dfdo, dfdn = clean_donors_data(dfdo, dfdn)
-
     # Transform data
-    dfpmerge_final = transform_data(dfpn_clean, dfpo)
+    dfpmerge_final = transform_data(dfpn_clean, dfpo, synth)
 
     # Note: We've removed the retrieve_coordinates function that was using the Nominatim API
     # to avoid timeouts and unnecessary API calls. The Maps column will remain as is
@@ -244,19 +296,62 @@ def main() -> None:
     # Set Maps column to None (it will be removed during cleaning)
     dfpmerge_final["Maps"] = None
 
+    # Final cleanup and renaming
+    dfp_final = rename_proveedores(dfpmerge_final.copy())
+
+    # Convert Importe to numeric ("$10.164,00" / "66.227,00" -> 10164.0 / 66227.0)
+    dfp_final["Importe"] = parse_importe(dfp_final["Importe"])
+    return dfp_final
+
+def merge_donantes(data_path: Path, seed: int = SEMILLA) -> pd.DataFrame:
+    """Combina los donantes crudos de data_path sin escribirlos (seed fija los datos sintetizados)"""
+    synth = Synthesizer(seed)
+    dfdo, dfdn = load_donantes(data_path)
+
+    # Clean donor data
+    dfdo, dfdn = clean_donors_data(dfdo, dfdn)
+
     # Merge donor data
-    dfd_final, donaciones_fecha = merge_donor_data(dfdo, dfdn)
+    dfd_final, donaciones_fecha = merge_donor_data(dfdo, dfdn, synth)
 
-    # Final cleanup and renaming
-    dfp_final = dfpmerge_final.copy()
+    # Final renaming and numeric conversion
+    dfd_final = rename_donantes(dfd_final)
+    dfd_final["Importe"] = parse_importe(dfd_final["Importe"])
+    return dfd_final
+
+def merge(data_path: Path, seed: int = SEMILLA) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Combina los datos crudos de data_path. Devuelve (donantes, proveedores) sin escribirlos"""
+    return merge_donantes(data_path, seed), merge_proveedores(data_path, seed)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Combina los datos crudos de data/raw en data/merged")
+    parser.add_argument("--particionado", action="store_true",
+                        help="Reconstruir data/merged como datasets particionados por año/mes con manifiesto")
+    parser.add_argument("--incremental", nargs="+", type=Path, metavar="EXTRACTO",
+                        help="Agregar solo estos extractos crudos nuevos al dataset particionado")
+    parser.add_argument("--tabla", choices=list(TABLAS),
+                        help="Tabla de los extractos de --incremental (por defecto se infiere del nombre)")
+    args = parser.parse_args()
+
+    # Set the root path
+    # this file/pipeline/src/root
+    root_path = Path(__file__).resolve().parent.parent.parent
+    
+    # for final data
+    final_data_path = root_path / "data" / "merged"
 
-    dfd_final, dfp_final = final_renaming(dfd_final, dfp_final)
+    if args.incremental:
+        for extracto in args.incremental:
+            merge_extract(extracto, final_data_path, args.tabla)
+        return
 
-    # Last numeric conversion
-    dfd_final, dfp_final = importe_to_numeric(dfd_final, dfp_final)
+    dfd_final, dfp_final = merge(root_path / "data" / "raw")
 
     # Export data
-    export_data(dfd_final, dfp_final, final_data_path)
+    if args.particionado:
+        export_partitioned(dfd_final, dfp_final, final_data_path, root_path / "data" / "raw")
+    else:
+        export_data(dfd_final, dfp_final, final_data_path)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
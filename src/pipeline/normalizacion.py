@@ -0,0 +1,98 @@
+"""Reglas de normalizacion de texto (normalizacion.json): cada columna se corrige con un solo lookup sobre sus valores distintos."""
+import argparse
+import json
+import re
+import sys
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+import pandas as pd
+from categorias import map_categories
+
+REGLAS = Path(__file__).resolve().parent / "normalizacion.json"
+
+
+def _operacion(regla: dict):
+    """Convierte una regla del json en una funcion str -> str (o None para anular el valor)"""
+    op = regla["op"]
+    if op == "capitalize":
+        return str.capitalize
+    if op == "replace":
+        return lambda valor: valor.replace(regla["old"], regla["new"])
+    if op == "regex":
+        patron = re.compile(regla["pattern"])
+        return lambda valor: patron.sub(regla["new"], valor)
+    if op == "rstrip":
+        return lambda valor: valor.rstrip(regla["chars"])
+    if op == "map":
+        return lambda valor: regla["values"].get(valor, valor)
+    raise ValueError(f"Operacion de normalizacion desconocida: {op}")
+
+
+def compile_rules(reglas: list):
+    """Compone las reglas de una columna en una sola funcion que se aplica a cada valor distinto"""
+    operaciones = [_operacion(regla) for regla in reglas]
+
+    def normalizar(valor):
+        for operacion in operaciones:
+            # Las reglas son de texto: los valores anulados o no string quedan como estan
+            if not isinstance(valor, str):
+                break
+            valor = operacion(valor)
+        return valor
+
+    return normalizar
+
+
+@lru_cache(maxsize=None)
+def load_rules(path: Path = REGLAS) -> dict:
+    """Lee el json de reglas y compila cada columna: {seccion: {columna: funcion}}"""
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    return {seccion: {col: compile_rules(reglas) for col, reglas in columnas.items()}
+            for seccion, columnas in config.items()}
+
+
+def normalize(df: pd.DataFrame, seccion: str, cols: list = None, path: Path = REGLAS) -> pd.DataFrame:
+    """Aplica las reglas de una seccion a las columnas cols (por defecto todas las de la seccion)"""
+    reglas = load_rules(path)[seccion]
+    for col in cols or reglas:
+        normalizar = reglas[col]
+        df[col] = map_categories(df[col], lambda valores: valores.map({valor: normalizar(valor) for valor in valores}))
+    return df
+
+
+def verify(repo_root: Path) -> bool:
+    """Limpia data/merged y compara el resultado (csv) con data/cleaned, el resultado de referencia"""
+    import clean_donantes
+    import clean_proveedores
+
+    ok = True
+    for modulo, entrada, salida in ((clean_donantes, "donantes_final-merged", "donantes-clean"),
+                                    (clean_proveedores, "proveedores_final-merged", "proveedores-clean")):
+        df = modulo.clean_data(pd.read_csv(repo_root / "data" / "merged" / f"{entrada}.csv"))
+        with tempfile.TemporaryDirectory() as tmp:
+            generado = Path(tmp) / f"{salida}.csv"
+            df.to_csv(generado, index=False)
+            nuevas = generado.read_text(encoding="utf-8").splitlines()
+        esperadas = (repo_root / "data" / "cleaned" / f"{salida}.csv").read_text(encoding="utf-8").splitlines()
+        distintas = [n for n, (a, b) in enumerate(zip(nuevas, esperadas), start=1) if a != b]
+        if len(nuevas) != len(esperadas):
+            distintas.append(min(len(nuevas), len(esperadas)) + 1)
+        if distintas:
+            ok = False
+            print(f"{salida}: {len(distintas)} lineas distintas (primera: {distintas[0]})")
+        else:
+            print(f"{salida}: igual a data/cleaned")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reglas de normalizacion de texto")
+    parser.add_argument("--verificar", action="store_true",
+                        help="Limpiar data/merged y comparar con data/cleaned (sale con 1 si difieren)")
+    args = parser.parse_args()
+    if args.verificar:
+        sys.exit(0 if verify(Path(__file__).resolve().parent.parent.parent) else 1)
+    for seccion, columnas in load_rules().items():
+        print(f"{seccion}: {', '.join(columnas)}")
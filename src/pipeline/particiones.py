@@ -0,0 +1,98 @@
+"""Dataset particionado de data/merged (anio=AAAA/mes=MM) y manifiesto de los extractos crudos ya incorporados."""
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+import pandas as pd
+from storage import FORMATOS, dataset_files, read_table, resolve_format, write_table
+
+MANIFIESTO = "manifiesto.json"
+# Particion de las filas sin fecha
+SIN_FECHA = "anio=sin_fecha/mes=sin_fecha"
+
+
+def partition_keys(fechas: pd.Series) -> pd.Series:
+    """Particion de cada fila segun su fecha: "anio=2024/mes=03" (SIN_FECHA si es nula)"""
+    claves = ("anio=" + fechas.dt.year.astype("Int64").astype(str).str.zfill(4)
+              + "/mes=" + fechas.dt.month.astype("Int64").astype(str).str.zfill(2))
+    return claves.where(fechas.notna(), SIN_FECHA)
+
+
+def write_partitions(df: pd.DataFrame, fechas: pd.Series, directorio: Path, parte: str, formato: str = None) -> list:
+    """
+    Escribe cada particion de df como <directorio>/anio=AAAA/mes=MM/part-<parte>
+
+    Las particiones existentes se conservan: cada extracto agrega su propio archivo,
+    y reescribir la misma parte (reintento despues de un corte) la reemplaza
+    Devuelve las particiones escritas
+    """
+    claves = partition_keys(fechas)
+    particiones = []
+    for clave, indice in claves.groupby(claves.to_numpy(), sort=True).groups.items():
+        path = Path(directorio) / clave / f"part-{parte}{FORMATOS[resolve_format(formato)]}"
+        write_table(df.loc[indice], path)
+        particiones.append(clave)
+    return particiones
+
+
+def read_partitions(directorio: Path, particiones: list, excluir: str = None) -> pd.DataFrame:
+    """Lee solo las particiones pedidas (sin la parte excluir): el costo depende de los meses tocados, no del historico"""
+    archivos = [path for path in dataset_files(directorio, particiones) if path.stem != f"part-{excluir}"]
+    if not archivos:
+        return pd.DataFrame()
+    return pd.concat([read_table(path) for path in archivos], ignore_index=True)
+
+
+def load_manifest(directorio: Path) -> dict:
+    """Manifiesto del dataset ({} si todavia no se escribio uno)"""
+    path = Path(directorio) / MANIFIESTO
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_manifest(directorio: Path, manifiesto: dict) -> None:
+    """Escribe el manifiesto de forma atomica (un corte no deja un json a medias)"""
+    path = Path(directorio) / MANIFIESTO
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifiesto, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
+def folded_entry(manifiesto: dict, nombre: str, sha256: str):
+    """
+    Entrada del manifiesto de un extracto ya incorporado (por nombre o por contenido), None si es nuevo
+
+    Un archivo con el mismo nombre y otro contenido es un error: el dataset ya tiene la version anterior
+    """
+    archivos = manifiesto.get("archivos", {})
+    if nombre in archivos:
+        if archivos[nombre]["sha256"] != sha256:
+            raise ValueError(f"{nombre} ya fue incorporado con otro contenido; "
+                             "reconstruir el dataset con merge_data.py --particionado")
+        return archivos[nombre]
+    for entrada in archivos.values():
+        if entrada["sha256"] == sha256:
+            return entrada
+    return None
+
+
+def record_file(manifiesto: dict, nombre: str, sha256: str, tabla: str, filas: int, particiones: list, **extra) -> dict:
+    """Agrega un extracto incorporado al manifiesto"""
+    manifiesto.setdefault("archivos", {})[nombre] = {
+        "sha256": sha256,
+        "tabla": tabla,
+        "filas": filas,
+        "particiones": particiones,
+        "incorporado": datetime.now().isoformat(timespec="seconds"),
+        **extra,
+    }
+    return manifiesto
+
+
+def remove_dataset(directorio: Path, nombres: list) -> None:
+    """Borra los datasets particionados y el manifiesto (antes de reconstruir o de volver a archivos unicos)"""
+    for nombre in nombres:
+        shutil.rmtree(Path(directorio) / nombre, ignore_errors=True)
+    (Path(directorio) / MANIFIESTO).unlink(missing_ok=True)
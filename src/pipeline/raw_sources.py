@@ -0,0 +1,100 @@
+"""Lectura de los archivos crudos: cada hoja de un xlsx se parsea una vez y se guarda en un cache columnar."""
+import importlib.util
+import json
+import os
+import sys
+import time
+from pathlib import Path
+import pandas as pd
+
+# La huella de los archivos es la misma que usa la ingestion (src/incremental.py)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from incremental import file_fingerprint
+
+# Cache de las hojas parseadas (PIPELINE_RAW_CACHE="" lo desactiva)
+CACHE_DIR = os.environ.get("PIPELINE_RAW_CACHE", str(Path(__file__).resolve().parent.parent.parent / ".cache" / "raw"))
+
+
+def excel_engine() -> str:
+    """Motor para leer xlsx: calamine (mucho mas rapido) si esta instalado y pandas lo soporta, si no openpyxl"""
+    version = tuple(int(parte) for parte in pd.__version__.split(".")[:2])
+    if version >= (2, 2) and importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    return "openpyxl"
+
+
+def _cache_paths(cache_dir: Path, path: Path, sheet_name: str) -> tuple:
+    """Rutas de la metadata y base (sin extension) de los datos de una hoja en el cache"""
+    base = f"{Path(cache_dir) / path.stem}-{sheet_name}"
+    return Path(f"{base}.json"), base
+
+
+def _read_cached(meta_path: Path, path: Path, engine: str):
+    """Hoja cacheada si sigue valida: mismo tamaño y mtime o, si cambio el mtime, mismo contenido"""
+    if not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text())
+    datos = meta_path.with_name(meta["archivo"])
+    stat = path.stat()
+    if meta["engine"] != engine or meta["size"] != stat.st_size or not datos.exists():
+        return None
+    if meta["mtime_ns"] != stat.st_mtime_ns:
+        # El archivo se toco (copia, checkout) pero puede tener el mismo contenido
+        if meta["sha256"] != file_fingerprint(path):
+            return None
+        meta["mtime_ns"] = stat.st_mtime_ns
+        meta_path.write_text(json.dumps(meta))
+    if datos.suffix == ".parquet":
+        return pd.read_parquet(datos)
+    return pd.read_pickle(datos)
+
+
+def _write_cached(df: pd.DataFrame, meta_path: Path, base: str, path: Path, engine: str) -> None:
+    """Guarda la hoja en parquet (pickle si pyarrow no esta o la hoja tiene columnas de tipos mezclados)"""
+    meta_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(f"{base}.tmp")
+    datos = None
+    if importlib.util.find_spec("pyarrow") is not None:
+        import pyarrow as pa
+
+        try:
+            df.to_parquet(tmp, index=False)
+            datos = Path(f"{base}.parquet")
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    if datos is None:
+        df.to_pickle(tmp)
+        datos = Path(f"{base}.pkl")
+    os.replace(tmp, datos)
+    stat = path.stat()
+    meta = {"fuente": path.name, "archivo": datos.name, "engine": engine, "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns, "sha256": file_fingerprint(path)}
+    # La metadata va ultima: sin ella la entrada no se usa
+    meta_path.write_text(json.dumps(meta))
+
+
+def read_excel(path: Path, sheet_name: str, cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    """Lee una hoja de un xlsx desde el cache o, si el archivo cambio, parseandolo y actualizando el cache"""
+    path = Path(path)
+    engine = excel_engine()
+    start = time.perf_counter()
+    if cache_dir:
+        meta_path, base = _cache_paths(cache_dir, path, sheet_name)
+        df = _read_cached(meta_path, path, engine)
+        if df is not None:
+            print(f"{path.name} [{sheet_name}]: cache {time.perf_counter() - start:.2f}s")
+            return df
+    df = pd.read_excel(path, sheet_name=sheet_name, engine=engine)
+    parseo = time.perf_counter() - start
+    if cache_dir:
+        _write_cached(df, meta_path, base, path, engine)
+    print(f"{path.name} [{sheet_name}]: {engine} {parseo:.2f}s")
+    return df
+
+
+def read_csv(path: Path) -> pd.DataFrame:
+    """Lee un csv crudo informando el tiempo de lectura"""
+    start = time.perf_counter()
+    df = pd.read_csv(path)
+    print(f"{Path(path).name}: csv {time.perf_counter() - start:.2f}s")
+    return df
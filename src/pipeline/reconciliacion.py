@@ -0,0 +1,127 @@
+"""Conciliacion de los extractos viejo y nuevo de proveedores con joins por clave (Numero Proveedor y CUIT)."""
+import pandas as pd
+from importe import parse_importe
+from fechas import parse_fechas
+from sintesis import Synthesizer
+
+CLAVE = "Número Proveedor"
+CUIT = "CUIT"
+# Columnas de la transaccion; el resto son atributos del proveedor
+TRANSACCION = ["Importe", "Fecha", "Nro_Cuenta"]
+# Atributos que el extracto viejo no trae: se sintetizan para los proveedores que no estan en el nuevo
+SINTETIZADOS = ["Ciudad", "Pais"]
+
+
+def _cuits_unicos(df: pd.DataFrame) -> pd.Index:
+    """CUITs que identifican a un solo proveedor en el extracto (los compartidos no sirven de clave)"""
+    proveedores = df.groupby(CUIT, observed=True)[CLAVE].nunique()
+    return proveedores.index[proveedores == 1]
+
+
+def match_providers(nuevos: pd.DataFrame, viejos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Proveedor del extracto nuevo que corresponde a cada proveedor del viejo:
+    primero por Numero Proveedor y, si no coincide, por CUIT
+
+    Devuelve un DataFrame indexado por el numero viejo con las columnas
+    numero (el del extracto nuevo, NA si no hay) y criterio ("numero", "cuit" o None)
+    """
+    proveedores_v = viejos.drop_duplicates(subset=CLAVE).set_index(CLAVE)
+    numeros_n = pd.Index(nuevos[CLAVE].unique())
+    por_numero = proveedores_v.index.isin(numeros_n)
+
+    cuits = _cuits_unicos(nuevos).intersection(_cuits_unicos(viejos))
+    cuit_a_numero = nuevos[nuevos[CUIT].isin(cuits)].drop_duplicates(subset=CUIT).set_index(CUIT)[CLAVE]
+    por_cuit = ~por_numero & proveedores_v[CUIT].isin(cuits).to_numpy()
+
+    numero = pd.Series(pd.NA, index=proveedores_v.index, dtype=object)
+    numero[por_numero] = proveedores_v.index[por_numero]
+    numero[por_cuit] = proveedores_v.loc[por_cuit, CUIT].astype(object).map(cuit_a_numero).to_numpy()
+    criterio = pd.Series(None, index=proveedores_v.index, dtype=object)
+    criterio[por_numero] = "numero"
+    criterio[por_cuit] = "cuit"
+    return pd.DataFrame({"numero": numero, "criterio": criterio})
+
+
+def _transaction_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """Clave de cada transaccion con fecha e importe ya parseados (los extractos usan formatos distintos)"""
+    return pd.DataFrame({
+        "numero": df[CLAVE].astype(object).to_numpy(),
+        "fecha": parse_fechas(df["Fecha"], dayfirst=True).to_numpy(),
+        "importe": parse_importe(df["Importe"]).round(2).to_numpy(),
+        "cuenta": pd.to_numeric(df["Nro_Cuenta"], errors="coerce").to_numpy(),
+    })
+
+
+def reconcile(nuevos: pd.DataFrame, viejos: pd.DataFrame, synth: Synthesizer) -> tuple:
+    """
+    Une los extractos de proveedores. Precedencia: el extracto nuevo gana
+
+    - Los proveedores viejos que coinciden con uno nuevo (por numero o CUIT) toman
+      el numero y todos los atributos del nuevo; los que difieren son conflictos
+    - Los que solo estan en el viejo se agregan y sus atributos sintetizados
+      (Ciudad, Pais) se muestrean una vez por proveedor
+    - Las transacciones del viejo que ya estan en el nuevo (mismo proveedor, fecha,
+      importe y cuenta) se descartan
+
+    Devuelve (DataFrame con las filas nuevas y luego las viejas, estadisticas)
+    """
+    viejos = viejos.copy()
+    atributos = [col for col in nuevos.columns if col not in TRANSACCION and col != CLAVE]
+    for col in atributos:
+        if col not in viejos.columns:
+            viejos[col] = pd.NA
+
+    matches = match_providers(nuevos, viejos)
+    coinciden = matches["numero"].notna()
+    proveedores_n = nuevos.drop_duplicates(subset=CLAVE).set_index(CLAVE)[atributos]
+
+    # Conflictos: proveedores que coinciden pero con algun atributo distinto (sin contar los que el viejo no trae)
+    comparables = [col for col in atributos if col not in SINTETIZADOS and viejos[col].notna().any()]
+    previos = viejos.drop_duplicates(subset=CLAVE).set_index(CLAVE).loc[coinciden[coinciden].index, comparables]
+    actuales = proveedores_n.loc[matches.loc[coinciden, "numero"], comparables].set_axis(previos.index)
+    conflictos = int((previos.astype(object).fillna("") != actuales.astype(object).fillna("")).any(axis=1).sum())
+
+    # Numero y atributos del proveedor nuevo para las filas que coinciden (hash join por numero)
+    numero_nuevo = viejos[CLAVE].map(matches["numero"])
+    filas = numero_nuevo.notna().to_numpy()
+    valores = proveedores_n.reindex(numero_nuevo[filas].to_numpy())
+    viejos[CLAVE] = viejos[CLAVE].astype(object).where(~filas, numero_nuevo)
+    for col in atributos:
+        columna = viejos[col].astype(object)
+        columna[filas] = valores[col].astype(object).to_numpy()
+        viejos[col] = columna
+
+    # Atributos sintetizados de los proveedores que solo estan en el viejo: uno por proveedor
+    solo_viejos = matches.index[~coinciden]
+    for col in SINTETIZADOS:
+        if col in atributos:
+            muestra = pd.Series(synth.sample(nuevos, col, len(solo_viejos)), index=solo_viejos)
+            viejos.loc[~filas, col] = viejos.loc[~filas, CLAVE].map(muestra).to_numpy()
+
+    # Transacciones repetidas entre extractos (hash join sobre la clave de transaccion)
+    # merge toma NaN == NaN: las claves con partes nulas no se comparan (nunca son repetidas)
+    claves_n = _transaction_keys(nuevos).dropna().drop_duplicates()
+    claves_v = _transaction_keys(viejos)
+    repetidas = (claves_v.notna().all(axis=1).to_numpy()
+                 & claves_v.merge(claves_n, how="left", indicator=True)["_merge"].eq("both").to_numpy())
+    viejos = viejos[~repetidas]
+
+    stats = {
+        "por_numero": int((matches["criterio"] == "numero").sum()),
+        "por_cuit": int((matches["criterio"] == "cuit").sum()),
+        "solo_viejos": len(solo_viejos),
+        "conflictos": conflictos,
+        "transacciones_nuevas": len(nuevos),
+        "transacciones_viejas": len(viejos),
+        "repetidas": int(repetidas.sum()),
+    }
+    return pd.concat([nuevos, viejos[nuevos.columns]], ignore_index=True), stats
+
+
+def format_stats(stats: dict) -> str:
+    """Resumen de la conciliacion para imprimir"""
+    return (f"Proveedores viejos: {stats['por_numero']} coinciden por numero, {stats['por_cuit']} por CUIT, "
+            f"{stats['solo_viejos']} se agregan; {stats['conflictos']} con atributos en conflicto (gana el nuevo)\n"
+            f"Transacciones: {stats['transacciones_nuevas']} nuevas + {stats['transacciones_viejas']} viejas agregadas, "
+            f"{stats['repetidas']} viejas descartadas por estar en el nuevo")
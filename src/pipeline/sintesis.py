@@ -0,0 +1,47 @@
+"""Sintesis de datos de merge_data con un unico numpy.random.Generator sembrado (corridas reproducibles)."""
+import os
+import numpy as np
+import pandas as pd
+
+# Semilla de la sintesis (main.py la incluye en la clave del cache de etapas)
+SEMILLA = int(os.environ.get("PIPELINE_SEMILLA", "42"))
+
+
+class Synthesizer:
+    """Muestreo ponderado y fechas aleatorias a partir de un Generator; las distribuciones se calculan una vez por (DataFrame, columna)"""
+
+    def __init__(self, seed: int = SEMILLA):
+        self.rng = np.random.default_rng(seed)
+        self._distribuciones = {}
+
+    def distribution(self, df: pd.DataFrame, column: str) -> tuple:
+        """Valores de la columna y su probabilidad (frecuencia relativa), sin nulos"""
+        clave = (id(df), column)
+        if clave not in self._distribuciones:
+            conteo = df[column].value_counts()
+            conteo = conteo[conteo > 0]
+            # Se guarda el DataFrame para que su id no se reutilice mientras la entrada exista
+            self._distribuciones[clave] = (df, conteo.index.to_numpy(), (conteo / conteo.sum()).to_numpy())
+        _, valores, probabilidad = self._distribuciones[clave]
+        return valores, probabilidad
+
+    def sample(self, df: pd.DataFrame, column: str, size: int) -> np.ndarray:
+        """Muestra size valores con la distribucion de la columna"""
+        valores, probabilidad = self.distribution(df, column)
+        return self.rng.choice(valores, size=size, p=probabilidad)
+
+    def dates(self, start: pd.Timestamp, end: pd.Timestamp, size: int) -> pd.DatetimeIndex:
+        """
+        size fechas uniformes entre start y end (dias enteros, ambos incluidos) en un solo sorteo
+
+        ValueError si algun extremo es nulo (NaT, p. ej. una columna sin fechas) o si end es anterior a start
+        """
+        if size == 0:
+            return pd.DatetimeIndex([], dtype="datetime64[ns]")
+        if pd.isna(start) or pd.isna(end):
+            raise ValueError(f"Rango de fechas invalido para la sintesis: {start} - {end} (sin fechas de referencia)")
+        if end < start:
+            raise ValueError(f"Rango de fechas invalido para la sintesis: {start} es posterior a {end}")
+        dias = self.rng.integers(0, (end - start).days, size=size, endpoint=True)
+        # Aritmetica de datetime64 de numpy: sin pasar por pd.to_timedelta
+        return pd.DatetimeIndex(np.datetime64(start, "ns") + dias.astype("timedelta64[D]"))
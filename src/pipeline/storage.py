@@ -0,0 +1,118 @@
+"""Almacenamiento intermedio entre etapas del pipeline: parquet (default), feather o csv."""
+import importlib.util
+import os
+from pathlib import Path
+import pandas as pd
+
+# Formato -> extension. parquet y feather guardan el schema (fechas, booleanos, categoricas)
+FORMATOS = {"parquet": ".parquet", "feather": ".feather", "csv": ".csv"}
+# main.py lo pasa a cada etapa con --formato
+FORMATO = os.environ.get("PIPELINE_FORMATO", "parquet")
+
+
+def resolve_format(formato: str = None) -> str:
+    """Formato a usar: el pedido o el de PIPELINE_FORMATO, csv si pyarrow no esta instalado"""
+    formato = formato or FORMATO
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato invalido: {formato}. Opciones: {tuple(FORMATOS)}")
+    if formato != "csv" and importlib.util.find_spec("pyarrow") is None:
+        print(f"pyarrow no esta instalado, se usa csv en lugar de {formato}")
+        return "csv"
+    return formato
+
+
+def table_path(directorio: Path, nombre: str, formato: str = None) -> Path:
+    """Ruta de una tabla intermedia en el formato pedido"""
+    return Path(directorio) / f"{nombre}{FORMATOS[resolve_format(formato)]}"
+
+
+def find_table(directorio: Path, nombre: str, formato: str = None) -> Path:
+    """
+    Ruta de una tabla a leer: la del formato pedido o, si no existe, la de cualquier otro formato
+    o el dataset particionado (directorio) que escribe merge_data --particionado
+    """
+    path = table_path(directorio, nombre, formato)
+    if path.exists():
+        return path
+    for extension in FORMATOS.values():
+        otro = Path(directorio) / f"{nombre}{extension}"
+        if otro.exists():
+            return otro
+    if (Path(directorio) / nombre).is_dir():
+        return Path(directorio) / nombre
+    return path
+
+
+def _format_of(path: Path) -> str:
+    for formato, extension in FORMATOS.items():
+        if Path(path).suffix == extension:
+            return formato
+    raise ValueError(f"Extension no soportada: {path}")
+
+
+def write_table(df: pd.DataFrame, path: Path) -> Path:
+    """Escribe una tabla en el formato que indica su extension"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    formato = _format_of(path)
+    if formato == "parquet":
+        df.to_parquet(path, index=False)
+    elif formato == "feather":
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def dataset_files(directorio: Path, particiones: list = None) -> list:
+    """Archivos de un dataset particionado (<directorio>/anio=AAAA/mes=MM/part-*), en orden de particion"""
+    archivos = sorted(path for path in Path(directorio).glob("*/*/part-*") if path.suffix in FORMATOS.values())
+    if particiones is not None:
+        archivos = [path for path in archivos if f"{path.parent.parent.name}/{path.parent.name}" in particiones]
+    return archivos
+
+
+def read_dataset(directorio: Path, particiones: list = None) -> pd.DataFrame:
+    """Lee un dataset particionado completo o solo las particiones pedidas"""
+    partes = [read_table(path) for path in dataset_files(directorio, particiones)]
+    if not partes:
+        return pd.DataFrame()
+    return pd.concat(partes, ignore_index=True)
+
+
+def read_table(path: Path) -> pd.DataFrame:
+    """Lee una tabla en el formato que indica su extension (o un dataset particionado si es un directorio)"""
+    if Path(path).is_dir():
+        return read_dataset(path)
+    formato = _format_of(path)
+    if formato == "parquet":
+        return pd.read_parquet(path)
+    if formato == "feather":
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+
+def iter_table(path: Path, chunk_size: int):
+    """Lee una tabla por partes de chunk_size filas sin cargarla entera"""
+    formato = _format_of(path)
+    if formato == "csv":
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif formato == "parquet":
+        import pyarrow.parquet as pq
+
+        start = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            # Indice continuo entre chunks, como read_csv(chunksize=...)
+            chunk = batch.to_pandas()
+            chunk.index += start
+            start += len(chunk)
+            yield chunk
+    else:
+        import pyarrow.feather as feather
+
+        # feather se lee con memory map: los chunks no copian la tabla entera
+        tabla = feather.read_table(path, memory_map=True)
+        for start in range(0, tabla.num_rows, chunk_size):
+            chunk = tabla.slice(start, chunk_size).to_pandas()
+            chunk.index += start
+            yield chunk
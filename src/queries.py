@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Sentencias SQL y dimensiones de las entidades, compartidas por los motores de
+ingestion (db-ingestion.py, bulk_load.py, async_ingestion.py e ingestion_lite.py).
+
+Un cambio en el schema (_DATABASE/ddl.sql) se hace una sola vez aca. El modulo
+no importa pandas, asi ingestion_lite.py lo puede usar.
+"""
+
+# Dimensiones de cada entidad: tabla -> columna de origen
+PROVEEDOR_DIMENSIONS = {
+    "categoria_proveedores": "categoria",
+    "tipo_contribuyentes": "contribuyente",
+    "razones_sociales": "razon",
+    "ciudades": "ciudad",
+    "cuentas": "nro_cuenta",
+}
+DONANTE_DIMENSIONS = {
+    "frecuencias": "frecuencia",
+    "tipo_contribuyentes": "contribuyente",
+    "razones_sociales": "razon",
+    "tipo_donantes": "tipo",
+    "paises": "pais",
+    "cuentas": "nro_cuenta",
+}
+
+# Columnas de cada entidad en el orden de los parametros del INSERT (numero es la clave natural)
+PROVEEDORES_COLUMNS = [
+    "numero", "nombre", "cuit", "contacto", "mail", "telefono",
+    "id_categoria", "id_contribuyente", "id_razon", "id_ciudad",
+]
+DONANTES_COLUMNS = [
+    "numero", "nombre", "cuit", "contacto", "mail", "telefono", "activo",
+    "id_frecuencia", "id_contribuyente", "id_razon", "id_tipo", "id_pais",
+]
+_FACT_COLUMNS = ["importe", "fecha", "{id_col}", "id_cuenta", "hash"]
+
+
+def _insert_into(table: str, columns: list) -> str:
+    return f"INSERT INTO {table} ({', '.join(columns)})"
+
+
+def _values(columns: list) -> str:
+    return f"VALUES ({', '.join(['%s'] * len(columns))})"
+
+
+def _on_duplicate(columns: list) -> str:
+    """Actualiza todas las columnas salvo la clave natural (la primera)"""
+    return "ON DUPLICATE KEY UPDATE\n    " + ",\n    ".join(f"{col} = VALUES({col})" for col in columns[1:])
+
+
+# Entidades: INSERT ... ON DUPLICATE KEY UPDATE por numero. Las clausulas sueltas son para el INSERT ... SELECT de bulk_load
+PROVEEDORES_INTO = _insert_into("proveedores", PROVEEDORES_COLUMNS)
+PROVEEDORES_UPDATE = _on_duplicate(PROVEEDORES_COLUMNS)
+PROVEEDORES_INSERT = f"{PROVEEDORES_INTO}\n{_values(PROVEEDORES_COLUMNS)}\n{PROVEEDORES_UPDATE};"
+
+DONANTES_INTO = _insert_into("donantes", DONANTES_COLUMNS)
+DONANTES_UPDATE = _on_duplicate(DONANTES_COLUMNS)
+DONANTES_INSERT = f"{DONANTES_INTO}\n{_values(DONANTES_COLUMNS)}\n{DONANTES_UPDATE};"
+
+# Tablas de hechos (gastos, ingresos): completar con .format(table=..., id_col=...)
+FACT_INTO = _insert_into("{table}", _FACT_COLUMNS)
+FACT_INSERT = f"{FACT_INTO}\n{_values(_FACT_COLUMNS)};"
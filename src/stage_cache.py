@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for the pipeline stages run by main.py.
+
+A stage key is the SHA-256 of the stage name, the contents of the files it
+depends on (its own code and, for the first stages, the raw input files),
+its parameters and the keys of the stages it depends on. Since the keys chain
+through the DAG, a change in one raw file only changes the keys of the stages
+downstream of it.
+
+Each entry is a directory named after its key holding the pickled stage
+result. Entries are evicted least-recently-used first once the cache grows
+past its size limit.
+"""
+
+import hashlib
+import json
+import pickle
+import shutil
+import time
+from pathlib import Path
+from incremental import file_fingerprint
+
+# Default size limit of the cache directory
+MAX_BYTES = 512 * 1024 * 1024
+
+
+class StageCache:
+    """Stage results stored on disk under their content key."""
+
+    RESULT = "result.pkl"
+    META = "meta.json"
+
+    def __init__(self, directory, max_bytes=MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # The limit may have been lowered since the last run
+        self.evict()
+
+    def key(self, name, files=(), params=(), dep_keys=()):
+        """Build the key of a stage.
+
+        Args:
+            name: Name of the stage
+            files: Paths whose contents the stage output depends on
+            params: Parameters that change the stage output (must be JSON serializable)
+            dep_keys: Keys of the stages it depends on
+
+        Returns:
+            The hexadecimal key
+        """
+        sha = hashlib.sha256(name.encode())
+        for path in sorted(Path(p) for p in files):
+            sha.update(f"{path.name}:{file_fingerprint(path)}".encode())
+        sha.update(json.dumps(list(params), sort_keys=True, default=str).encode())
+        for dep_key in dep_keys:
+            sha.update(dep_key.encode())
+        return sha.hexdigest()
+
+    def contains(self, key):
+        return (self.directory / key / self.META).exists()
+
+    def load(self, key):
+        """Return the stored result of a key and mark it as recently used."""
+        entry = self.directory / key
+        with open(entry / self.RESULT, "rb") as f:
+            result = pickle.load(f)
+        self.touch(key)
+        return result
+
+    def store(self, key, name, result):
+        """Store a stage result under its key and evict old entries if needed."""
+        entry = self.directory / key
+        tmp = self.directory / f".{key}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        with open(tmp / self.RESULT, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        (tmp / self.META).write_text(json.dumps({"stage": name, "created": time.time(), "last_used": time.time()}))
+        # The entry only shows up once it's complete
+        shutil.rmtree(entry, ignore_errors=True)
+        tmp.rename(entry)
+        self.evict(keep=key)
+
+    def touch(self, key):
+        """Mark an entry as recently used."""
+        entry = self.directory / key
+        meta = json.loads((entry / self.META).read_text())
+        meta["last_used"] = time.time()
+        (entry / self.META).write_text(json.dumps(meta))
+
+    def evict(self, keep=None):
+        """Delete the least recently used entries until the cache fits in max_bytes.
+
+        Args:
+            keep: Key that is never evicted (the entry that was just stored)
+
+        Returns:
+            The number of evicted entries
+        """
+        entries = []
+        for entry in self.directory.iterdir():
+            if not (entry / self.META).exists():
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            last_used = json.loads((entry / self.META).read_text())["last_used"]
+            entries.append((last_used, entry, size))
+        total = sum(size for _, _, size in entries)
+        evicted = 0
+        for _, entry, size in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            evicted += 1
+        return evicted
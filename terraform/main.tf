@@ -14,6 +14,12 @@ resource "google_sql_database_instance" "mysql_instance" {
   settings {
     tier = var.db_instance_tier
 
+    # LOAD DATA LOCAL INFILE para la carga masiva (db-ingestion.py --bulk)
+    database_flags {
+      name  = "local_infile"
+      value = "on"
+    }
+
     ip_configuration {
       ipv4_enabled = true
 